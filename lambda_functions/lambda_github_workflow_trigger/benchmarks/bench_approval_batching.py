@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+A burst of ``--approvals`` model approvals across ``--groups`` model package
+groups, handled one EventBridge event per invocation (as the rule used to
+invoke the Lambda) and as SQS batches of ``--batch-size`` messages (as the
+approval queue does): deploy workflow dispatches, requests to GitHub and the
+model registry and time spent in the handler, against ``stub_endpoints`` with
+``--latency-ms`` per request. Time includes PyGithub spacing writes a second apart.
+
+    python benchmarks/bench_approval_batching.py --approvals 20 --groups 2 --latency-ms 100
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+from stub_endpoints import StubEndpoints
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import lambda_function  # noqa: E402
+
+
+def make_events(n: int, groups: int) -> list[dict]:
+    """EventBridge "SageMaker Model Package State Change" events, versions going up within each group."""
+    events = []
+    for i in range(n):
+        group, version = f"house-regression-{i % groups}", i // groups + 1
+        events.append(
+            {
+                "source": "aws.sagemaker",
+                "detail-type": "SageMaker Model Package State Change",
+                "detail": {
+                    "ModelPackageGroupName": group,
+                    "ModelPackageVersion": version,
+                    "ModelPackageArn": f"arn:aws:sagemaker:us-east-1:000000000000:model-package/{group}/{version}",
+                    "ModelApprovalStatus": "Approved",
+                },
+            }
+        )
+    return events
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--approvals", type=int, default=20)
+    parser.add_argument("--groups", type=int, default=2)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--latency-ms", type=float, default=100.0, help="simulated round trip to GitHub")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    events = make_events(args.approvals, args.groups)
+    latest = {e["detail"]["ModelPackageGroupName"]: e["detail"]["ModelPackageArn"] for e in events}
+    records = [{"messageId": str(i), "body": json.dumps(e)} for i, e in enumerate(events)]
+    batches = [{"Records": records[i : i + args.batch_size]} for i in range(0, len(records), args.batch_size)]
+
+    with StubEndpoints(latency=args.latency_ms / 1000) as stub:
+        os.environ.update(stub.environ(), GitHubWorkflowArnInput="model_package_arn")
+        for group, arn in latest.items():
+            stub.approved[group].append(arn)
+        lambda_function.get_github()
+        for label, invocations in [("per event", events), ("SQS batches", batches)]:
+            time.sleep(1)
+            stub.reset()
+            start = time.perf_counter()
+            for invocation in invocations:
+                result = lambda_function.lambda_handler(invocation, None)
+                assert not result.get("batchItemFailures") and result.get("message", "Success!") == "Success!", result
+            elapsed = time.perf_counter() - start
+            deployed = {body["inputs"]["model_package_arn"] for body in stub.dispatches}
+            assert set(latest.values()) <= deployed
+            print(
+                f"{label:<12} {len(invocations):4} invocations  {len(stub.dispatches):4} dispatches  "
+                f"{sum(stub.requests.values()):4} requests  {elapsed:6.2f}s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+What ``build_artifacts.py`` saves on a publish where nothing changed: time to
+build the function and layer zips from scratch (pip, pruning, compiling,
+zipping), twice to check that they come out byte for byte the same, against
+finding them in the cache. Layers are built for this machine's Python unless
+``--python-version``/``--platform`` say otherwise. Needs network access for pip.
+
+    python benchmarks/bench_artifacts.py
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import build_artifacts  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--python-version", default=f"{sys.version_info.major}.{sys.version_info.minor}")
+    parser.add_argument("--platform", default=None, help="pip platform tag, default this machine's")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = Path(tmp)
+        hashes = set()
+        for label, rebuild in [("build", True), ("build again", True), ("cache hit", False)]:
+            start = time.perf_counter()
+            function = build_artifacts.function_zip(cache, rebuild=rebuild)
+            layer = build_artifacts.layer_zip(cache, python_version=args.python_version, platform=args.platform, rebuild=rebuild)
+            elapsed = time.perf_counter() - start
+            hashes.add((function.sha256, layer.sha256))
+            print(f"{label:<12} {elapsed:7.2f}s   function {function.sha256.hex()[:12]}   layer {layer.sha256.hex()[:12]}")
+        print("reproducible" if len(hashes) == 1 else "NOT reproducible: the builds differ")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+GitHub requests and latency per warm invocation of the handler, with and
+without ``GitHubValidateDispatch``, against ``stub_endpoints`` with
+``--latency-ms`` per request.
+
+Validating looks the user, repository, workflow and branch up before the
+dispatch POST; the direct dispatch only sends the POST. Invocations are
+``--pause`` apart, see ``bench_warm_invocations.py``.
+
+    python benchmarks/bench_dispatch.py --invocations 10 --latency-ms 100
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+from stub_endpoints import StubEndpoints
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import lambda_function  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--invocations", type=int, default=10)
+    parser.add_argument("--latency-ms", type=float, default=100.0, help="simulated round trip to GitHub")
+    parser.add_argument("--pause", type=float, default=1.0, help="seconds between invocations")
+    args = parser.parse_args()
+    logging.getLogger("botocore").setLevel(logging.WARNING)
+
+    with StubEndpoints(latency=args.latency_ms / 1000) as stub:
+        os.environ.update(stub.environ())
+        for label, validate in [("validate", "true"), ("direct", "false")]:
+            os.environ["GitHubValidateDispatch"] = validate
+            lambda_function.lambda_handler({}, None)
+            stub.reset()
+            elapsed = 0.0
+            for _ in range(args.invocations):
+                time.sleep(args.pause)
+                start = time.perf_counter()
+                result = lambda_function.lambda_handler({}, None)
+                elapsed += time.perf_counter() - start
+                assert result == {"message": "Success!"}, result
+            assert len(stub.dispatches) == args.invocations
+            requests = sum(stub.requests.values()) / args.invocations
+            print(f"{label:<9} {elapsed / args.invocations * 1e3:7.1f} ms   {requests:.0f} GitHub requests per invocation")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Cold-start cost of the handler's GitHub imports with the layer as ``pip
+install`` leaves it, the same with bytecode, and as ``build_layer.py`` builds
+it (pruned, lazy ``github`` and bytecode): zipped size, modules imported and
+their import time from ``python -X importtime``, best of ``--runs`` fresh
+interpreters.
+
+The layers are built for this machine's Python (so that they can be imported
+here), each interpreter runs without site-packages and without writing
+bytecode, as on Lambda's read-only ``/opt``. Needs network access for pip.
+
+    python benchmarks/bench_layer_imports.py --runs 10
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import build_layer  # noqa: E402
+
+IMPORTS = "from github import Auth, BadCredentialsException, Github; from github.Consts import DEFAULT_BASE_URL"
+
+
+def import_time(site: Path) -> tuple[float, int]:
+    """Seconds spent importing ``IMPORTS`` from ``site`` in a fresh interpreter, and how many modules that imports."""
+    code = f"import sys; sys.path.insert(0, {str(site)!r}); {IMPORTS}"
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    result = subprocess.run(
+        [sys.executable, "-S", "-X", "importtime", "-c", code], env=env, capture_output=True, text=True, check=True
+    )
+    total = modules = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        modules += 1
+        # top-level imports: their cumulative time includes everything they imported
+        if not name.startswith("  "):
+            total += int(cumulative)
+    return total / 1e6, modules
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    version = f"{sys.version_info.major}.{sys.version_info.minor}"
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, slim, compile in [
+            ("pip install", False, False),
+            ("+ bytecode", False, True),
+            ("build_layer.py", True, True),
+        ]:
+            root = Path(tmp) / label.replace(" ", "_")
+            site = build_layer.build(root, python_version=version, platform=None, slim=slim, compile=compile)
+            layer = root.with_suffix(".zip")
+            build_layer.write_zip(root, layer)
+            best, modules = min(import_time(site) for _ in range(args.runs))
+            print(
+                f"{label:<15} {layer.stat().st_size / 2**20:5.1f} MiB zipped   "
+                f"{modules:4} modules   {best * 1e3:7.1f} ms importing"
+            )
+
+
+if __name__ == "__main__":
+    main()
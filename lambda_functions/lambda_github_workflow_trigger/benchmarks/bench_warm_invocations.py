@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+What a warm container saves by keeping the Secrets Manager client, the GitHub
+token and the GitHub client between invocations, against ``stub_endpoints``
+with ``--latency-ms`` per request.
+
+"every time" clears the module-level caches before each invocation, which is
+what the handler used to do; "warm" keeps them. Setup is the time spent in
+``get_github()``, the rest of the invocation is the GitHub calls themselves.
+Invocations are ``--pause`` apart, as approvals are: PyGithub spaces a
+client's writes at least a second apart, and a kept client remembers its last
+one.
+
+Finally the token is rotated to check that a warm container recovers from the
+401 with one extra Secrets Manager call.
+
+    python benchmarks/bench_warm_invocations.py --invocations 20 --latency-ms 30
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+from stub_endpoints import StubEndpoints
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import lambda_function  # noqa: E402
+
+
+def forget() -> None:
+    lambda_function._secrets_client = None
+    lambda_function._github_token = None
+    lambda_function._github_token_fetched_at = 0.0
+    lambda_function._github = None
+
+
+def invoke(n: int, cold: bool, pause: float) -> tuple[float, float]:
+    """Mean seconds of setup and of whole invocations."""
+    setup = total = 0.0
+    for _ in range(n):
+        time.sleep(pause)
+        if cold:
+            forget()
+        start = time.perf_counter()
+        lambda_function.get_github()
+        setup += time.perf_counter() - start
+        result = lambda_function.lambda_handler({}, None)
+        total += time.perf_counter() - start
+        assert result == {"message": "Success!"}, result
+    return setup / n, total / n
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--invocations", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=30.0, help="simulated round trip to AWS and GitHub")
+    parser.add_argument("--pause", type=float, default=1.0, help="seconds between invocations")
+    args = parser.parse_args()
+    logging.getLogger("botocore").setLevel(logging.WARNING)
+
+    with StubEndpoints(latency=args.latency_ms / 1000) as stub:
+        os.environ.update(stub.environ())
+        for label, cold in [("every time", True), ("warm", False)]:
+            forget()
+            lambda_function.lambda_handler({}, None)
+            stub.reset()
+            setup, total = invoke(args.invocations, cold, args.pause)
+            secrets = stub.requests["GetSecretValue"] / args.invocations
+            print(
+                f"{label:<11} setup {setup * 1e3:7.1f} ms   invocation {total * 1e3:7.1f} ms   "
+                f"{secrets:.1f} GetSecretValue per invocation"
+            )
+
+        stub.reset()
+        stub.token = "ghp_rotated"
+        time.sleep(args.pause)
+        start = time.perf_counter()
+        result = lambda_function.lambda_handler({}, None)
+        elapsed = time.perf_counter() - start
+        print(f"after rotating the token: {result['message']} in {elapsed * 1e3:.1f} ms, requests {dict(stub.requests)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+A local stand-in for Secrets Manager, SageMaker and the GitHub REST API, enough for ``lambda_function``.
+
+One threaded HTTP server answers all three: boto3 is pointed at it with
+``AWS_ENDPOINT_URL_SECRETS_MANAGER`` and ``AWS_ENDPOINT_URL_SAGEMAKER``, and PyGithub
+with ``GitHubApiUrl``. Every
+request waits ``latency`` seconds first, standing in for the round trip to AWS
+or GitHub, and is counted. GitHub answers 401 to any token but ``token``, so
+assigning a new ``token`` simulates a rotation. ``ListModelPackages`` answers with
+the last ARN added to ``approved`` for the group.
+
+    with StubEndpoints(latency=0.03) as stub:
+        os.environ.update(stub.environ())
+        lambda_function.lambda_handler({}, None)
+        stub.requests    # Counter of "GET /user", "POST dispatches", ...
+        stub.dispatches  # JSON bodies of the workflow_dispatch POSTs
+        stub.approved["house-regression"].append(arn)  # the group's latest approved package
+"""
+
+import json
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+OWNER = "mlops-club"
+REPO = "model-deploy"
+WORKFLOW = "deploy.yml"
+
+
+class StubEndpoints:
+    def __init__(self, latency: float = 0.0, token: str = "ghp_stub") -> None:
+        self.latency = latency
+        self.token = token
+        self.requests: Counter[str] = Counter()
+        self.dispatches: list[dict] = []
+        self.approved: defaultdict[str, list[str]] = defaultdict(list)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def environ(self) -> dict[str, str]:
+        """The Lambda's environment, pointed at the stub."""
+        return {
+            "AWS_ENDPOINT_URL_SECRETS_MANAGER": self.url,
+            "AWS_ENDPOINT_URL_SAGEMAKER": self.url,
+            "AWS_ACCESS_KEY_ID": "stub",
+            "AWS_SECRET_ACCESS_KEY": "stub",
+            "Region": "us-east-1",
+            "GitHubTokenSecretName": "sagemaker-github-pat",
+            "GitHubApiUrl": self.url,
+            "GitHubRepositoryOwnerName": OWNER,
+            "DeployRepoName": REPO,
+            "GitHubWorkflowNameForDeployment": WORKFLOW,
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.requests.clear()
+            self.dispatches.clear()
+
+    def __enter__(self) -> "StubEndpoints":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _record(self, name: str, body: dict | None = None) -> None:
+        with self._lock:
+            self.requests[name] += 1
+            if body is not None:
+                self.dispatches.append(body)
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args) -> None:
+                pass
+
+            def _reply(self, status: int, body: dict | None = None, content_type: str = "application/json") -> None:
+                payload = json.dumps(body).encode() if body is not None else b""
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _read(self) -> bytes:
+                return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+            def do_POST(self) -> None:
+                time.sleep(stub.latency)
+                body = self._read()
+                target = self.headers.get("X-Amz-Target", "")
+                if target == "secretsmanager.GetSecretValue":
+                    stub._record("GetSecretValue")
+                    name = json.loads(body)["SecretId"]
+                    self._reply(
+                        200,
+                        {"ARN": f"arn:aws:secretsmanager:us-east-1:000000000000:secret:{name}", "Name": name,
+                         "SecretString": json.dumps({"GITHUB_PAT": stub.token})},
+                        "application/x-amz-json-1.1",
+                    )
+                elif target == "SageMaker.ListModelPackages":
+                    stub._record("ListModelPackages")
+                    group = json.loads(body)["ModelPackageGroupName"]
+                    summaries = [
+                        {"ModelPackageGroupName": group, "ModelPackageArn": arn, "CreationTime": 0,
+                         "ModelPackageStatus": "Completed", "ModelApprovalStatus": "Approved"}
+                        for arn in stub.approved[group][-1:]
+                    ]
+                    self._reply(200, {"ModelPackageSummaryList": summaries}, "application/x-amz-json-1.1")
+                elif not self._authorized():
+                    return
+                elif re.fullmatch(rf"/repos/{OWNER}/{REPO}/actions/workflows/[^/]+/dispatches", self.path):
+                    stub._record("POST dispatches", json.loads(body or b"{}"))
+                    self._reply(204)
+                else:
+                    self._reply(404, {"message": "Not Found"})
+
+            def do_GET(self) -> None:
+                time.sleep(stub.latency)
+                if not self._authorized():
+                    return
+                base = f"{stub.url}/repos/{OWNER}/{REPO}"
+                path = self.path.split("?")[0]
+                if path == "/user":
+                    stub._record("GET /user")
+                    self._reply(200, {"login": OWNER, "url": f"{stub.url}/users/{OWNER}"})
+                elif path == f"/repos/{OWNER}/{REPO}":
+                    stub._record("GET repo")
+                    self._reply(200, {"name": REPO, "full_name": f"{OWNER}/{REPO}", "owner": {"login": OWNER},
+                                      "url": base})
+                elif path.startswith(f"/repos/{OWNER}/{REPO}/actions/workflows/"):
+                    stub._record("GET workflow")
+                    self._reply(200, {"id": 1, "name": "deploy", "path": f".github/workflows/{WORKFLOW}",
+                                      "url": f"{base}/actions/workflows/1"})
+                elif path.startswith(f"/repos/{OWNER}/{REPO}/branches/"):
+                    stub._record("GET branch")
+                    self._reply(200, {"name": path.rsplit("/", 1)[-1], "commit": {"sha": "0" * 40}})
+                else:
+                    self._reply(404, {"message": "Not Found"})
+
+            def _authorized(self) -> bool:
+                if self.headers.get("Authorization", "").split(" ")[-1] == stub.token:
+                    return True
+                stub._record("401")
+                self._reply(401, {"message": "Bad credentials"})
+                return False
+
+        return Handler
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Build the Lambda's two artifacts, reusing them when their inputs haven't
+changed, and upload or publish only the ones that did.
+
+- the function: ``lambda_function.py``, zipped;
+- the layer: see ``build_layer.py``.
+
+Each artifact is kept in ``build/cache`` under a hash of its inputs: the
+handler sources for the function; ``requirements.txt``, ``build_layer.py`` and
+the target runtime for the layer. A hit skips the build, which for the layer
+means skipping pip, pruning and compiling altogether. The zips are
+deterministic (see ``build_layer.write_zip``), so that the same inputs give the
+same bytes, which is what lets publishing compare hashes:
+
+- the function zip is uploaded to S3 with its SHA-256 as metadata, and not
+  uploaded again while the object there carries the same one;
+- the layer is published as a new version only if its SHA-256 differs from
+  the latest version's ``CodeSha256``.
+
+    python build_artifacts.py                 # build, or reuse from the cache
+    python build_artifacts.py --publish --bucket sagemaker-test-bucket-mc --layer-name python39-github-arm64
+
+The layer's key covers ``requirements.txt`` as written: with unpinned
+requirements, delete ``build/cache`` (or pass ``--rebuild``) to pick up new
+releases.
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import hashlib
+import logging
+import shutil
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+
+import build_layer
+
+log = logging.getLogger(__name__)
+
+HERE = Path(__file__).resolve().parent
+FUNCTION_SOURCES = ["lambda_function.py"]
+FUNCTION_ZIP = "lambda-github-workflow-trigger.zip"
+LAYER_RECIPE = ["requirements.txt", "build_layer.py"]
+
+
+@dataclass(frozen=True)
+class Artifact:
+    path: Path
+    # hash of the inputs, naming the artifact in the cache
+    key: str
+    # whether it came from the cache rather than being built
+    cached: bool
+
+    @property
+    def sha256(self) -> bytes:
+        return hashlib.sha256(self.path.read_bytes()).digest()
+
+
+def input_key(files: list[Path], *extra: str) -> str:
+    """A hash of the files' names and contents, and of ``extra``."""
+    digest = hashlib.sha256()
+    for path in files:
+        digest.update(path.name.encode() + b"\0" + path.read_bytes() + b"\0")
+    for value in extra:
+        digest.update(value.encode() + b"\0")
+    return digest.hexdigest()[:16]
+
+
+def function_zip(cache: Path, source_dir: Path = HERE, rebuild: bool = False) -> Artifact:
+    sources = [source_dir / name for name in FUNCTION_SOURCES]
+    key = input_key(sources)
+    path = cache / f"function-{key}.zip"
+    if path.exists() and not rebuild:
+        return Artifact(path, key, cached=True)
+    with tempfile.TemporaryDirectory() as tmp:
+        for source in sources:
+            shutil.copy(source, tmp)
+        build_layer.write_zip(Path(tmp), path)
+    return Artifact(path, key, cached=False)
+
+
+def layer_zip(
+    cache: Path,
+    source_dir: Path = HERE,
+    python_version: str = "3.9",
+    platform: str | None = "manylinux2014_aarch64",
+    rebuild: bool = False,
+) -> Artifact:
+    key = input_key([source_dir / name for name in LAYER_RECIPE], python_version, platform or "")
+    path = cache / f"layer-{key}.zip"
+    if path.exists() and not rebuild:
+        return Artifact(path, key, cached=True)
+    with tempfile.TemporaryDirectory() as tmp:
+        build_layer.build(Path(tmp), source_dir / "requirements.txt", python_version, platform)
+        build_layer.write_zip(Path(tmp), path)
+    return Artifact(path, key, cached=False)
+
+
+def upload_if_changed(s3, artifact: Artifact, bucket: str, key: str) -> bool:
+    """Upload ``artifact`` to ``s3://bucket/key`` unless it's already there; whether it was uploaded."""
+    sha256 = artifact.sha256.hex()
+    try:
+        current = s3.head_object(Bucket=bucket, Key=key).get("Metadata", {}).get("sha256")
+    except s3.exceptions.ClientError as e:
+        if e.response["Error"]["Code"] not in ("404", "NoSuchKey"):
+            raise
+        current = None
+    if current == sha256:
+        return False
+    s3.upload_file(str(artifact.path), bucket, key, ExtraArgs={"Metadata": {"sha256": sha256}})
+    return True
+
+
+def publish_if_changed(lambda_client, artifact: Artifact, layer_name: str, python_version: str) -> tuple[str, bool]:
+    """Publish ``artifact`` as a new version of ``layer_name`` unless the latest one is identical; its ARN, and whether it's new."""
+    sha256 = base64.b64encode(artifact.sha256).decode()
+    versions = lambda_client.list_layer_versions(LayerName=layer_name, MaxItems=1)["LayerVersions"]
+    if versions:
+        latest = lambda_client.get_layer_version_by_arn(Arn=versions[0]["LayerVersionArn"])
+        if latest["Content"]["CodeSha256"] == sha256:
+            return latest["LayerVersionArn"], False
+    published = lambda_client.publish_layer_version(
+        LayerName=layer_name,
+        Description=f"Python{python_version} pygithub",
+        LicenseInfo="MIT",
+        Content={"ZipFile": artifact.path.read_bytes()},
+        CompatibleRuntimes=[f"python{python_version}"],
+        CompatibleArchitectures=["arm64"],
+    )
+    return published["LayerVersionArn"], True
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cache", type=Path, default=HERE / "build" / "cache")
+    parser.add_argument("--python-version", default="3.9", help="of the Lambda runtime")
+    parser.add_argument("--platform", default="manylinux2014_aarch64", help="pip platform tag of the runtime")
+    parser.add_argument("--rebuild", action="store_true", help="ignore the cache")
+    parser.add_argument("--publish", action="store_true", help="upload the function and publish the layer if changed")
+    parser.add_argument("--bucket", help="for the function zip, with --publish")
+    parser.add_argument("--layer-name", default="python39-github-arm64")
+    args = parser.parse_args()
+
+    function = function_zip(args.cache, rebuild=args.rebuild)
+    layer = layer_zip(args.cache, python_version=args.python_version, platform=args.platform or None, rebuild=args.rebuild)
+    for name, artifact in [("function", function), ("layer", layer)]:
+        how = "cached" if artifact.cached else "built"
+        log.info("%s: %s (%s, sha256 %s)", name, artifact.path, how, artifact.sha256.hex()[:16])
+
+    if args.publish:
+        if not args.bucket:
+            parser.error("--publish needs --bucket")
+        import boto3
+
+        if upload_if_changed(boto3.client("s3"), function, args.bucket, FUNCTION_ZIP):
+            log.info("Uploaded s3://%s/%s", args.bucket, FUNCTION_ZIP)
+        else:
+            log.info("s3://%s/%s is up to date", args.bucket, FUNCTION_ZIP)
+        arn, new = publish_if_changed(boto3.client("lambda"), layer, args.layer_name, args.python_version)
+        log.info("%s %s", "Published" if new else "Up to date:", arn)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Build the Lambda layer ``lambda_function`` runs with: its ``requirements.txt``
+installed for the Lambda runtime, trimmed and precompiled to import faster on
+a cold start.
+
+    python build_layer.py --out build/layer.zip
+    python build_layer.py --out build/layer.zip --full    # as pip installs it, for comparison
+
+On top of ``pip install --target``, the layer
+
+- leaves out what the runtime already provides (boto3 and botocore);
+- drops packages nothing the handler calls needs: ``cryptography``, which
+  ``jwt`` only uses for GitHub App keys if it's there, and ``pycparser``,
+  which ``cffi`` only needs to compile bindings, not to load ``nacl``'s. Both
+  ``nacl`` (``github.PublicKey`` imports it) and ``charset_normalizer``
+  (``requests`` warns on import without it) stay;
+- drops scripts, type stubs and caches;
+- replaces ``github/__init__.py`` by one that imports what it exports on first
+  use, so ``from github import Github`` doesn't also import
+  ``GithubIntegration``, ``AppAuthentication`` and the ``Input*`` classes;
+- ships bytecode compiled by the runtime's Python version, because ``/opt`` is
+  read-only and Lambda would otherwise compile every module again on every
+  cold start. The ``.pyc`` files are unchecked-hash ones: Python never checks
+  them against their sources, which can't change under a read-only ``/opt``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import logging
+import os
+import pprint
+import shutil
+import subprocess
+import sys
+import tempfile
+import zipfile
+from pathlib import Path
+
+log = logging.getLogger(__name__)
+
+HERE = Path(__file__).resolve().parent
+
+# provided by the Lambda Python runtime
+RUNTIME_PROVIDED = {"boto3", "botocore"}
+# top-level packages (and their dist-info) the handler never imports
+UNUSED = ["cryptography", "pycparser"]
+# anywhere in the tree
+JUNK_DIRS = {"__pycache__", "tests", "bin"}
+JUNK_SUFFIXES = {".pyi", ".typed"}
+# where Lambda unpacks the layer's python/ directory
+LAYER_PATH = "/opt/python"
+# the earliest a zip entry can have; pip and compileall leave today's times behind
+ZIP_TIMESTAMP = (1980, 1, 1, 0, 0, 0)
+
+LAZY_INIT = '''
+
+# Written by build_layer.py in place of the package imports above: each name is
+# imported on first use, so importing one doesn't import them all.
+import importlib as _importlib
+import sys as _sys
+import types as _types
+
+_LAZY = {lazy}
+
+
+class _LazyModule(_types.ModuleType):
+    def __getattr__(self, name):
+        try:
+            module, attribute = _LAZY[name]
+        except KeyError:
+            raise AttributeError(f"module {{self.__name__!r}} has no attribute {{name!r}}") from None
+        value = _importlib.import_module(module, self.__name__)
+        if attribute is not None:
+            value = getattr(value, attribute)
+        setattr(self, name, value)
+        return value
+
+    def __setattr__(self, name, value):
+        # Importing github.GithubException binds the submodule to the package's
+        # GithubException, where the original imports bound the class.
+        target = _LAZY.get(name)
+        if (
+            target is not None
+            and target[1] is not None
+            and isinstance(value, _types.ModuleType)
+            and value.__name__ == self.__name__ + target[0]
+        ):
+            value = getattr(value, target[1])
+        super().__setattr__(name, value)
+
+    def __dir__(self):
+        return sorted(set(super().__dir__()) | set(_LAZY))
+
+
+_sys.modules[__name__].__class__ = _LazyModule
+'''
+
+
+def requirements(path: Path) -> list[str]:
+    """Requirement lines of ``path``, without the ones the runtime provides."""
+    wanted = []
+    for line in path.read_text().splitlines():
+        line = line.split("#")[0].strip()
+        name = line.split(";")[0].split("[")[0]
+        for sep in "<>=!~ ":
+            name = name.split(sep)[0]
+        if line and name.lower() not in RUNTIME_PROVIDED:
+            wanted.append(line)
+    return wanted
+
+
+def pip_install(packages: list[str], target: Path, python_version: str, platform: str | None) -> None:
+    command = [sys.executable, "-m", "pip", "install", "--quiet", "--no-compile", "--target", str(target)]
+    if platform:
+        # wheels for the Lambda runtime rather than for the machine building the layer
+        command += ["--platform", platform, "--python-version", python_version, "--implementation", "cp"]
+        command += ["--only-binary=:all:"]
+    subprocess.run(command + packages, check=True)
+
+
+def prune(site: Path) -> int:
+    """Delete what the handler doesn't need from ``site``; bytes freed."""
+
+    def size(path: Path) -> int:
+        return path.stat().st_size if path.is_file() else sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
+
+    doomed = [p for p in site.iterdir() if any(p.name.split("-")[0].split(".")[0] == name for name in UNUSED)]
+    for path in sorted(site.rglob("*")):
+        if path.is_dir() and (path.name in JUNK_DIRS or path.name.endswith("-stubs")):
+            doomed.append(path)
+        elif path.is_file() and path.suffix in JUNK_SUFFIXES:
+            doomed.append(path)
+    freed = 0
+    for path in doomed:
+        if not path.exists():
+            continue  # inside a directory already deleted
+        freed += size(path)
+        if path.is_dir():
+            shutil.rmtree(path)
+        else:
+            path.unlink()
+    return freed
+
+
+def lazy_init(path: Path) -> None:
+    """Rewrite a package's ``__init__.py`` so that its relative ``from . import`` names are imported on first use."""
+    source = path.read_text()
+    lines = source.splitlines(keepends=True)
+    lazy: dict[str, tuple[str, str | None]] = {}
+    dropped: set[int] = set()
+    for node in ast.parse(source).body:
+        if not (isinstance(node, ast.ImportFrom) and node.level == 1):
+            continue
+        for alias in node.names:
+            if node.module:
+                lazy[alias.asname or alias.name] = (f".{node.module}", alias.name)
+            else:
+                lazy[alias.asname or alias.name] = (f".{alias.name}", None)
+        dropped.update(range(node.lineno - 1, node.end_lineno))
+    kept = "".join(line for i, line in enumerate(lines) if i not in dropped)
+    path.write_text(kept + LAZY_INIT.format(lazy=pprint.pformat(lazy)))
+
+
+def find_python(version: str) -> str | None:
+    if f"{sys.version_info.major}.{sys.version_info.minor}" == version:
+        return sys.executable
+    return shutil.which(f"python{version}")
+
+
+def compile_bytecode(site: Path, python: str) -> None:
+    # The same sources compile to the same bytes wherever and whenever they're built: with the path the layer is
+    # unpacked to rather than the build directory's (which tracebacks show too), and with a fixed hash seed, which
+    # decides the order frozenset constants are written in.
+    subprocess.run(
+        [python, "-m", "compileall", "-q", "-j", "0", "--invalidation-mode", "unchecked-hash"]
+        + ["-s", str(site), "-p", LAYER_PATH, str(site)],
+        env=dict(os.environ, PYTHONHASHSEED="0"),
+        check=True,
+    )
+
+
+def write_zip(root: Path, out: Path) -> None:
+    """
+    Zip the files under ``root``, byte for byte the same for the same files:
+    entries sorted, with fixed timestamps and permissions, so that an
+    unchanged layer has an unchanged hash. Written atomically.
+    """
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out.with_name(out.name + ".tmp")
+    with zipfile.ZipFile(tmp, "w", zipfile.ZIP_DEFLATED, compresslevel=9) as archive:
+        for path in sorted(root.rglob("*")):
+            if not path.is_file():
+                continue
+            info = zipfile.ZipInfo(path.relative_to(root).as_posix(), date_time=ZIP_TIMESTAMP)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.create_system = 3  # unix, so that the permissions below are honoured
+            info.external_attr = (0o755 if path.stat().st_mode & 0o111 else 0o644) << 16
+            archive.writestr(info, path.read_bytes(), compresslevel=9)
+    os.replace(tmp, out)
+
+
+def build(
+    out_dir: Path,
+    requirements_file: Path = HERE / "requirements.txt",
+    python_version: str = "3.9",
+    platform: str | None = "manylinux2014_aarch64",
+    slim: bool = True,
+    compile: bool = True,
+) -> Path:
+    """
+    Install the layer into ``out_dir/python`` (the directory layers are unpacked from) and return that.
+
+    :param platform: pip platform tag of the runtime, None for the machine's own (e.g. to import the layer locally)
+    :param slim: prune and lazily import, see the module docstring; False for plain ``pip install``
+    :param compile: ship bytecode, which needs a Python ``python_version`` interpreter on the PATH
+    """
+    site = out_dir / "python"
+    if site.exists():
+        shutil.rmtree(site)
+    pip_install(requirements(requirements_file), site, python_version, platform)
+    if slim:
+        freed = prune(site)
+        log.info("Pruned %.1f MiB", freed / 2**20)
+        if (site / "github" / "__init__.py").exists():
+            lazy_init(site / "github" / "__init__.py")
+    if compile:
+        python = find_python(python_version)
+        if python is None:
+            raise SystemExit(f"No python{python_version} to compile bytecode with: install it, or pass --no-compile")
+        compile_bytecode(site, python)
+    return site
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", type=Path, default=HERE / "build" / "layer.zip", help="layer zip to write")
+    parser.add_argument("--requirements", type=Path, default=HERE / "requirements.txt")
+    parser.add_argument("--python-version", default="3.9", help="of the Lambda runtime")
+    parser.add_argument("--platform", default="manylinux2014_aarch64", help="pip platform tag of the runtime")
+    parser.add_argument("--full", action="store_true", help="no pruning or lazy imports")
+    parser.add_argument("--no-compile", action="store_true", help="don't ship bytecode")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        build(root, args.requirements, args.python_version, args.platform or None, not args.full, not args.no_compile)
+        write_zip(root, args.out)
+    log.info("Wrote %s (%.1f MiB)", args.out, args.out.stat().st_size / 2**20)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,55 @@
 import os
+import json
+import time
 import base64
 import logging
 import boto3
-from botocore.exceptions import ClientError
-from github import Github
+from botocore.exceptions import BotoCoreError, ClientError
+from github import Auth, BadCredentialsException, Github
+from github.Consts import DEFAULT_BASE_URL
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 logger.addHandler(logging.StreamHandler())
 
+# How long a warm container keeps using the token it fetched before asking
+# Secrets Manager again, so that a rotated token is picked up eventually even
+# if the old one keeps working.
+DEFAULT_TOKEN_TTL_SECONDS = 900
+
+# Module level, so that they outlive the invocation: a warm container reuses
+# the Secrets Manager client, the token and the GitHub connection instead of
+# setting them up again on every event.
+_secrets_client = None
+_sagemaker_client = None
+_github_token = None
+_github_token_fetched_at = 0.0
+_github = None
+
+
+def get_secrets_client():
+    global _secrets_client
+    if _secrets_client is None:
+        session = boto3.session.Session()
+        _secrets_client = session.client(
+            service_name="secretsmanager", region_name=os.environ["Region"]
+        )
+    return _secrets_client
+
+
+def get_sagemaker_client():
+    global _sagemaker_client
+    if _sagemaker_client is None:
+        session = boto3.session.Session()
+        _sagemaker_client = session.client(
+            service_name="sagemaker", region_name=os.environ["Region"]
+        )
+    return _sagemaker_client
+
 
 def get_secret():
     secret_name = os.environ["GitHubTokenSecretName"]
-    region_name = os.environ["Region"]
-
-    session = boto3.session.Session()
-    client = session.client(
-        service_name="secretsmanager", region_name=region_name
-    )
+    client = get_secrets_client()
 
     try:
         get_secret_value_response = client.get_secret_value(
@@ -48,37 +80,172 @@ def get_secret():
         else:
             decoded_binary_secret = base64.b64decode(
                 get_secret_value_response["SecretBinary"]
-            )
+            ).decode()
             return decoded_binary_secret.split(":")[-1].strip('"}')
 
     return None
 
 
-def lambda_handler(event, context):
-    github_repo_name = os.environ["DeployRepoName"]
-    github_workflow_name = os.environ["GitHubWorkflowNameForDeployment"]
-    github_token = get_secret()
+def get_github_token(force_refresh=False):
+    """The GitHub token, fetched from Secrets Manager once per GitHubTokenTTLSeconds."""
+    global _github_token, _github_token_fetched_at, _github
+
+    ttl = float(os.environ.get("GitHubTokenTTLSeconds", DEFAULT_TOKEN_TTL_SECONDS))
+    age = time.monotonic() - _github_token_fetched_at
+    if force_refresh or _github_token is None or age > ttl:
+        github_token = get_secret()
+        if github_token is None:
+            raise Exception("Failed to retrieve secret from Secrets Manager")
+        if github_token != _github_token:
+            # the cached client authenticates with the old token
+            _github = None
+        _github_token = github_token
+        _github_token_fetched_at = time.monotonic()
+    return _github_token
 
-    if github_token is None:
-        raise Exception("Failed to retrieve secret from Secrets Manager")
 
-    # Connecting to GitHub using Token Access
-    g = Github(github_token)
+def get_github(force_refresh=False):
+    """A GitHub client kept for the container's lifetime, see ``get_github_token``."""
+    global _github
 
+    github_token = get_github_token(force_refresh)
+    if _github is None:
+        # Connecting to GitHub using Token Access
+        _github = Github(
+            auth=Auth.Token(github_token),
+            base_url=os.environ.get("GitHubApiUrl", DEFAULT_BASE_URL),
+        )
+    return _github
+
+
+def trigger_workflow(g, github_repo_name, github_workflow_name, ref, inputs):
     # Getting repository and trigger the deploy GitHub workflow
+    repo = g.get_user().get_repo(github_repo_name)
+    workflow = repo.get_workflow(github_workflow_name)
+    branch = repo.get_branch(ref)
+    return workflow.create_dispatch(branch, inputs)
+
+
+def dispatch_workflow(g, owner, github_repo_name, github_workflow_name, ref, inputs):
+    """
+    Only the workflow_dispatch POST: the repository, workflow and ref aren't
+    looked up first, so a wrong name shows up as the POST failing instead.
+    """
+    url = f"/repos/{owner}/{github_repo_name}/actions/workflows/{github_workflow_name}/dispatches"
+    # requestJsonAndCheck rather than Workflow.create_dispatch, which returns
+    # False on a 401 where this raises BadCredentialsException
+    g.requester.requestJsonAndCheck("POST", url, input={"ref": ref, "inputs": inputs})
+    return True
+
+
+def deploy(model_package_arn=None):
+    """Dispatch the deploy workflow, passing it the approved model package if known; whether that worked."""
+    github_repo_name = os.environ["DeployRepoName"]
+    github_workflow_name = os.environ["GitHubWorkflowNameForDeployment"]
+    ref = os.environ.get("GitHubDispatchRef", "main")
+    validate = os.environ.get("GitHubValidateDispatch", "false").lower() == "true"
+    # off unless set: GitHub rejects a dispatch with inputs the deploy workflow doesn't declare
+    arn_input = os.environ.get("GitHubWorkflowArnInput", "")
+    inputs = {arn_input: model_package_arn} if arn_input and model_package_arn else {}
+    g = get_github()
+
+    def trigger(g):
+        if validate:
+            return trigger_workflow(g, github_repo_name, github_workflow_name, ref, inputs)
+        # without a configured owner, the repository is the token user's, as with validation
+        owner = os.environ.get("GitHubRepositoryOwnerName") or g.get_user().login
+        return dispatch_workflow(g, owner, github_repo_name, github_workflow_name, ref, inputs)
+
     try:
-        repo = g.get_user().get_repo(github_repo_name)
-        workflow = repo.get_workflow(github_workflow_name)
-        branch = repo.get_branch("main")
-        res = workflow.create_dispatch(branch)
+        try:
+            res = trigger(g)
+        except BadCredentialsException:
+            # The token was rotated (or revoked) since this container cached it
+            logger.info("GitHub rejected the cached token, fetching it again")
+            g = get_github(force_refresh=True)
+            res = trigger(g)
 
         # If res is False, it has failed.
         if not res:
             raise Exception()
 
     except Exception:
-        message = "Failed to trigger the GitHub workflow"
-        logger.error(message, exc_info=1)
-        return {"message": message}
+        logger.error("Failed to trigger the GitHub workflow", exc_info=1)
+        return False
+
+    return True
+
+
+def latest_approvals(records):
+    """
+    Coalesce a batch of SQS messages holding "SageMaker Model Package State
+    Change" events: the latest approved version's event detail for each model
+    package group, and the ids of the messages about each group.
+    """
+    latest = {}
+    message_ids = {}
+    for record in records:
+        try:
+            detail = json.loads(record["body"])["detail"]
+            group = detail["ModelPackageGroupName"]
+        except (KeyError, TypeError, ValueError):
+            logger.warning("Skipping message %s: not a model package state change", record.get("messageId"))
+            continue
+        if detail.get("ModelApprovalStatus") != "Approved":
+            continue
+        message_ids.setdefault(group, []).append(record["messageId"])
+        if group not in latest or detail.get("ModelPackageVersion", 0) > latest[group].get("ModelPackageVersion", 0):
+            latest[group] = detail
+    return latest, message_ids
 
-    return {"message": "Success!"}
+
+def latest_approved_arn(group):
+    """The ARN of the model package group's most recently created Approved version, per the registry."""
+    response = get_sagemaker_client().list_model_packages(
+        ModelPackageGroupName=group,
+        ModelApprovalStatus="Approved",
+        SortBy="CreationTime",
+        SortOrder="Descending",
+        MaxResults=1,
+    )
+    summaries = response["ModelPackageSummaryList"]
+    return summaries[0]["ModelPackageArn"] if summaries else None
+
+
+def lambda_handler(event, context):
+    event = event or {}
+    if "Records" not in event:
+        # invoked by the EventBridge rule directly, or by hand without an event
+        detail = event.get("detail") or {}
+        if deploy(detail.get("ModelPackageArn")):
+            return {"message": "Success!"}
+        return {"message": "Failed to trigger the GitHub workflow"}
+
+    # a batch from the approval queue: one deploy per model package group, of
+    # its latest approved version, however many approvals the batch holds
+    latest, message_ids = latest_approvals(event["Records"])
+    failures = []
+    for group, detail in latest.items():
+        # the batch only knows its own messages: one redelivered after a failure, or a burst that
+        # was split across concurrent batches, may be older than what the registry has approved since
+        try:
+            current_arn = latest_approved_arn(group)
+        except (BotoCoreError, ClientError):
+            logger.error("Failed to look up the latest approved version of %s", group, exc_info=1)
+            failures.extend({"itemIdentifier": message_id} for message_id in message_ids[group])
+            continue
+        if current_arn != detail.get("ModelPackageArn"):
+            logger.info(
+                "Skipping %s version %s: the latest approved package is %s",
+                group, detail.get("ModelPackageVersion"), current_arn,
+            )
+            continue
+
+        logger.info(
+            "Deploying %s version %s for %d approval(s)",
+            group, detail.get("ModelPackageVersion"), len(message_ids[group]),
+        )
+        if not deploy(detail.get("ModelPackageArn")):
+            # retried by SQS, together with the approvals that were coalesced into it
+            failures.extend({"itemIdentifier": message_id} for message_id in message_ids[group])
+    return {"batchItemFailures": failures}
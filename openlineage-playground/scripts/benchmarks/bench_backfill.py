@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Events/sec of ``Backfill`` replaying an NDJSON file (as written by ``FileTransport``)
+into a local ``MockMarquezServer``, at a few concurrency levels.
+
+    uv run python benchmarks/bench_backfill.py --events 20000 --latency-ms 1
+"""
+
+import argparse
+import tempfile
+from pathlib import Path
+
+from openlineage.client.serde import Serde
+from openlineage.client.transport.http import HttpConfig
+
+from bench_emitter import make_events
+from openlineage_playground.backfill import Backfill
+from openlineage_playground.mock_marquez import MockMarquezServer
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=20_000)
+    parser.add_argument("--latency-ms", type=float, default=1.0, help="simulated per-request backend latency")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp, MockMarquezServer(latency=args.latency_ms / 1000) as server:
+        events_file = Path(tmp) / "ol.json"
+        with open(events_file, "w") as f:
+            for ev in make_events(args.events):
+                f.write(Serde.to_json(ev) + "\n")
+
+        for concurrency in args.concurrency:
+            server.reset()
+            backfill = Backfill(
+                [events_file],
+                HttpConfig(url=server.url),
+                checkpoint_path=Path(tmp) / f"checkpoint-{concurrency}.json",
+                concurrency=concurrency,
+            )
+            stats = backfill.run()
+            assert server.event_count == args.events, server.event_count
+            print(f"concurrency {concurrency:>3}: {stats.events_per_sec:10,.0f} events/s  ({stats.elapsed:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
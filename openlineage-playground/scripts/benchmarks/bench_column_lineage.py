@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Cost of building ``ColumnLineageDatasetFacet``s for wide tables: ``ColumnLineageBuilder``
+(dict-indexed ``SchemaCatalog``) versus resolving unqualified source columns by
+scanning each input table's column list. Statements are synthetic joins of two
+wide tables, so no SQL parsing is involved.
+
+    uv run python benchmarks/bench_column_lineage.py --statements 2000 --widths 50 200 800
+"""
+
+import argparse
+import time
+
+from openlineage_playground.column_lineage import ColumnLineageBuilder
+from openlineage_playground.sql_lineage import ColumnLineage, ColumnRef, StatementLineage, TableRef
+
+NAMESPACE = "parse_sql"
+
+
+def make_statements(n: int, width: int) -> list[StatementLineage]:
+    """``CREATE TABLE t_{i} AS SELECT <all columns> FROM t_{i-1} JOIN dim_{i}``, left and right columns unqualified."""
+    statements = []
+    for i in range(n):
+        left, right, out = TableRef("DB", "S", f"T_{i}"), TableRef("DB", "S", f"DIM_{i}"), TableRef("DB", "S", f"T_{i + 1}")
+        # only the first statement's sources are qualified; later ones leave it to the catalog, which knows
+        # each T_i from the statement that wrote it and each DIM_i from its seeded schema
+        qualified = i == 0
+        lineage = tuple(
+            ColumnLineage(
+                descendant=f"c{c}" if c < width else f"d{c}",
+                sources=(ColumnRef(table=(left if c < width else right) if qualified else None,
+                                   name=f"c{c}" if c < width else f"d{c}"),),
+            )
+            for c in range(2 * width)
+        )
+        statements.append(StatementLineage(i, "", (left, right), (out,), lineage, (), 0.0))
+    return statements
+
+
+def naive(statements: list[StatementLineage]) -> int:
+    """Column names kept as lists and searched linearly, the way parse_sql.py walked ``cl.lineage``."""
+    columns: dict[str, list[str]] = {"DB.S.DIM_0": []}
+    resolved = 0
+    for st in statements:
+        out = st.out_tables[0].qualified_name
+        inputs = [t.qualified_name for t in st.in_tables]
+        columns.setdefault(inputs[1], [f"d{c}" for c in range(len(st.column_lineage) // 2, len(st.column_lineage))])
+        out_columns = columns.setdefault(out, [])
+        for cl in st.column_lineage:
+            if cl.descendant not in out_columns:
+                out_columns.append(cl.descendant)
+            for src in cl.sources:
+                owners = [t for t in inputs if src.name in columns.get(t, [])]
+                resolved += len(owners) == 1
+    return resolved
+
+
+def with_catalog(statements: list[StatementLineage]) -> int:
+    builder = ColumnLineageBuilder(NAMESPACE)
+    width = len(statements[0].column_lineage) // 2
+    for i in range(len(statements)):
+        builder.catalog.add_table(f"DB.S.DIM_{i}", [f"d{c}" for c in range(width, 2 * width)])
+    n_fields = 0
+    for st in statements:
+        facet = builder.facet(st)
+        n_fields += len(facet.fields) if facet else 0
+    return n_fields
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--statements", type=int, default=2000)
+    parser.add_argument("--widths", type=int, nargs="+", default=[50, 200, 800], help="columns per input table")
+    args = parser.parse_args()
+
+    for width in args.widths:
+        statements = make_statements(args.statements, width)
+        n_columns = args.statements * 2 * width
+        for label, fn in (("list scan", naive), ("SchemaCatalog", with_catalog)):
+            start = time.perf_counter()
+            fn(statements)
+            elapsed = time.perf_counter() - start
+            print(f"width {width:>4}  {label:<14} {elapsed:8.2f}s  {elapsed / n_columns * 1e6:6.2f} µs/column")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Bytes and CPU time spent compressing lineage request bodies: what ``HttpTransport``
+does (gzip level 9 on every body) versus ``AdaptiveCompressor`` (small bodies
+uncompressed, gzip level 6, optionally zstd for large batches). Bodies are a mix
+of bare START events and ``log_housing_events.py``-shaped events with schema
+facets, sent one per request and as 100-event JSON arrays.
+
+    uv run python benchmarks/bench_compression.py --events 2000
+"""
+
+import argparse
+import gzip
+import time
+
+from openlineage.client.event_v2 import Job, Run, RunEvent, RunState
+from openlineage.client.serde import Serde
+from openlineage.client.uuid import generate_new_uuid
+
+from openlineage_playground.compression import AdaptiveCompressor, zstandard
+from openlineage_playground.emitter import BatchedHttpConfig, BatchedHttpTransport
+from openlineage_playground.mock_marquez import MockMarquezServer
+from run_suite import PRODUCER, HousingWorkload
+
+
+def make_bodies(n: int) -> tuple[list[bytes], list[bytes]]:
+    """Single-event bodies (half bare START events, half faceted events) and 100-event batches of them."""
+    workload = HousingWorkload(n // 2)
+    payloads = [Serde.to_json(workload.build(spec)) for spec in workload.specs]
+    payloads += [
+        Serde.to_json(
+            RunEvent(
+                eventType=RunState.START,
+                eventTime=workload.specs[0][2],
+                run=Run(runId=str(generate_new_uuid())),
+                job=Job(namespace="house_regression", name="housing_regression_flow.start"),
+                producer=PRODUCER,
+            )
+        )
+        for _ in range(n // 2)
+    ]
+    singles = [p.encode("utf-8") for p in payloads]
+    batches = [("[" + ",".join(payloads[i : i + 100]) + "]").encode("utf-8") for i in range(0, len(payloads), 100)]
+    return singles, batches
+
+
+def report(label: str, bodies: list[bytes], compress) -> None:
+    start = time.thread_time()
+    out = sum(len(compress(b)) for b in bodies)
+    cpu = time.thread_time() - start
+    size = sum(len(b) for b in bodies)
+    print(f"  {label:<28} {size:>11,} -> {out:>10,} bytes ({out / size:6.1%})  {cpu * 1e6 / len(bodies):8.1f} us CPU/body")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=2000)
+    args = parser.parse_args()
+
+    singles, batches = make_bodies(args.events)
+    adaptive = AdaptiveCompressor()
+    for label, bodies in (("one event per request", singles), ("100-event batches", batches)):
+        print(label)
+        report("gzip level 9 (HttpTransport)", bodies, gzip.compress)
+        report("AdaptiveCompressor", bodies, lambda b: adaptive.compress(b)[0])
+        if zstandard is not None:
+            zstd = AdaptiveCompressor(zstd_min_bytes=0)
+            report("zstd level 3", bodies, lambda b: zstd.compress(b)[0])
+
+    print("BatchedHttpTransport end to end, compressor.stats():")
+    with MockMarquezServer() as server:
+        transport = BatchedHttpTransport(BatchedHttpConfig(url=server.url, compression="gzip"))
+        for body in singles:
+            transport.emit_json(body.decode("utf-8"))
+        transport.close()
+        assert server.event_count == len(singles), server.event_count
+        for encoding, stats in transport.compressor.stats().items():
+            print(f"  {encoding:<9} {stats}")
+
+
+if __name__ == "__main__":
+    main()
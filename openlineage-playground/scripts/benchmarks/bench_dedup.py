@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+What ``dedup`` saves when a run's events are emitted again (a rerun, a retry,
+a replayed spool), against a local ``MockMarquezServer``: requests, bytes and
+wall time with and without ``dedup_window``, plus what deduplicating costs per
+event, how much memory the Bloom filter takes against an exact set of the same
+keys, and its measured false positive rate when full. DatasetEvents, which
+have no run to key on, are mixed in and always sent.
+
+    uv run python benchmarks/bench_dedup.py --runs 2000 --replays 1 --latency-ms 1
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from openlineage.client.event_v2 import Dataset, DatasetEvent, RunState
+from openlineage.client.facet_v2 import schema_dataset, sql_job
+from openlineage.client.serde import Serde
+from openlineage.client.uuid import generate_new_uuid
+
+from openlineage_playground.dedup import BloomFilter, EventDeduplicator
+from openlineage_playground.emitter import BatchedHttpConfig, BatchedHttpTransport
+from openlineage_playground.event_factory import EventFactory
+from openlineage_playground.mock_marquez import MockMarquezServer
+
+PRODUCER = "https://github.com/openlineage-user"
+NAMESPACE = "parse_sql"
+
+
+def make_events(n_runs: int) -> list[str]:
+    """START and COMPLETE for ``n_runs`` sub-jobs with a SQL facet and schema facets on their datasets."""
+    factory = EventFactory(PRODUCER, NAMESPACE)
+    fields = [schema_dataset.SchemaDatasetFacetFields(name=f"column_{i}", type="VARCHAR") for i in range(20)]
+    events = []
+    for i in range(n_runs):
+        job = factory.job(
+            f"script.sql.{i}", {"sql": sql_job.SQLJobFacet(query=f"INSERT INTO table_{i + 1} SELECT * FROM table_{i}")}
+        )
+        inputs = [factory.dataset(f"table_{i}", {"schema": schema_dataset.SchemaDatasetFacet(fields=fields)})]
+        outputs = [factory.dataset(f"table_{i + 1}", {"schema": schema_dataset.SchemaDatasetFacet(fields=fields)})]
+        run_id = str(generate_new_uuid())
+        events.append(factory.run_event(RunState.START, job, run_id, f"2025-01-01T00:00:{i % 60:02d}Z", inputs, outputs))
+        events.append(
+            factory.run_event(RunState.COMPLETE, job, run_id, f"2025-01-01T00:01:{i % 60:02d}Z", inputs, outputs)
+        )
+    return events
+
+
+def make_dataset_events(n: int) -> list[str]:
+    """DatasetEvents declaring ``n`` tables, without a run: dedup passes them through."""
+    return [
+        Serde.to_json(
+            DatasetEvent(
+                eventTime=f"2025-01-01T00:02:{i % 60:02d}Z",
+                producer=PRODUCER,
+                dataset=Dataset(namespace=NAMESPACE, name=f"table_{i}"),
+            )
+        )
+        for i in range(n)
+    ]
+
+
+def send(server: MockMarquezServer, events: list[str], replays: int, **dedup) -> float:
+    server.reset()
+    transport = BatchedHttpTransport(BatchedHttpConfig(url=server.url, **dedup))
+    start = time.perf_counter()
+    for _ in range(1 + replays):
+        for event in events:
+            transport.emit_json(event)
+        transport.flush()
+    elapsed = time.perf_counter() - start
+    transport.close()
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=2000)
+    parser.add_argument("--replays", type=int, default=1, help="times every event is emitted again")
+    parser.add_argument("--latency-ms", type=float, default=1.0, help="simulated per-request backend latency")
+    parser.add_argument("--capacity", type=int, default=1_000_000, help="keys in the Bloom filter for the memory test")
+    args = parser.parse_args()
+
+    events = make_events(args.runs)
+    dataset_events = make_dataset_events(args.runs // 10)
+    with MockMarquezServer(latency=args.latency_ms / 1000) as server:
+        for label, dedup in [
+            ("no dedup", {}),
+            ("dedup", {"dedup_window": 10_000}),
+            ("dedup + facets", {"dedup_window": 10_000, "dedup_facets": True}),
+        ]:
+            elapsed = send(server, events, args.replays, **dedup)
+            print(
+                f"{label:<15} {elapsed:6.2f}s  {server.request_count:6} requests  "
+                f"{server.bytes_received / 2**20:7.2f} MiB received"
+            )
+        send(server, events + dataset_events, args.replays, dedup_window=10_000)
+        expected = len(events) + len(dataset_events) * (1 + args.replays)
+        assert server.request_count == expected, (server.request_count, expected)
+        print(f"with {len(dataset_events)} DatasetEvents: {server.request_count} requests, all of them sent each time")
+
+    dedup = EventDeduplicator(strip_facets=True)
+    start = time.perf_counter()
+    for event in events:
+        payload, token = dedup.prepare(event)
+        dedup.confirm(token)
+    first = (time.perf_counter() - start) / len(events)
+    start = time.perf_counter()
+    for event in events:
+        dedup.prepare(event)
+    again = (time.perf_counter() - start) / len(events)
+    print(f"per event: {first * 1e6:.1f} us new, {again * 1e6:.1f} us duplicate")
+
+    keys = [f"{i}\0COMPLETE\0{i}".encode() for i in range(args.capacity)]
+    tracemalloc.start()
+    exact = set(keys)
+    exact_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del exact
+    bloom = BloomFilter(args.capacity)
+    for key in keys:
+        bloom.add(key)
+    fresh = 200_000
+    false_positives = sum(f"new-{i}".encode() in bloom for i in range(fresh))
+    print(
+        f"{args.capacity:,} keys: Bloom filter {bloom.nbytes / 2**20:.1f} MiB ({bloom.hashes} hashes), "
+        f"set of the keys {exact_bytes / 2**20:.1f} MiB (not counting the keys); "
+        f"{false_positives} false positives in {fresh:,} new keys"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Events/sec of the per-event ``client.emit()`` loop the scripts use today versus
+``BatchedHttpTransport``, against a local ``MockMarquezServer``.
+
+    uv run python benchmarks/bench_emitter.py --events 2000 --latency-ms 1
+"""
+
+import argparse
+import time
+from datetime import datetime, timezone
+
+from openlineage.client import OpenLineageClient
+from openlineage.client.event_v2 import InputDataset, Job, OutputDataset, Run, RunEvent, RunState
+from openlineage.client.transport.http import HttpCompression, HttpConfig, HttpTransport
+from openlineage.client.uuid import generate_new_uuid
+
+from openlineage_playground.emitter import BatchedHttpConfig, BatchedHttpTransport
+from openlineage_playground.mock_marquez import MockMarquezServer
+
+PRODUCER = "https://github.com/openlineage-user"
+NAMESPACE = "parse_sql"
+
+
+def make_events(n: int) -> list[RunEvent]:
+    """COMPLETE events shaped like the ``script.sql.{i}`` sub-jobs in parse_sql.py."""
+    events = []
+    for i in range(n):
+        events.append(
+            RunEvent(
+                eventType=RunState.COMPLETE,
+                eventTime=datetime.now(timezone.utc).isoformat(),
+                run=Run(runId=str(generate_new_uuid())),
+                job=Job(namespace=NAMESPACE, name=f"script.sql.{i}"),
+                producer=PRODUCER,
+                inputs=[InputDataset(NAMESPACE, f"table_{i}"), InputDataset(NAMESPACE, f"table_{i + 1}")],
+                outputs=[OutputDataset(NAMESPACE, f"table_{i + 2}")],
+            )
+        )
+    return events
+
+
+def run_sync(server: MockMarquezServer, events: list[RunEvent]) -> float:
+    client = OpenLineageClient(
+        transport=HttpTransport(HttpConfig(url=server.url, compression=HttpCompression.GZIP))
+    )
+    start = time.perf_counter()
+    for ev in events:
+        client.emit(ev)
+    return time.perf_counter() - start
+
+
+def run_batched(server: MockMarquezServer, events: list[RunEvent], batch_endpoint: str | None) -> tuple[float, float]:
+    transport = BatchedHttpTransport(
+        BatchedHttpConfig(url=server.url, compression=HttpCompression.GZIP, batch_endpoint=batch_endpoint)
+    )
+    client = OpenLineageClient(transport=transport)
+    start = time.perf_counter()
+    for ev in events:
+        client.emit(ev)
+    enqueued = time.perf_counter() - start
+    transport.close()
+    return enqueued, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--latency-ms", type=float, default=1.0, help="simulated per-request backend latency")
+    args = parser.parse_args()
+
+    events = make_events(args.events)
+    with MockMarquezServer(latency=args.latency_ms / 1000) as server:
+        elapsed = run_sync(server, events)
+        print(f"client.emit() loop:           {len(events) / elapsed:10,.0f} events/s  ({elapsed:.2f}s)")
+
+        server.reset()
+        enqueued, elapsed = run_batched(server, events, batch_endpoint=None)
+        print(
+            f"BatchedHttpTransport:         {len(events) / elapsed:10,.0f} events/s  ({elapsed:.2f}s, "
+            f"caller blocked {enqueued:.3f}s, {server.request_count} requests)"
+        )
+
+        server.reset()
+        enqueued, elapsed = run_batched(server, events, batch_endpoint="api/v1/lineage")
+        print(
+            f"BatchedHttpTransport (array): {len(events) / elapsed:10,.0f} events/s  ({elapsed:.2f}s, "
+            f"caller blocked {enqueued:.3f}s, {server.request_count} requests)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Events/sec of building and serializing ``emit_sql_job``-style START/COMPLETE pairs
+the way log_housing_events.py used to (fresh Job/Run/facet objects + ``Serde``)
+versus ``EventFactory`` templates. No network involved.
+
+    uv run python benchmarks/bench_event_factory.py --runs 5000
+"""
+
+import argparse
+import json
+import time
+from datetime import datetime, timedelta, timezone
+
+from openlineage.client.event_v2 import InputDataset, Job, OutputDataset, Run, RunEvent, RunState
+from openlineage.client.facet_v2 import nominal_time_run, parent_run, schema_dataset, source_code_location_job, sql_job
+from openlineage.client.serde import Serde
+from openlineage.client.uuid import generate_new_uuid
+
+from openlineage_playground.event_factory import EventFactory
+
+PRODUCER = "https://github.com/openlineage-user"
+NAMESPACE = "house_regression"
+REPO_URL = "https://github.com/your-org/pipelines/housing_regression_flow.py"
+SQL = """
+CREATE OR REPLACE TABLE enriched_sales AS
+SELECT s.*, l.zipcode, l.school_rating
+FROM cleaned_sales s
+JOIN location_info l ON s.house_id = l.house_id;
+"""
+SCHEMA = {
+    "schema": schema_dataset.SchemaDatasetFacet(
+        fields=[
+            schema_dataset.SchemaDatasetFacetFields("house_id", "INT"),
+            schema_dataset.SchemaDatasetFacetFields("price", "FLOAT"),
+            schema_dataset.SchemaDatasetFacetFields("sqft", "FLOAT"),
+            schema_dataset.SchemaDatasetFacetFields("bedrooms", "INT"),
+            schema_dataset.SchemaDatasetFacetFields("bathrooms", "FLOAT"),
+            schema_dataset.SchemaDatasetFacetFields("zipcode", "STRING"),
+            schema_dataset.SchemaDatasetFacetFields("school_rating", "INT"),
+        ]
+    )
+}
+
+
+def baseline(runs: int, parent_run_id: str, pretty: bool) -> int:
+    """What emit_sql_job() in log_housing_events.py did for every run."""
+    n_bytes = 0
+    for _ in range(runs):
+        job = Job(
+            namespace=NAMESPACE,
+            name="execute_sql.enriched_sales",
+            facets={
+                "sql": sql_job.SQLJobFacet(query=SQL),
+                "sourceCodeLocation": source_code_location_job.SourceCodeLocationJobFacet(type="git", url=REPO_URL),
+            },
+        )
+        now = datetime.now(timezone.utc)
+        run_obj = Run(
+            runId=str(generate_new_uuid()),
+            facets={
+                "nominalTime": nominal_time_run.NominalTimeRunFacet(now.isoformat()),
+                "parent": parent_run.ParentRunFacet(
+                    run={"runId": parent_run_id}, job={"namespace": NAMESPACE, "name": "prepare_data"}
+                ),
+            },
+        )
+        inputs = [InputDataset(NAMESPACE, "cleaned_sales", facets=SCHEMA), InputDataset(NAMESPACE, "location_info")]
+        outputs = [OutputDataset(NAMESPACE, "enriched_sales", facets=SCHEMA)]
+        for event_type, t in ((RunState.START, now), (RunState.COMPLETE, now + timedelta(seconds=2))):
+            ev = RunEvent(
+                eventType=event_type,
+                eventTime=t.isoformat(),
+                run=run_obj,
+                job=job,
+                producer=PRODUCER,
+                inputs=inputs,
+                outputs=outputs,
+            )
+            if pretty:
+                json.dumps(Serde.to_dict(ev), indent=2)
+            n_bytes += len(Serde.to_json(ev))
+    return n_bytes
+
+
+def with_factory(runs: int, parent_run_id: str) -> int:
+    factory = EventFactory(PRODUCER, NAMESPACE)
+    n_bytes = 0
+    for _ in range(runs):
+        # templates are interned, so after the first run these are dict lookups
+        job = factory.job(
+            "execute_sql.enriched_sales",
+            facets={
+                "sql": sql_job.SQLJobFacet(query=SQL),
+                "sourceCodeLocation": source_code_location_job.SourceCodeLocationJobFacet(type="git", url=REPO_URL),
+            },
+        )
+        inputs = [factory.dataset("cleaned_sales", SCHEMA), factory.dataset("location_info")]
+        outputs = [factory.dataset("enriched_sales", SCHEMA)]
+        parent = factory.parent(parent_run_id, "prepare_data")
+        run_id = str(generate_new_uuid())
+        now = datetime.now(timezone.utc)
+        for event_type, t in ((RunState.START, now), (RunState.COMPLETE, now + timedelta(seconds=2))):
+            n_bytes += len(
+                factory.run_event(
+                    event_type, job, run_id, t.isoformat(), inputs, outputs, parent=parent, nominal_time=now.isoformat()
+                )
+            )
+    return n_bytes
+
+
+def report(label: str, runs: int, fn) -> float:
+    start = time.perf_counter()
+    fn()
+    rate = 2 * runs / (time.perf_counter() - start)
+    print(f"{label:<40} {rate:10,.0f} events/s")
+    return rate
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5000, help="START/COMPLETE pairs to build")
+    args = parser.parse_args()
+
+    parent_run_id = str(generate_new_uuid())
+    pretty = report("objects + Serde + indent=2 dump", args.runs, lambda: baseline(args.runs, parent_run_id, True))
+    plain = report("objects + Serde", args.runs, lambda: baseline(args.runs, parent_run_id, False))
+    fast = report("EventFactory", args.runs, lambda: with_factory(args.runs, parent_run_id))
+    print(f"speedup: {fast / plain:.1f}x over objects + Serde, {fast / pretty:.1f}x over the old script")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Per-step wall-time overhead of ``LineageFlowMixin`` on a ``HousingRegressionFlow``-
+shaped flow over a local SQLite database: the same steps run with and without the
+mixin, sending to a mock Marquez in another process, and the overhead is checked against a budget
+(1 ms per step by default). Metaflow isn't needed: steps are marked with a
+stand-in for ``@step``.
+
+    uv run python benchmarks/bench_flow_lineage.py --runs 200 --rows 5000
+"""
+
+import argparse
+import multiprocessing
+import random
+import sqlite3
+import statistics
+import sys
+import time
+
+from openlineage_playground.emitter import BatchedHttpConfig, BatchedHttpTransport
+from openlineage_playground.flow_lineage import LineageFlowMixin, lineage_datasets
+from openlineage_playground.mock_marquez import MockMarquezServer
+
+PREPARE_DATA_SQL = """
+DROP TABLE IF EXISTS cleaned_sales;
+CREATE TABLE cleaned_sales AS
+SELECT *
+FROM house_sales
+WHERE price BETWEEN 10000 AND 1000000;
+
+DROP TABLE IF EXISTS enriched_sales;
+CREATE TABLE enriched_sales AS
+SELECT s.*, l.zipcode, l.school_rating
+FROM cleaned_sales s
+JOIN location_info l ON s.house_id = l.house_id;
+
+DROP TABLE IF EXISTS features;
+CREATE TABLE features AS
+SELECT sqft, bedrooms, bathrooms, school_rating, price
+FROM enriched_sales
+WHERE sqft IS NOT NULL
+  AND bedrooms IS NOT NULL
+  AND bathrooms IS NOT NULL
+  AND school_rating IS NOT NULL;
+"""
+
+
+def step(func):
+    """Stand-in for ``metaflow.step``, which marks a method the same way."""
+    func.is_step = True
+    return func
+
+
+def make_db(rows: int) -> sqlite3.Connection:
+    conn = sqlite3.connect(":memory:", check_same_thread=False)
+    conn.executescript(
+        """
+        CREATE TABLE house_sales (house_id INTEGER, price REAL, sqft REAL, bedrooms INTEGER, bathrooms REAL);
+        CREATE TABLE location_info (house_id INTEGER, zipcode TEXT, school_rating REAL);
+        """
+    )
+    rng = random.Random(0)
+    conn.executemany(
+        "INSERT INTO house_sales VALUES (?, ?, ?, ?, ?)",
+        ((i, rng.uniform(5_000, 1_200_000), rng.uniform(400, 4000), rng.randint(1, 6), rng.randint(1, 4))
+         for i in range(rows)),
+    )
+    conn.executemany(
+        "INSERT INTO location_info VALUES (?, ?, ?)",
+        ((i, f"{rng.randint(10000, 99999)}", rng.uniform(1, 10)) for i in range(rows)),
+    )
+    conn.commit()
+    return conn
+
+
+class HousingFlow:
+    def __init__(self, conn: sqlite3.Connection) -> None:
+        self.conn = conn
+
+    @step
+    def start(self):
+        pass
+
+    @step
+    def prepare_data(self):
+        self.conn.executescript(PREPARE_DATA_SQL)
+        self.conn.commit()
+
+    @lineage_datasets(outputs=["trained_model.pkl"])
+    @step
+    def train_model(self):
+        # stands in for pd.read_sql_query + LinearRegression
+        self.n = len(self.conn.execute("SELECT sqft, bedrooms, bathrooms, school_rating, price FROM features").fetchall())
+
+    @step
+    def end(self):
+        pass
+
+
+def serve(pipe) -> None:
+    """Run the mock Marquez in a child process so its request handling doesn't share the flow's GIL."""
+    with MockMarquezServer() as server:
+        pipe.send(server.url)
+        pipe.recv()
+        pipe.send(server.event_count)
+
+
+def timed_run(flow, between_steps=None) -> dict[str, float]:
+    times = {}
+    for name in ("start", "prepare_data", "train_model", "end"):
+        start = time.perf_counter()
+        getattr(flow, name)()
+        times[name] = time.perf_counter() - start
+        if between_steps:
+            between_steps()
+    return times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--budget-ms", type=float, default=1.0)
+    args = parser.parse_args()
+
+    conn = make_db(args.rows)
+    pipe, child_pipe = multiprocessing.Pipe()
+    server = multiprocessing.Process(target=serve, args=(child_pipe,), daemon=True)
+    server.start()
+    url = pipe.recv()
+
+    class InstrumentedHousingFlow(LineageFlowMixin, HousingFlow):
+        lineage_namespace = "house_regression"
+
+        @classmethod
+        def lineage_transport(cls):
+            return BatchedHttpTransport(BatchedHttpConfig(url=url, compression="gzip"))
+
+    # warm up both, then interleave so drift in the machine hits both sides equally
+    plain, instrumented = HousingFlow(conn), InstrumentedHousingFlow(conn)
+    timed_run(plain), timed_run(instrumented)
+    recorder = InstrumentedHousingFlow._lineage_recorder
+    recorder.flush()
+    background = []
+
+    def flush():
+        # Metaflow runs every step in its own process, which flushes on exit before the next step
+        # starts; without this, a step's parsing and sending would land in the next step here
+        start = time.perf_counter()
+        recorder.flush()
+        background.append(time.perf_counter() - start)
+
+    base, inst = [], []
+    for _ in range(args.runs):
+        base.append(timed_run(plain))
+        inst.append(timed_run(instrumented, flush))
+    pipe.send("stop")
+    events = pipe.recv()
+    server.join()
+
+    print(f"{args.runs} runs, {args.rows} rows, {events} events received")
+    print(f"  flushing a step's lineage when it ends: {statistics.median(background) * 1000:.3f} ms median")
+    # runs are interleaved, so each traced step is compared with the plain one run just before it
+    print(f"  {'step':<14} {'plain ms':>10} {'traced ms':>10} {'overhead ms':>12} {'p95 ms':>8}")
+    worst = 0.0
+    for name in base[0]:
+        b = [t[name] * 1000 for t in base]
+        i = [t[name] * 1000 for t in inst]
+        diffs = sorted(y - x for x, y in zip(b, i))
+        overhead = statistics.median(diffs)
+        p95 = diffs[int(len(diffs) * 0.95)]
+        worst = max(worst, overhead)
+        print(f"  {name:<14} {statistics.median(b):>10.3f} {statistics.median(i):>10.3f} {overhead:>12.3f} {p95:>8.3f}")
+    ok = worst < args.budget_ms
+    print(f"worst median overhead {worst:.3f} ms: {'within' if ok else 'OVER'} the {args.budget_ms} ms budget")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Rows per second of ``housing_data`` generating ``house_sales``/``location_info``
+into SQLite and Parquet, against a row-at-a-time generator (``random`` plus
+``executemany`` of one row per call), with the time 100M rows would take.
+
+    uv run python benchmarks/bench_housing_data.py --rows 2000000
+"""
+
+import argparse
+import random
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from openlineage_playground.housing_data import SQLITE_TABLES, HousingDataGenerator, ParquetSink, SQLiteSink, generate
+
+
+def row_at_a_time(path: Path, rows: int) -> None:
+    rng = random.Random(0)
+    conn = sqlite3.connect(path)
+    for table, columns in SQLITE_TABLES.items():
+        conn.execute(f"CREATE TABLE {table} ({columns})")
+    with conn:
+        for house_id in range(rows):
+            bedrooms = rng.randint(1, 6)
+            sqft = round((350 + 420 * bedrooms) * rng.lognormvariate(0, 0.28))
+            conn.execute(
+                "INSERT INTO house_sales VALUES (?, ?, ?, ?, ?)",
+                (house_id, round(sqft * 180 * rng.lognormvariate(0, 0.22), -2), sqft, bedrooms, rng.randint(1, 4)),
+            )
+            conn.execute(
+                "INSERT INTO location_info VALUES (?, ?, ?)",
+                (house_id, f"{rng.randint(1000, 99999):05d}", rng.randint(1, 10)),
+            )
+    conn.close()
+
+
+def report(label: str, rows: int, elapsed: float) -> None:
+    print(f"  {label:<26} {rows / elapsed:>12,.0f} rows/s   100M rows in {1e8 / rows * elapsed / 60:6.1f} min")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--batch-size", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        # the slow path only gets a slice; its rate doesn't change with size
+        baseline_rows = min(args.rows, 200_000)
+        start = time.perf_counter()
+        row_at_a_time(tmp / "baseline.db", baseline_rows)
+        report("row at a time (SQLite)", baseline_rows, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for _ in HousingDataGenerator().batches(args.rows, args.batch_size):
+            pass
+        report("generate only", args.rows, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        generate(args.rows, [SQLiteSink(tmp / "housing.db")], args.batch_size)
+        report("housing_data (SQLite)", args.rows, time.perf_counter() - start)
+
+        try:
+            sink = ParquetSink(tmp / "parquet")
+        except RuntimeError as e:
+            print(f"  {e}")
+            return
+        start = time.perf_counter()
+        generate(args.rows, [sink], args.batch_size)
+        report("housing_data (Parquet)", args.rows, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Time and peak memory of ``housing_pipeline.train_model`` (``features`` streamed in
+chunks into ``NormalEquations``) against what ``housing_flow.py`` does
+(``pd.read_sql_query`` of the whole table, then ``LinearRegression``), on a
+SQLite database from ``housing_data``. Also times ``prepare_data`` with and
+without the covering index on ``location_info(house_id)``. The
+pandas/scikit-learn side is skipped if they aren't installed.
+
+    uv run python benchmarks/bench_housing_training.py --rows 1000000 --chunk-size 100000
+"""
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+from openlineage_playground.housing_data import SQLiteSink, generate
+from openlineage_playground.housing_pipeline import (
+    FEATURES_SQL,
+    LOCATION_INDEX_SQL,
+    PREPARE_DATA_SQL,
+    connect,
+    prepare_data,
+    train_model,
+)
+
+
+def measure(fn):
+    """Result, seconds and peak traced bytes; timed and traced in separate calls since tracing slows Python down."""
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Path(tmp) / "housing.db"
+        generate(args.rows, [SQLiteSink(db)])
+        conn = connect(db)
+
+        start = time.perf_counter()
+        conn.executescript(PREPARE_DATA_SQL.replace(LOCATION_INDEX_SQL, ""))
+        print(f"prepare_data without the house_id index: {time.perf_counter() - start:6.2f}s")
+        start = time.perf_counter()
+        prepare_data(conn)
+        print(f"prepare_data building the index:         {time.perf_counter() - start:6.2f}s")
+        start = time.perf_counter()
+        prepare_data(conn)
+        print(f"prepare_data with the index in place:    {time.perf_counter() - start:6.2f}s")
+        n = conn.execute("SELECT count(*) FROM features").fetchone()[0]
+        print(f"{n:,} feature rows")
+
+        model, elapsed, peak = measure(lambda: train_model(conn, args.chunk_size))
+        print(f"  chunked NormalEquations           {elapsed:6.2f}s  peak {peak / 2**20:8.1f} MiB  MSE {model.mse():,.0f}")
+
+        try:
+            import pandas as pd
+            from sklearn.linear_model import LinearRegression
+        except ImportError:
+            print("  pandas/scikit-learn not installed; skipping the read_sql_query + LinearRegression baseline")
+            return
+
+        def whole_table():
+            df = pd.read_sql_query(FEATURES_SQL, conn)
+            return LinearRegression().fit(df.drop(columns="price"), df["price"])
+
+        baseline, elapsed, peak = measure(whole_table)
+        print(f"  read_sql_query + LinearRegression {elapsed:6.2f}s  peak {peak / 2**20:8.1f} MiB")
+        assert np.allclose(model.coef_, baseline.coef_, rtol=1e-6), (model.coef_, baseline.coef_)
+        assert np.isclose(model.intercept_, baseline.intercept_, rtol=1e-6)
+        print("  coefficients match")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+``lineage_query.LineageIndex`` on a synthetic warehouse of ``--datasets``
+tables: build time and index size, then "is A upstream of B?" and the first
+page of "everything downstream of A" (with its total) against walking the same
+graph breadth-first in memory, and against ``LineageStore.downstream`` (SQL, one
+query per level) on the same events.
+
+The warehouse is made of domains of ``--domain-size`` tables in ``--layers``
+layers (raw, staging, ..., marts). Each table is built by a job reading one to
+three tables of the layer below in its domain, with probability ``--cross``
+one of another domain's, and with probability ``--shared`` one of ten
+conformed dimensions everything shares.
+
+    uv run python benchmarks/bench_lineage_query.py --datasets 100000 --queries 200
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+from collections import deque
+
+from openlineage_playground.lineage_query import LineageIndex
+from openlineage_playground.lineage_store import LineageStore
+
+NAMESPACE = "warehouse"
+
+
+def make_events(n_datasets: int, domain_size: int, layers: int, cross: float, shared: float, seed: int = 0) -> list[dict]:
+    rng = random.Random(seed)
+    per_layer = domain_size // layers
+
+    def table(domain: int, layer: int, i: int) -> str:
+        return f"table_{domain}_{layer}_{i}"
+
+    events = []
+    for domain in range(n_datasets // domain_size):
+        # layer 0 is raw tables nothing writes
+        for layer in range(1, layers):
+            for i in range(per_layer):
+                inputs = {table(domain, layer - 1, rng.randrange(per_layer)) for _ in range(rng.randint(1, 3))}
+                if domain and rng.random() < cross:
+                    inputs.add(table(rng.randrange(domain), layer - 1, rng.randrange(per_layer)))
+                if rng.random() < shared:
+                    inputs.add(table(0, 0, rng.randrange(10)))
+                output = table(domain, layer, i)
+                events.append(
+                    {
+                        "eventType": "COMPLETE",
+                        "eventTime": "2025-01-01T00:00:00Z",
+                        "run": {"runId": f"run-{output}"},
+                        "job": {"namespace": NAMESPACE, "name": f"build_{output}"},
+                        "inputs": [{"namespace": NAMESPACE, "name": name} for name in sorted(inputs)],
+                        "outputs": [{"namespace": NAMESPACE, "name": output}],
+                    }
+                )
+    return events
+
+
+def bfs(adjacency: dict[str, list[str]], start: str) -> set[str]:
+    seen = {start}
+    frontier = deque([start])
+    while frontier:
+        for nxt in adjacency.get(frontier.popleft(), ()):
+            if nxt not in seen:
+                seen.add(nxt)
+                frontier.append(nxt)
+    seen.discard(start)
+    return seen
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--datasets", type=int, default=100_000)
+    parser.add_argument("--domain-size", type=int, default=200)
+    parser.add_argument("--layers", type=int, default=5)
+    parser.add_argument("--cross", type=float, default=0.05)
+    parser.add_argument("--shared", type=float, default=0.1)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--store-queries", type=int, default=10, help="LineageStore.downstream walks are slow")
+    args = parser.parse_args()
+
+    events = make_events(args.datasets, args.domain_size, args.layers, args.cross, args.shared)
+    start = time.perf_counter()
+    index = LineageIndex.from_events(events)
+    build = time.perf_counter() - start
+    # measured on a second build: tracing slows building down many times over
+    tracemalloc.start()
+    traced = LineageIndex.from_events(events)
+    size = tracemalloc.get_traced_memory()[0]
+    del traced
+    tracemalloc.stop()
+    print(f"index over {index.stats()}")
+    print(f"  built in {build:.2f}s, {size / 2**20:.0f} MiB")
+
+    # dataset -> datasets derived from it, for the breadth-first baseline
+    adjacency: dict[str, list[str]] = {}
+    for event in events:
+        for d in event["inputs"]:
+            adjacency.setdefault(d["name"], []).append(event["outputs"][0]["name"])
+
+    # impact analysis starts from raw and staging tables; half the targets are really downstream of them
+    rng = random.Random(1)
+    tables = sorted({d["name"] for event in events for d in event["inputs"] + event["outputs"]})
+    sources = [t for t in tables if t.split("_")[2] in ("0", "1")]
+    pairs = []
+    for _ in range(args.queries):
+        a = rng.choice(sources)
+        derived = sorted(bfs(adjacency, a))
+        pairs.append((a, rng.choice(derived) if derived and rng.random() < 0.5 else rng.choice(tables)))
+
+    start = time.perf_counter()
+    answers = [index.is_upstream((NAMESPACE, a), (NAMESPACE, b)) for a, b in pairs]
+    indexed = (time.perf_counter() - start) / len(pairs)
+    start = time.perf_counter()
+    expected = [b in bfs(adjacency, a) for a, b in pairs]
+    walked = (time.perf_counter() - start) / len(pairs)
+    assert answers == expected
+    print(f"is_upstream:          index {indexed * 1e6:9.1f} us   BFS {walked * 1e6:9.1f} us   ({sum(answers)} true)")
+
+    start = time.perf_counter()
+    pages = [index.downstream(NAMESPACE, a, limit=100) for a, _ in pairs]
+    indexed = (time.perf_counter() - start) / len(pairs)
+    start = time.perf_counter()
+    reached = [bfs(adjacency, a) for a, _ in pairs]
+    walked = (time.perf_counter() - start) / len(pairs)
+    assert [p.total for p in pages] == [len(r) for r in reached]
+    mean = sum(p.total for p in pages) / len(pages)
+    print(f"downstream, page 1:   index {indexed * 1e6:9.1f} us   BFS {walked * 1e6:9.1f} us   ({mean:,.0f} datasets downstream on average)")
+
+    # the conformed dimensions: what almost everything depends on
+    start = time.perf_counter()
+    pages = [index.downstream(NAMESPACE, f"table_0_0_{i}", limit=100) for i in range(10)]
+    indexed = (time.perf_counter() - start) / len(pages)
+    start = time.perf_counter()
+    reached = [bfs(adjacency, f"table_0_0_{i}") for i in range(10)]
+    walked = (time.perf_counter() - start) / len(pages)
+    assert [p.total for p in pages] == [len(r) for r in reached]
+    mean = sum(p.total for p in pages) / len(pages)
+    print(f"  shared dimensions:  index {indexed * 1e6:9.1f} us   BFS {walked * 1e6:9.1f} us   ({mean:,.0f} datasets downstream on average)")
+
+    with LineageStore() as store:
+        for event in events:
+            store.ingest(event)
+        store.flush()
+        sample = pairs[: args.store_queries]
+        start = time.perf_counter()
+        for a, _ in sample:
+            store.downstream(NAMESPACE, a)
+        walked = (time.perf_counter() - start) / len(sample)
+        start = time.perf_counter()
+        index = LineageIndex.from_store(store)
+        from_store = time.perf_counter() - start
+    print(f"LineageStore.downstream {walked * 1e6:9.1f} us per walk; index from the store built in {from_store:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
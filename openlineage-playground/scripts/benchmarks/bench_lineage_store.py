@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Ingest rate of ``LineageStore`` in-process (``StoreTransport``) and over HTTP
+(``BatchedHttpTransport`` -> ``lineage_store.serve``), and the latency of an
+upstream query at the end of a long chain of ``parse_sql.py``-shaped jobs.
+
+    uv run python benchmarks/bench_lineage_store.py --events 20000
+"""
+
+import argparse
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from openlineage.client.event_v2 import RunState
+from openlineage.client.uuid import generate_new_uuid
+
+from openlineage_playground.emitter import BatchedHttpConfig, BatchedHttpTransport
+from openlineage_playground.event_factory import EventFactory
+from openlineage_playground.lineage_store import LineageStore, StoreConfig, StoreTransport, serve
+
+PRODUCER = "https://github.com/openlineage-user"
+NAMESPACE = "parse_sql"
+
+
+def make_payloads(n: int) -> list[str]:
+    """START/COMPLETE pairs of ``script.sql.{i}`` jobs, each reading the previous two tables."""
+    factory = EventFactory(PRODUCER, NAMESPACE)
+    now = datetime.now(timezone.utc).isoformat()
+    payloads = []
+    for i in range(n // 2):
+        job = factory.job(f"script.sql.{i}")
+        inputs = [factory.dataset(f"table_{i}"), factory.dataset(f"table_{max(i - 1, 0)}")]
+        outputs = [factory.dataset(f"table_{i + 1}")]
+        run_id = str(generate_new_uuid())
+        for event_type in (RunState.START, RunState.COMPLETE):
+            payloads.append(factory.run_event(event_type, job, run_id, now, inputs, outputs))
+    return payloads
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=20_000)
+    args = parser.parse_args()
+
+    payloads = make_payloads(args.events)
+    with tempfile.TemporaryDirectory() as tmp:
+        transport = StoreTransport(StoreConfig(path=str(Path(tmp) / "in_process.db")))
+        start = time.perf_counter()
+        for payload in payloads:
+            transport.emit_json(payload)
+        transport.store.flush()
+        elapsed = time.perf_counter() - start
+        print(f"in-process ingest: {len(payloads) / elapsed:10,.0f} events/s  ({elapsed:.2f}s)")
+
+        store = transport.store
+        last = f"table_{len(payloads) // 2}"
+        start = time.perf_counter()
+        upstream = store.upstream(NAMESPACE, last)
+        elapsed = time.perf_counter() - start
+        print(f"upstream({last}): {len(upstream)} datasets in {elapsed * 1000:.1f} ms")
+        start = time.perf_counter()
+        store.upstream(NAMESPACE, last, depth=3)
+        print(f"upstream({last}, depth=3): {(time.perf_counter() - start) * 1000:.2f} ms")
+        transport.close()
+
+        with LineageStore(Path(tmp) / "http.db") as store, serve(store, port=0) as server:
+            http = BatchedHttpTransport(BatchedHttpConfig(url=server.url))
+            start = time.perf_counter()
+            for payload in payloads:
+                http.emit_json(payload)
+            http.close()
+            elapsed = time.perf_counter() - start
+            print(f"HTTP ingest:       {len(payloads) / elapsed:10,.0f} events/s  ({elapsed:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+What ``model_cache`` costs and saves: training every run against a cache miss
+and a cache hit. For the chunked ``NormalEquations`` fit that is
+``housing_pipeline.train_model_cached`` (probe, then train and hash in one pass
+on a miss, or hash to confirm on a hit). For ``housing_flow.py``'s
+``read_sql_query`` + ``LinearRegression``, which can't share a pass with the
+hash, it is probe + hash + train against probe + hash (skipped without
+pandas/scikit-learn). Also times the probe and the hash on their own.
+
+    uv run python benchmarks/bench_model_cache.py --rows 1000000
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from openlineage_playground.housing_data import SQLiteSink, generate
+from openlineage_playground.housing_pipeline import (
+    FEATURES_SQL,
+    MODEL_PARAMS,
+    connect,
+    FEATURE_COLUMNS,
+    TARGET_COLUMN,
+    fingerprint_features,
+    prepare_data,
+    train_model,
+    train_model_cached,
+)
+from openlineage_playground.model_cache import ModelCache, probe_table
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        generate(args.rows, [SQLiteSink(tmp / "housing.db")])
+        conn = connect(tmp / "housing.db")
+        prepare_data(conn)
+
+        _, probe = timed(lambda: probe_table(conn, "features", FEATURE_COLUMNS + (TARGET_COLUMN,)))
+        _, fingerprint = timed(lambda: fingerprint_features(conn))
+        print(f"probe {probe:6.2f}s   hash {fingerprint:6.2f}s")
+
+        cache = ModelCache(tmp / "NormalEquations")
+        _, always = timed(lambda: train_model(conn))
+        _, miss = timed(lambda: train_model_cached(conn, cache))
+        entry, hit = timed(lambda: train_model_cached(conn, cache))
+        assert entry.hit and cache.hits == 1 and cache.misses == 1
+        print("NormalEquations")
+        print(f"  train every run {always:6.2f}s   cache miss {miss:6.2f}s   cache hit {hit:6.2f}s")
+
+        try:
+            import pandas as pd
+            from sklearn.linear_model import LinearRegression
+            from sklearn.metrics import mean_squared_error
+        except ImportError:
+            print("pandas/scikit-learn not installed; skipping read_sql_query + LinearRegression")
+            conn.close()
+            return
+
+        def whole_table():
+            df = pd.read_sql_query(FEATURES_SQL, conn)
+            X, y = df.drop(columns="price"), df["price"]
+            model = LinearRegression().fit(X, y)
+            return model, {"mse": mean_squared_error(y, model.predict(X))}
+
+        def cached(cache: ModelCache, params: dict):
+            probe = probe_table(conn, "features", FEATURE_COLUMNS + (TARGET_COLUMN,))
+            cache.candidate(probe, params)
+            return cache.get_or_train(fingerprint_features(conn), params, whole_table)
+
+        cache = ModelCache(tmp / "LinearRegression")
+        params = {**MODEL_PARAMS, "model": "LinearRegression"}
+        _, always = timed(whole_table)
+        _, miss = timed(lambda: cached(cache, params))
+        entry, hit = timed(lambda: cached(cache, params))
+        assert entry.hit and cache.hits == 1 and cache.misses == 1
+        print("read_sql_query + LinearRegression")
+        print(f"  train every run {always:6.2f}s   cache miss {miss:6.2f}s   cache hit {hit:6.2f}s")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Wall time of ``sql_scheduler`` against running a script one statement after
+another, on SQLite databases from ``housing_data``:
+
+- a wide script: ``--branches`` independent chains of ``--depth`` aggregations
+  over ``house_sales``, joined at the end, with ``--latency-ms`` of simulated
+  round trip added to every statement, as on a remote warehouse that runs
+  statements side by side (SQLite itself lets one writer in at a time);
+- ``housing_pipeline``'s ``prepare_data`` with no added latency, where only the
+  index build and ``cleaned_sales`` are independent.
+
+    uv run python benchmarks/bench_sql_scheduler.py --rows 200000 --branches 8 --depth 3 --latency-ms 200
+"""
+
+import argparse
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from openlineage_playground.housing_data import SQLiteSink, generate
+from openlineage_playground.housing_pipeline import connect, prepare_data, prepare_data_parallel
+from openlineage_playground.sql_scheduler import SQLScheduler
+
+
+class RemoteConnection:
+    """A sqlite3 connection that waits ``latency`` seconds before every statement, like a network round trip."""
+
+    def __init__(self, conn: sqlite3.Connection, latency: float) -> None:
+        self.conn = conn
+        self.latency = latency
+
+    def execute(self, sql: str):
+        time.sleep(self.latency)
+        return self.conn.execute(sql)
+
+    def commit(self) -> None:
+        self.conn.commit()
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+def wide_script(branches: int, depth: int) -> str:
+    statements = []
+    for b in range(branches):
+        statements.append(
+            f"DROP TABLE IF EXISTS branch_{b}_0;\n"
+            f"CREATE TABLE branch_{b}_0 AS SELECT bedrooms, count(*) AS n, avg(price) AS price "
+            f"FROM house_sales WHERE house_id % {branches} = {b} GROUP BY bedrooms;"
+        )
+        for d in range(1, depth):
+            statements.append(
+                f"DROP TABLE IF EXISTS branch_{b}_{d};\n"
+                f"CREATE TABLE branch_{b}_{d} AS SELECT bedrooms, n, price * 1.01 AS price FROM branch_{b}_{d - 1};"
+            )
+    union = " UNION ALL ".join(f"SELECT * FROM branch_{b}_{depth - 1}" for b in range(branches))
+    statements.append(f"DROP TABLE IF EXISTS summary;\nCREATE TABLE summary AS {union};")
+    return "\n".join(statements)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--branches", type=int, default=8)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="simulated round trip per statement")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Path(tmp) / "housing.db"
+        generate(args.rows, [SQLiteSink(db)])
+        conn = connect(db)
+
+        script = wide_script(args.branches, args.depth)
+        latency = args.latency_ms / 1000
+
+        def remote():
+            return RemoteConnection(connect(db, timeout=3600), latency)
+
+        start = time.perf_counter()
+        plan = SQLScheduler(remote).plan(script)
+        waves = max(s.level for s in plan) + 1
+        print(f"{len(plan)} statements in {waves} waves, planned in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+        start = time.perf_counter()
+        serial = remote()
+        for s in plan:
+            serial.execute(s.sql)
+            serial.commit()
+        serial.close()
+        print(f"  one after another     {time.perf_counter() - start:6.2f}s")
+        for workers in args.workers:
+            start = time.perf_counter()
+            SQLScheduler(remote, workers).run(script)
+            print(f"  {workers:2} workers            {time.perf_counter() - start:6.2f}s")
+
+        print("prepare_data")
+        start = time.perf_counter()
+        prepare_data(conn)
+        print(f"  executescript         {time.perf_counter() - start:6.2f}s")
+        conn.close()
+        for workers in args.workers:
+            start = time.perf_counter()
+            prepare_data_parallel(db, workers)
+            print(f"  {workers:2} workers            {time.perf_counter() - start:6.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+Per-event cost of emitting lineage, stage by stage, with machine-readable results.
+
+Two synthetic workloads are measured:
+
+- ``housing``: START/COMPLETE pairs shaped like the SQL sub-jobs in
+  log_housing_events.py (SQL + source location job facets, parent and nominal
+  time run facets, datasets with schema facets from schemas.json)
+- ``parse_sql``: COMPLETE events shaped like parse_sql.py's ``script.sql.{i}``
+  sub-jobs (two inputs, one output with a column lineage facet)
+
+and for each, the stages an event goes through:
+
+- ``construct``: building the ``RunEvent`` and its facets
+- ``to_dict`` / ``to_json``: ``Serde.to_dict`` and ``Serde.to_json``
+- ``event_factory``: building the same JSON with ``EventFactory`` instead
+- ``gzip``: ``HttpTransport``'s request preparation with ``HttpCompression.GZIP``
+- ``http_sync``: ``HttpTransport.emit`` round-trip against a local ``MockMarquezServer``
+- ``http_batched``: ``BatchedHttpTransport`` throughput against the same server
+
+Latencies are per event (mean/p50/p95/p99 in microseconds), from the best of
+``--repeat`` passes so a noisy pass doesn't count as a regression. ``--output`` writes
+them as JSON together with the git commit and library versions; ``--compare``
+checks a run against an earlier file and exits non-zero on regressions:
+
+    uv run python benchmarks/run_suite.py --output bench-$(git rev-parse --short HEAD).json
+    uv run python benchmarks/run_suite.py --compare bench-abc1234.json --repeat 5
+"""
+
+import argparse
+import gc
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from importlib.metadata import version
+from pathlib import Path
+
+from openlineage.client.event_v2 import InputDataset, Job, OutputDataset, Run, RunEvent, RunState
+from openlineage.client.facet_v2 import (
+    column_lineage_dataset,
+    nominal_time_run,
+    parent_run,
+    source_code_location_job,
+    sql_job,
+)
+from openlineage.client.serde import Serde
+from openlineage.client.transport.http import HttpCompression, HttpConfig, HttpTransport
+from openlineage.client.uuid import generate_new_uuid
+from requests import Session
+
+from openlineage_playground.emitter import BatchedHttpConfig, BatchedHttpTransport
+from openlineage_playground.event_factory import EventFactory
+from openlineage_playground.mock_marquez import MockMarquezServer
+from openlineage_playground.schema_facets import SchemaFacetCatalog
+
+PRODUCER = "https://github.com/openlineage-user"
+REPO_URL = "https://github.com/your-org/pipelines/housing_regression_flow.py"
+SCHEMAS = Path(__file__).parent.parent / "src" / "openlineage_playground" / "schemas.json"
+CLEANED_SALES_SQL = """
+CREATE OR REPLACE TABLE cleaned_sales AS
+SELECT * FROM house_sales WHERE price BETWEEN 10000 AND 1000000;
+"""
+ENRICHED_SALES_SQL = """
+CREATE OR REPLACE TABLE enriched_sales AS
+SELECT s.*, l.zipcode, l.school_rating
+FROM cleaned_sales s
+JOIN location_info l ON s.house_id = l.house_id;
+"""
+
+
+@dataclass
+class Result:
+    workload: str
+    stage: str
+    events: int
+    mean_us: float
+    p50_us: float
+    # None for throughput-only stages
+    p95_us: float | None
+    p99_us: float | None
+    events_per_sec: float
+    # average payload size where it's meaningful (serialized or compressed bytes)
+    bytes_per_event: float | None = None
+
+
+# --- workloads ---
+# each spec holds what varies per event; build() turns it into a RunEvent, factory() into JSON
+
+
+class HousingWorkload:
+    name = "housing"
+
+    def __init__(self, n: int) -> None:
+        self.schemas = SchemaFacetCatalog.from_manifest(SCHEMAS)
+        self.schemas.add_from_sql(CLEANED_SALES_SQL + ENRICHED_SALES_SQL)
+        self.parent_run_id = str(generate_new_uuid())
+        now = datetime.now(timezone.utc).isoformat()
+        # a START and a COMPLETE per run, as log_housing_events.py emits them
+        self.specs = [
+            (event_type, run_id, now)
+            for run_id in (str(generate_new_uuid()) for _ in range(n // 2))
+            for event_type in (RunState.START, RunState.COMPLETE)
+        ]
+        self._factory = EventFactory(PRODUCER, "house_regression")
+
+    def build(self, spec) -> RunEvent:
+        event_type, run_id, now = spec
+        return RunEvent(
+            eventType=event_type,
+            eventTime=now,
+            run=Run(
+                runId=run_id,
+                facets={
+                    "nominalTime": nominal_time_run.NominalTimeRunFacet(now),
+                    "parent": parent_run.ParentRunFacet(
+                        run={"runId": self.parent_run_id},
+                        job={"namespace": "house_regression", "name": "housing_regression_flow.prepare_data"},
+                    ),
+                },
+            ),
+            job=Job(
+                namespace="house_regression",
+                name="execute_sql.enriched_sales",
+                facets={
+                    "sql": sql_job.SQLJobFacet(query=ENRICHED_SALES_SQL),
+                    "sourceCodeLocation": source_code_location_job.SourceCodeLocationJobFacet(type="git", url=REPO_URL),
+                },
+            ),
+            producer=PRODUCER,
+            inputs=[
+                InputDataset("house_regression", "cleaned_sales", facets=self.schemas.facets("cleaned_sales")),
+                InputDataset("house_regression", "location_info", facets=self.schemas.facets("location_info")),
+            ],
+            outputs=[
+                OutputDataset("house_regression", "enriched_sales", facets=self.schemas.facets("enriched_sales"))
+            ],
+        )
+
+    def factory(self, spec) -> str:
+        event_type, run_id, now = spec
+        f = self._factory
+        job = f.job(
+            "execute_sql.enriched_sales",
+            facets={
+                "sql": sql_job.SQLJobFacet(query=ENRICHED_SALES_SQL),
+                "sourceCodeLocation": source_code_location_job.SourceCodeLocationJobFacet(type="git", url=REPO_URL),
+            },
+        )
+        return f.run_event(
+            event_type,
+            job,
+            run_id,
+            now,
+            inputs=[
+                f.dataset("cleaned_sales", self.schemas.facets("cleaned_sales")),
+                f.dataset("location_info", self.schemas.facets("location_info")),
+            ],
+            outputs=[f.dataset("enriched_sales", self.schemas.facets("enriched_sales"))],
+            parent=f.parent(self.parent_run_id, "housing_regression_flow.prepare_data"),
+            nominal_time=now,
+        )
+
+
+class ParseSqlWorkload:
+    name = "parse_sql"
+
+    def __init__(self, n: int) -> None:
+        now = datetime.now(timezone.utc).isoformat()
+        self.specs = [(i, str(generate_new_uuid()), now) for i in range(n)]
+        self._factory = EventFactory(PRODUCER, "parse_sql")
+
+    @staticmethod
+    def _column_lineage(i: int) -> column_lineage_dataset.ColumnLineageDatasetFacet:
+        return column_lineage_dataset.ColumnLineageDatasetFacet(
+            fields={
+                f"col_{c}": column_lineage_dataset.Fields(
+                    inputFields=[column_lineage_dataset.InputField("parse_sql", f"table_{i + c % 2}", f"col_{c}")]
+                )
+                for c in range(8)
+            }
+        )
+
+    def build(self, spec) -> RunEvent:
+        i, run_id, now = spec
+        return RunEvent(
+            eventType=RunState.COMPLETE,
+            eventTime=now,
+            run=Run(runId=run_id),
+            job=Job(namespace="parse_sql", name=f"script.sql.{i}"),
+            producer=PRODUCER,
+            inputs=[InputDataset("parse_sql", f"table_{i}"), InputDataset("parse_sql", f"table_{i + 1}")],
+            outputs=[
+                OutputDataset("parse_sql", f"table_{i + 2}", facets={"columnLineage": self._column_lineage(i)})
+            ],
+        )
+
+    def factory(self, spec) -> str:
+        i, run_id, now = spec
+        f = self._factory
+        return f.run_event(
+            RunState.COMPLETE,
+            f.job(f"script.sql.{i}"),
+            run_id,
+            now,
+            inputs=[f.dataset(f"table_{i}"), f.dataset(f"table_{i + 1}")],
+            outputs=[f.dataset(f"table_{i + 2}", {"columnLineage": self._column_lineage(i)})],
+        )
+
+
+# --- measuring ---
+
+
+def time_each(fn, items, repeat: int) -> list[int]:
+    """Nanoseconds ``fn`` took on each item, from the pass over ``items`` with the lowest median."""
+    best = None
+    for _ in range(repeat):
+        samples = []
+        gc.collect()
+        for item in items:
+            start = time.perf_counter_ns()
+            fn(item)
+            samples.append(time.perf_counter_ns() - start)
+        if best is None or statistics.median(samples) < statistics.median(best):
+            best = samples
+    return best
+
+
+def summarize(workload: str, stage: str, samples: list[int], bytes_per_event: float | None = None) -> Result:
+    q = statistics.quantiles(samples, n=100, method="inclusive")
+    mean = statistics.fmean(samples)
+    return Result(
+        workload=workload,
+        stage=stage,
+        events=len(samples),
+        mean_us=mean / 1000,
+        p50_us=q[49] / 1000,
+        p95_us=q[94] / 1000,
+        p99_us=q[98] / 1000,
+        events_per_sec=1e9 / mean,
+        bytes_per_event=bytes_per_event,
+    )
+
+
+def run_workload(workload, server: MockMarquezServer, repeat: int) -> list[Result]:
+    results = []
+    specs = workload.specs
+
+    results.append(summarize(workload.name, "construct", time_each(workload.build, specs, repeat)))
+    events = [workload.build(spec) for spec in specs]
+    results.append(summarize(workload.name, "to_dict", time_each(Serde.to_dict, events, repeat)))
+    payloads = [Serde.to_json(ev) for ev in events]
+    json_bytes = statistics.fmean(len(p.encode("utf-8")) for p in payloads)
+    results.append(summarize(workload.name, "to_json", time_each(Serde.to_json, events, repeat), json_bytes))
+    results.append(
+        summarize(workload.name, "event_factory", time_each(workload.factory, specs, repeat), json_bytes)
+    )
+
+    gzip_transport = HttpTransport(HttpConfig(url=server.url, compression=HttpCompression.GZIP))
+    gzip_bytes = statistics.fmean(len(gzip_transport._prepare_request(p)[0]) for p in payloads)
+    results.append(
+        summarize(workload.name, "gzip", time_each(gzip_transport._prepare_request, payloads, repeat), gzip_bytes)
+    )
+
+    # a session, as the scripts would pass in, so every request doesn't pay for a new connection
+    with Session() as session:
+        sync = HttpTransport(HttpConfig(url=server.url, compression=HttpCompression.GZIP, session=session))
+        results.append(summarize(workload.name, "http_sync", time_each(sync.emit, events, repeat), gzip_bytes))
+
+    # events are sent in the background, so only throughput is meaningful here
+    per_event = []
+    for _ in range(repeat):
+        batched = BatchedHttpTransport(BatchedHttpConfig(url=server.url, compression=HttpCompression.GZIP))
+        start = time.perf_counter_ns()
+        for payload in payloads:
+            batched.emit_json(payload)
+        batched.close()
+        per_event.append((time.perf_counter_ns() - start) / len(payloads) / 1000)
+    best = min(per_event)
+    results.append(Result(workload.name, "http_batched", len(payloads), best, best, None, None, 1e6 / best, gzip_bytes))
+    return results
+
+
+def metadata() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True, cwd=Path(__file__).parent
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "openlineage-python": version("openlineage-python"),
+    }
+
+
+def compare(results: list[Result], baseline_path: Path, threshold: float) -> bool:
+    """Print the change against ``baseline_path``; False if any stage got slower by more than ``threshold``."""
+    baseline = {(r["workload"], r["stage"]): r for r in json.loads(baseline_path.read_text())["results"]}
+    ok = True
+    print(f"\ncompared with {baseline_path} (p50, regression threshold {threshold:.0%}):")
+    for r in results:
+        old = baseline.get((r.workload, r.stage))
+        if old is None:
+            continue
+        change = r.p50_us / old["p50_us"] - 1
+        regressed = change > threshold
+        ok &= not regressed
+        print(
+            f"  {r.workload:<10} {r.stage:<14} {old['p50_us']:10.1f} -> {r.p50_us:10.1f} us  {change:+7.1%}"
+            f"{'  REGRESSION' if regressed else ''}"
+        )
+    return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=2000, help="events per workload")
+    parser.add_argument("--repeat", type=int, default=3, help="passes per stage; the one with the lowest median counts")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="simulated per-request backend latency")
+    parser.add_argument("--workloads", nargs="+", choices=["housing", "parse_sql"], default=["housing", "parse_sql"])
+    parser.add_argument("--output", type=Path, help="write results as JSON here")
+    parser.add_argument("--compare", type=Path, help="results JSON from an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="relative p50 slowdown that counts as a regression")
+    args = parser.parse_args()
+
+    workloads = {"housing": HousingWorkload, "parse_sql": ParseSqlWorkload}
+    results = []
+    with MockMarquezServer(latency=args.latency_ms / 1000) as server:
+        for name in args.workloads:
+            results += run_workload(workloads[name](args.events), server, args.repeat)
+
+    print(f"{'workload':<10} {'stage':<14} {'mean':>9} {'p50':>9} {'p95':>9} {'p99':>9}  {'events/s':>10}  {'bytes':>7}")
+    for r in results:
+        size = f"{r.bytes_per_event:7.0f}" if r.bytes_per_event else ""
+        tail = "".join(f" {q:9.1f}" if q is not None else f" {'-':>9}" for q in (r.p95_us, r.p99_us))
+        print(
+            f"{r.workload:<10} {r.stage:<14} {r.mean_us:9.1f} {r.p50_us:9.1f}{tail}  {r.events_per_sec:10,.0f}  {size}"
+        )
+
+    if args.output:
+        args.output.write_text(json.dumps({"meta": metadata(), "results": [asdict(r) for r in results]}, indent=2))
+        print(f"\nwrote {args.output}")
+    if args.compare and not compare(results, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Replay historical lineage events from newline-delimited JSON into Marquez.
+
+Takes files with one OpenLineage event per line, e.g. what ``FileTransport``
+writes (``append=True`` gives one growing file, ``append=False`` one file per
+event), optionally gzipped, or directories of them. Files are streamed line by
+line, so inputs with millions of events are fine, and sent with bounded
+concurrency and an optional rate limit through ``ReplaySender``.
+
+Progress is checkpointed as (file, byte offset) after events have been
+delivered; rerunning the same command after a crash resumes from there:
+
+    uv run python -m openlineage_playground.backfill ol.json events/ \\
+        --url http://localhost:9000 --concurrency 8 --rate 2000
+"""
+
+import gzip
+import json
+import logging
+import os
+from collections.abc import Iterator
+from pathlib import Path
+
+from openlineage.client.transport.http import HttpConfig
+
+from openlineage_playground.replay import ReplaySender, ReplayStats
+
+log = logging.getLogger(__name__)
+
+DEFAULT_CHECKPOINT = ".backfill-checkpoint.json"
+# what to pick up when a directory is passed
+INPUT_SUFFIXES = (".json", ".ndjson", ".jsonl", ".gz")
+
+
+def expand_inputs(paths: list[str | Path]) -> list[Path]:
+    """Files in the order they're replayed; directories are expanded to their event files, sorted by name."""
+    files = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files.extend(sorted(p for p in path.iterdir() if p.is_file() and p.name.endswith(INPUT_SUFFIXES)))
+        else:
+            files.append(path)
+    return files
+
+
+def _open(path: Path):
+    return gzip.open(path, "rb") if path.suffix == ".gz" else open(path, "rb")
+
+
+class Backfill:
+    def __init__(
+        self,
+        paths: list[str | Path],
+        http_config: HttpConfig,
+        checkpoint_path: str | Path = DEFAULT_CHECKPOINT,
+        concurrency: int = 4,
+        rate_limit: float | None = None,
+    ) -> None:
+        """
+        :param paths: NDJSON files (optionally ``.gz``) or directories of them
+        :param checkpoint_path: where progress is recorded; delete it to start over
+        :param concurrency: requests in flight at once; events of one run are still sent in order
+        :param rate_limit: maximum events per second
+        """
+        self.files = expand_inputs(paths)
+        self.checkpoint_path = Path(checkpoint_path)
+        self.sender = ReplaySender(http_config, concurrency=concurrency, rate_limit=rate_limit)
+
+    def read_checkpoint(self) -> tuple[int, int]:
+        """Index into ``self.files`` and byte offset to resume from."""
+        try:
+            checkpoint = json.loads(self.checkpoint_path.read_text())
+        except FileNotFoundError:
+            return 0, 0
+        names = [str(f) for f in self.files]
+        if checkpoint["file"] not in names:
+            raise RuntimeError(
+                f"Checkpoint {self.checkpoint_path} is for {checkpoint['file']}, which isn't among the inputs; "
+                "delete it to start over"
+            )
+        return names.index(checkpoint["file"]), checkpoint["offset"]
+
+    def write_checkpoint(self, position: tuple[int, int]) -> None:
+        # write-then-rename, so a crash never leaves a half-written checkpoint behind
+        tmp = self.checkpoint_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"file": str(self.files[position[0]]), "offset": position[1]}))
+        os.replace(tmp, self.checkpoint_path)
+        log.info("Delivered everything up to %s:%d", self.files[position[0]], position[1])
+
+    def run(self) -> ReplayStats:
+        return self.sender.run(self._records(), commit=self.write_checkpoint)
+
+    def _records(self) -> Iterator[tuple[tuple[int, int], str]]:
+        start_file, start_offset = self.read_checkpoint()
+        for i in range(start_file, len(self.files)):
+            offset = start_offset if i == start_file else 0
+            with _open(self.files[i]) as f:
+                # seeking a gzip file decompresses up to the offset, but that's still far cheaper than resending
+                f.seek(offset)
+                for line in f:
+                    offset += len(line)
+                    if line.strip():
+                        yield (i, offset), line.decode("utf-8")
+
+
+def main() -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Replay newline-delimited OpenLineage events into Marquez")
+    parser.add_argument("inputs", nargs="+", help="NDJSON files (optionally .gz) or directories of them")
+    parser.add_argument("--url", default="http://localhost:9000")
+    parser.add_argument("--endpoint", default="api/v1/lineage")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--rate", type=float, default=None, help="maximum events per second")
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT)
+    parser.add_argument("--restart", action="store_true", help="ignore the checkpoint and replay from the start")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if args.restart:
+        Path(args.checkpoint).unlink(missing_ok=True)
+    backfill = Backfill(
+        args.inputs,
+        HttpConfig(url=args.url, endpoint=args.endpoint),
+        checkpoint_path=args.checkpoint,
+        concurrency=args.concurrency,
+        rate_limit=args.rate,
+    )
+    stats = backfill.run()
+    print(
+        f"sent {stats.sent}, rejected {stats.rejected}, failed {stats.failed} "
+        f"in {stats.elapsed:.2f}s ({stats.events_per_sec:,.0f} events/s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
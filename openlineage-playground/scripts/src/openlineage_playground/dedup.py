@@ -0,0 +1,211 @@
+"""
+Drop lineage events that were already delivered, before they're sent again.
+
+Reruns, retries and replays re-emit events Marquez already has, and every one
+of them costs a round trip. ``EventDeduplicator`` remembers what was sent, keyed
+on ``(runId, eventType, eventTime)``:
+
+- the most recent ``window`` keys exactly, in insertion order;
+- every key it has seen in a Bloom filter of ``capacity`` keys, so memory stays
+  bounded (about 3.5 MB per million keys at the default error rate) however
+  long the process runs. Once it's full, a fresh filter takes over and the old
+  one is kept until the new one fills up too, so keys age out instead of
+  piling up.
+
+A key in the window is a duplicate for certain. A key only the filter has seen
+is a duplicate except with probability ``error_rate``, and is suppressed too:
+that's the price of remembering far more events than can be kept exactly.
+
+With ``strip_facets``, facets a run's earlier event already carried with
+identical contents are also dropped from its later events, e.g. the job's SQL
+and the input datasets' schemas on a COMPLETE that follows a START. Consumers
+merge a run's facets across its events. Output dataset facets are left alone:
+Marquez versions output datasets from the facets on the event that completes
+the run.
+
+Events without a run (DatasetEvents and JobEvents) have no key, and are
+always sent as they are.
+
+Keys and facets are only remembered once the event was actually sent, so a
+failed send is retried rather than suppressed:
+
+    dedup = EventDeduplicator()
+    prepared = dedup.prepare(payload)   # None: already sent
+    if prepared is not None:
+        payload, token = prepared
+        sent = send(payload)
+        if token is None:
+            pass                        # no run: nothing to remember
+        elif sent:
+            dedup.confirm(token)
+        else:
+            dedup.abandon(token)
+"""
+
+import hashlib
+import json
+import math
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+
+class BloomFilter:
+    """A set of byte strings that may answer "yes" for keys it never saw, with probability ``error_rate``."""
+
+    def __init__(self, capacity: int, error_rate: float = 1e-6) -> None:
+        self.capacity = capacity
+        self.bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.bits / capacity * math.log(2)))
+        self._array = bytearray((self.bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: bytes) -> list[int]:
+        # two 64-bit hashes combined into as many as needed (Kirsch-Mitzenmacher)
+        digest = hashlib.blake2b(key, digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.bits for i in range(self.hashes)]
+
+    def __contains__(self, key: bytes) -> bool:
+        array = self._array
+        return all(array[p >> 3] & (1 << (p & 7)) for p in self._positions(key))
+
+    def add(self, key: bytes) -> None:
+        array = self._array
+        for p in self._positions(key):
+            array[p >> 3] |= 1 << (p & 7)
+        self.count += 1
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._array)
+
+
+@dataclass(slots=True)
+class Pending:
+    """What ``confirm`` records once the event it was prepared for has been sent."""
+
+    key: bytes
+    run_id: str
+    # (section, dataset namespace, dataset name, facet name) -> digest of the facet
+    facets: dict[tuple, bytes] = field(default_factory=dict)
+
+
+def _digest(facet) -> bytes:
+    # repr rather than a canonical json.dumps: several times faster, and a facet serialized with its keys
+    # in another order only misses being stripped
+    return hashlib.blake2b(repr(facet).encode(), digest_size=16).digest()
+
+
+class EventDeduplicator:
+    def __init__(
+        self,
+        window: int = 10_000,
+        capacity: int = 1_000_000,
+        error_rate: float = 1e-6,
+        strip_facets: bool = False,
+    ) -> None:
+        """
+        :param window: event keys (and runs, for ``strip_facets``) remembered exactly
+        :param capacity: event keys per Bloom filter generation
+        :param error_rate: chance that an event nobody sent counts as a duplicate while the filter isn't full
+        :param strip_facets: drop facets a run's earlier events already carried, see the module docstring
+        """
+        self.window = window
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.strip_facets = strip_facets
+        self._recent: OrderedDict[bytes, None] = OrderedDict()
+        self._filter = BloomFilter(capacity, error_rate)
+        self._previous: BloomFilter | None = None
+        # keys prepared but not yet confirmed or abandoned, so one event queued twice is only sent once
+        self._in_flight: set[bytes] = set()
+        # run id -> facets its confirmed events carried
+        self._run_facets: OrderedDict[str, dict[tuple, bytes]] = OrderedDict()
+
+        self.duplicates = 0
+        self.facets_stripped = 0
+
+    @staticmethod
+    def key(event: dict) -> bytes | None:
+        """``(runId, eventType, eventTime)``, or None for an event without a run."""
+        run_id = (event.get("run") or {}).get("runId")
+        if run_id is None:
+            return None
+        return "\0".join((run_id, event.get("eventType") or "", event.get("eventTime") or "")).encode()
+
+    def seen(self, key: bytes) -> bool:
+        if key in self._recent or key in self._in_flight:
+            return True
+        return key in self._filter or (self._previous is not None and key in self._previous)
+
+    def prepare(self, payload: str) -> tuple[str, Pending | None] | None:
+        """
+        ``payload`` to send (with repeated facets stripped) and a token for ``confirm``, or None for a duplicate.
+        The token is None for an event without a run, which is never a duplicate.
+        """
+        event = json.loads(payload)
+        key = self.key(event)
+        if key is None:
+            return payload, None
+        if self.seen(key):
+            self.duplicates += 1
+            return None
+        self._in_flight.add(key)
+        pending = Pending(key, event["run"]["runId"])
+        if self.strip_facets and self._strip(event, pending):
+            payload = json.dumps(event, separators=(",", ":"))
+        return payload, pending
+
+    def confirm(self, pending: Pending) -> None:
+        """Record an event as sent."""
+        self._in_flight.discard(pending.key)
+        self._recent[pending.key] = None
+        if len(self._recent) > self.window:
+            self._recent.popitem(last=False)
+        if self._filter.count >= self.capacity:
+            self._previous, self._filter = self._filter, BloomFilter(self.capacity, self.error_rate)
+        self._filter.add(pending.key)
+
+        if pending.facets:
+            sent = self._run_facets.get(pending.run_id)
+            if sent is None:
+                sent = self._run_facets[pending.run_id] = {}
+                if len(self._run_facets) > self.window:
+                    self._run_facets.popitem(last=False)
+            sent.update(pending.facets)
+
+    def abandon(self, pending: Pending) -> None:
+        """Forget an event that couldn't be sent, so that sending it again isn't suppressed."""
+        self._in_flight.discard(pending.key)
+
+    def _strip(self, event: dict, pending: Pending) -> bool:
+        sent = self._run_facets.get(pending.run_id, {})
+        stripped = False
+        job = event.get("job") or {}
+        sections = [("job", job.get("namespace"), job.get("name"), job.get("facets"))]
+        for dataset in event.get("inputs") or ():
+            sections.append(("inputs", dataset.get("namespace"), dataset.get("name"), dataset.get("facets")))
+            sections.append(("inputFacets", dataset.get("namespace"), dataset.get("name"), dataset.get("inputFacets")))
+        for section, namespace, name, facets in sections:
+            if not facets:
+                continue
+            for facet_name in list(facets):
+                ident = (section, namespace, name, facet_name)
+                digest = _digest(facets[facet_name])
+                if sent.get(ident) == digest:
+                    del facets[facet_name]
+                    self.facets_stripped += 1
+                    stripped = True
+                else:
+                    pending.facets[ident] = digest
+        return stripped
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "duplicates": self.duplicates,
+            "facets_stripped": self.facets_stripped,
+            "window": len(self._recent),
+            "filter_keys": self._filter.count,
+            "filter_bytes": self._filter.nbytes + (self._previous.nbytes if self._previous else 0),
+        }
@@ -0,0 +1,154 @@
+"""
+Build RunEvent JSON from pre-serialized Job/Dataset templates.
+
+Emitting a START/COMPLETE pair the usual way rebuilds (and re-validates) the same
+``Job``, ``SourceCodeLocationJobFacet``, ``ParentRunFacet`` and dataset schema
+facets for every run, then walks all of them again in ``Serde.to_json``. But
+within a pipeline, only a run's id, the event time and the event type actually
+change from one event to the next.
+
+``EventFactory`` serializes each job, dataset and parent facet once, interns the
+result, and splices the per-event values into those fragments:
+
+    factory = EventFactory(PRODUCER, NAMESPACE)
+    job = factory.job("housing_regression_flow.train_model", facets={...})
+    features = factory.dataset("features", facets={"schema": ...})
+
+    payload = factory.run_event(RunState.START, job, run_id, event_time, inputs=[features])
+    transport.emit_json(payload)
+
+The JSON is equivalent to ``Serde.to_json`` of the matching ``RunEvent``. Unlike
+the ``RunEvent`` constructor, ``run_event`` doesn't validate ``run_id`` or
+``event_time``; pass it what ``generate_new_uuid()`` / ``datetime.isoformat()``
+produce.
+"""
+
+import json
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from openlineage.client.event_v2 import InputDataset, Job, OutputDataset, RunEvent, RunState
+from openlineage.client.facet_v2 import nominal_time_run, parent_run
+from openlineage.client.serde import Serde
+
+# stands in for a value that's filled in per event
+_HOLE = "\x00hole\x00"
+
+
+class _Template:
+    """Serialized facet with one string field left open."""
+
+    def __init__(self, facet, field: str) -> None:
+        d = Serde.to_dict(facet)
+        d[field] = _HOLE
+        self._prefix, self._suffix = json.dumps(d, sort_keys=True).split(json.dumps(_HOLE))
+
+    def fill(self, value: str) -> str:
+        return self._prefix + json.dumps(value) + self._suffix
+
+
+@dataclass(frozen=True, slots=True)
+class JobTemplate:
+    namespace: str
+    name: str
+    facets: dict
+    json: str
+
+
+@dataclass(frozen=True, slots=True)
+class DatasetTemplate:
+    namespace: str
+    name: str
+    facets: dict
+    input_json: str
+    output_json: str
+
+
+@dataclass(frozen=True, slots=True)
+class ParentTemplate:
+    run_id: str
+    namespace: str
+    name: str
+    json: str
+
+
+class EventFactory:
+    def __init__(self, producer: str, namespace: str) -> None:
+        self.producer = producer
+        self.namespace = namespace
+        self._jobs: dict[tuple[str, str], JobTemplate] = {}
+        self._datasets: dict[tuple[str, str], DatasetTemplate] = {}
+        self._parents: dict[tuple[str, str, str], ParentTemplate] = {}
+
+        self._producer_json = json.dumps(producer)
+        self._schema_url_json = json.dumps(RunEvent._get_schema())
+        now = datetime.now(timezone.utc).isoformat()
+        self._nominal_time = _Template(nominal_time_run.NominalTimeRunFacet(nominalStartTime=now), "nominalStartTime")
+
+    def job(self, name: str, facets: dict | None = None, namespace: str | None = None) -> JobTemplate:
+        """The interned template for this job; it's only serialized again if its facets change."""
+        namespace = namespace or self.namespace
+        facets = facets or {}
+        template = self._jobs.get((namespace, name))
+        if template is None or template.facets != facets:
+            job_json = Serde.to_json(Job(namespace=namespace, name=name, facets=facets))
+            template = self._jobs[namespace, name] = JobTemplate(namespace, name, facets, job_json)
+        return template
+
+    def dataset(self, name: str, facets: dict | None = None, namespace: str | None = None) -> DatasetTemplate:
+        """The interned template for this dataset, usable as both an input and an output."""
+        namespace = namespace or self.namespace
+        facets = facets or {}
+        template = self._datasets.get((namespace, name))
+        if template is None or template.facets != facets:
+            template = self._datasets[namespace, name] = DatasetTemplate(
+                namespace,
+                name,
+                facets,
+                input_json=Serde.to_json(InputDataset(namespace, name, facets=facets)),
+                output_json=Serde.to_json(OutputDataset(namespace, name, facets=facets)),
+            )
+        return template
+
+    def parent(self, run_id: str, name: str, namespace: str | None = None) -> ParentTemplate:
+        """A ``parent`` run facet pointing at run ``run_id`` of job ``name``."""
+        namespace = namespace or self.namespace
+        template = self._parents.get((run_id, namespace, name))
+        if template is None:
+            facet = parent_run.ParentRunFacet(run={"runId": run_id}, job={"namespace": namespace, "name": name})
+            template = self._parents[run_id, namespace, name] = ParentTemplate(
+                run_id, namespace, name, Serde.to_json(facet)
+            )
+        return template
+
+    def run_event(
+        self,
+        event_type: RunState,
+        job: JobTemplate,
+        run_id: str,
+        event_time: str,
+        inputs: Sequence[DatasetTemplate] = (),
+        outputs: Sequence[DatasetTemplate] = (),
+        parent: ParentTemplate | None = None,
+        nominal_time: str | None = None,
+    ) -> str:
+        """JSON of a ``RunEvent``, ready for ``BatchedHttpTransport.emit_json``."""
+        run_facets = []
+        if nominal_time:
+            run_facets.append('"nominalTime": ' + self._nominal_time.fill(nominal_time))
+        if parent:
+            run_facets.append('"parent": ' + parent.json)
+
+        return (
+            '{"eventTime": ' + json.dumps(event_time)
+            + ', "eventType": "' + RunState(event_type).value
+            + '", "inputs": [' + ", ".join(d.input_json for d in inputs)
+            + '], "job": ' + job.json
+            + ', "outputs": [' + ", ".join(d.output_json for d in outputs)
+            + '], "producer": ' + self._producer_json
+            + ', "run": {"facets": {' + ", ".join(run_facets)
+            + '}, "runId": "' + run_id
+            + '"}, "schemaURL": ' + self._schema_url_json
+            + "}"
+        )
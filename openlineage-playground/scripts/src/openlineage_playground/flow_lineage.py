@@ -0,0 +1,387 @@
+"""
+Emit OpenLineage events for Metaflow steps automatically.
+
+``log_housing_events.py`` hand-writes the events ``HousingRegressionFlow`` would
+produce. Mixing ``LineageFlowMixin`` into a flow does it for real: every
+``@step`` gets a START and a COMPLETE (or FAIL) event under a parent run for
+the whole flow, and every SQL statement a step runs on one of the flow's
+``sqlite3`` connections becomes an ``execute_sql.<table>`` sub-job with its
+input and output tables and its actual start/end time:
+
+    class HousingRegressionFlow(LineageFlowMixin, FlowSpec):
+        lineage_namespace = "house_regression"
+
+        @step
+        def prepare_data(self):
+            self.conn.executescript(PREPARE_DATA_SQL)   # traced, no changes needed
+            ...
+
+        @lineage_datasets(outputs=["trained_model.pkl"])   # what SQL tracing can't see
+        @step
+        def train_model(self):
+            ...
+
+Statements are captured with ``Connection.set_trace_callback`` on connections
+the flow holds as attributes when the step starts (call ``self.trace_sql(conn)``
+for ones opened inside a step). That replaces any trace callback already set on
+them for the duration of the step.
+
+The step itself only records timestamps and SQL strings and queues them; SQL
+parsing, event building and sending happen on a background thread, so step wall
+time is unaffected. ``benchmarks/bench_flow_lineage.py`` checks the overhead
+stays under a millisecond per step.
+
+Under Metaflow, run ids are derived from Metaflow's run and task ids, so the
+steps' processes agree on the flow's run. Metaflow itself isn't imported here:
+the mixin works on any class whose steps carry an ``is_step`` attribute.
+"""
+
+import atexit
+import functools
+import logging
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+from openlineage.client.event_v2 import RunState
+from openlineage.client.facet_v2 import source_code_location_job, sql_job
+from openlineage.client.transport.http import HttpCompression
+from openlineage.client.transport.transport import Transport
+from openlineage.client.uuid import generate_new_uuid
+
+from openlineage_playground.emitter import BatchedHttpConfig, BatchedHttpTransport
+from openlineage_playground.event_factory import EventFactory
+from openlineage_playground.schema_facets import SchemaFacetCatalog
+from openlineage_playground.sql_lineage import StatementLineage, parse_statement
+
+log = logging.getLogger(__name__)
+
+PRODUCER = "https://github.com/openlineage-user"
+
+# how long a step's START event is held back while the step runs. Sending it takes the GIL for a
+# few hundred microseconds, which short steps would notice; a long step's START is still prompt.
+START_DELAY = 0.1
+
+
+def lineage_datasets(inputs=(), outputs=()):
+    """Declare datasets a step reads or writes that SQL tracing can't see (files, models, ...)."""
+
+    def decorate(func):
+        func.lineage_inputs = tuple(inputs)
+        func.lineage_outputs = tuple(outputs)
+        return func
+
+    return decorate
+
+
+@dataclass
+class StepRecord:
+    """What the step itself captured; everything else is worked out on the recorder's thread."""
+
+    flow: str
+    step: str
+    # None until the recorder assigns one; generating a UUID costs a syscall the step needn't wait for
+    run_id: str | None
+    flow_run_id: str
+    start_ns: int
+    end_ns: int = 0
+    # (time.time_ns() when the statement started, SQL)
+    statements: list[tuple[int, str]] = field(default_factory=list)
+    failed: bool = False
+    extra_inputs: tuple[str, ...] = ()
+    extra_outputs: tuple[str, ...] = ()
+
+
+def _isoformat(ns: int) -> str:
+    return datetime.fromtimestamp(ns / 1e9, timezone.utc).isoformat()
+
+
+def _default_transport() -> Transport:
+    return BatchedHttpTransport(
+        BatchedHttpConfig(
+            url=os.environ.get("OPENLINEAGE_URL", "http://localhost:9000"), compression=HttpCompression.GZIP
+        )
+    )
+
+
+class StepLineageRecorder:
+    """Builds and emits the events for finished steps on a background thread."""
+
+    def __init__(
+        self,
+        transport: Transport,
+        namespace: str,
+        producer: str = PRODUCER,
+        dialect: str = "sqlite",
+        repo_url: str | None = None,
+        schemas: SchemaFacetCatalog | None = None,
+    ) -> None:
+        """
+        :param dialect: what the traced SQL is parsed as
+        :param repo_url: adds a ``sourceCodeLocation`` facet to every job
+        :param schemas: schema facets for the datasets, by name
+        """
+        self.transport = transport
+        self.namespace = namespace
+        self.dialect = dialect
+        self.repo_url = repo_url
+        self.schemas = schemas
+        self.factory = EventFactory(producer, namespace)
+        # flows rerun the same statements every run and step
+        self._parsed: dict[str, StatementLineage] = {}
+        self._queue: queue.Queue = queue.Queue()
+        # set while no step is running; parsing and building a finished step's events waits for it
+        self._idle = threading.Event()
+        self._idle.set()
+        self._running = 0
+        self._lock = threading.Lock()
+        self._worker = threading.Thread(target=self._run, name="openlineage-flow-lineage", daemon=True)
+        self._worker.start()
+        atexit.register(self.close)
+
+    def step_started(self, record: StepRecord) -> None:
+        with self._lock:
+            self._running += 1
+            self._idle.clear()
+        self._queue.put(("start", record))
+
+    def step_finished(self, record: StepRecord) -> None:
+        self._queue.put(("finish", record))
+        with self._lock:
+            self._running -= 1
+            if not self._running:
+                self._idle.set()
+
+    def flush(self) -> None:
+        """Wait until every queued step has been turned into events and handed to the transport."""
+        self._queue.join()
+        if hasattr(self.transport, "flush"):
+            self.transport.flush()
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._worker.join()
+        self.transport.close()
+        atexit.unregister(self.close)
+
+    def _run(self) -> None:
+        while (item := self._queue.get()) is not None:
+            try:
+                kind, record = item
+                if kind == "start":
+                    self._idle.wait(START_DELAY)
+                    self._emit_start(record)
+                else:
+                    self._emit_finish(record)
+            except Exception:
+                # lineage must never take the flow down
+                log.exception("Failed to emit lineage for step %s", item[1].step)
+            finally:
+                self._queue.task_done()
+        self._queue.task_done()
+
+    def _job(self, name: str, sql: str | None = None):
+        facets = {}
+        if sql:
+            facets["sql"] = sql_job.SQLJobFacet(query=sql)
+        if self.repo_url:
+            facets["sourceCodeLocation"] = source_code_location_job.SourceCodeLocationJobFacet(
+                type="git", url=self.repo_url
+            )
+        return self.factory.job(name, facets=facets)
+
+    def _dataset(self, name: str):
+        return self.factory.dataset(name, self.schemas.facets(name) if self.schemas else None)
+
+    def _emit(self, event_type, job, run_id, ns, inputs=(), outputs=(), parent=None) -> None:
+        # hand the GIL back between events so a step that's running doesn't wait out the switch interval
+        time.sleep(0)
+        self.transport.emit_json(
+            self.factory.run_event(event_type, job, run_id, _isoformat(ns), inputs, outputs, parent=parent)
+        )
+
+    def _emit_start(self, r: StepRecord) -> None:
+        if r.run_id is None:
+            r.run_id = str(generate_new_uuid())
+        if r.step == "start":
+            self._emit(RunState.START, self._job(r.flow), r.flow_run_id, r.start_ns)
+        parent = self.factory.parent(r.flow_run_id, r.flow)
+        self._emit(RunState.START, self._job(f"{r.flow}.{r.step}"), r.run_id, r.start_ns, parent=parent)
+
+    def _emit_finish(self, r: StepRecord) -> None:
+        step_job = f"{r.flow}.{r.step}"
+        step_parent = self.factory.parent(r.run_id, step_job)
+        inputs, outputs, step_sql = {}, {}, []
+        for i, (start_ns, sql) in enumerate(r.statements):
+            # another step has started in this process: its wall time matters more than this step's lineage
+            self._idle.wait()
+            if sql.lstrip()[:4].upper() == "DROP":
+                # the drop half of a drop-and-recreate; the CREATE that follows carries the lineage
+                continue
+            lineage = self._parsed.get(sql)
+            if lineage is None:
+                lineage = self._parsed[sql] = parse_statement(i, sql, self.dialect, None)
+            if not lineage.in_tables and not lineage.out_tables:
+                # BEGIN, COMMIT, PRAGMA, ...
+                continue
+            ins = [self._dataset(t.name) for t in lineage.in_tables]
+            outs = [self._dataset(t.name) for t in lineage.out_tables]
+            inputs.update((d.name, d) for d in ins)
+            outputs.update((d.name, d) for d in outs)
+            step_sql.append(sql.strip().rstrip(";") + ";")
+            if not outs:
+                # plain reads (e.g. pd.read_sql_query) only count towards the step's inputs
+                continue
+            # a statement ends when the next one starts, or with the step
+            end_ns = r.statements[i + 1][0] if i + 1 < len(r.statements) else r.end_ns
+            name = f"execute_sql.{outs[0].name}" if len(outs) == 1 else f"{step_job}.sql.{i}"
+            job = self._job(name, sql.strip())
+            run_id = str(generate_new_uuid())
+            self._emit(RunState.START, job, run_id, start_ns, ins, outs, step_parent)
+            self._emit(RunState.FAIL if r.failed and i == len(r.statements) - 1 else RunState.COMPLETE,
+                       job, run_id, end_ns, ins, outs, step_parent)
+
+        for name in r.extra_inputs:
+            inputs[name] = self._dataset(name)
+        for name in r.extra_outputs:
+            outputs[name] = self._dataset(name)
+        # tables a step both creates and reads back are outputs, not inputs
+        step_inputs = [d for name, d in inputs.items() if name not in outputs]
+        final = RunState.FAIL if r.failed else RunState.COMPLETE
+        self._emit(
+            final,
+            self._job(step_job, "\n\n".join(step_sql)),
+            r.run_id,
+            r.end_ns,
+            step_inputs,
+            list(outputs.values()),
+            self.factory.parent(r.flow_run_id, r.flow),
+        )
+        if r.step == "end" or r.failed:
+            self._emit(final, self._job(r.flow), r.flow_run_id, r.end_ns)
+
+
+def _metaflow_ids() -> tuple[str, str] | None:
+    """Metaflow's (run id, step/task pathspec) when running inside a Metaflow task."""
+    # a Metaflow flow has imported metaflow already; don't pay for importing it otherwise
+    metaflow = sys.modules.get("metaflow")
+    if metaflow is None:
+        return None
+    current = getattr(metaflow, "current", None)
+    run_id = getattr(current, "run_id", None)
+    if run_id is None:
+        # not inside a running flow
+        return None
+    return str(run_id), f"{current.step_name}/{current.task_id}"
+
+
+def _run_uuid(*parts: str) -> str:
+    # OpenLineage wants UUIDs; derive them from Metaflow's ids so every step's process agrees on the flow run's id
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, "metaflow://" + "/".join(parts)))
+
+
+def _instrument(func):
+    @functools.wraps(func)
+    def step_with_lineage(self, *args, **kwargs):
+        cls = type(self)
+        recorder = cls._lineage_recorder_for_process()
+        flow = cls.lineage_job_name or cls.__name__
+        ids = _metaflow_ids()
+        if ids:
+            flow_run_id, task = _run_uuid(flow, ids[0]), _run_uuid(flow, ids[0], ids[1])
+        else:
+            flow_run_id, task = cls._lineage_flow_run_id, None
+
+        record = StepRecord(
+            flow,
+            func.__name__,
+            task,
+            flow_run_id,
+            time.time_ns(),
+            extra_inputs=getattr(func, "lineage_inputs", ()),
+            extra_outputs=getattr(func, "lineage_outputs", ()),
+        )
+        recorder.step_started(record)
+        traced = [conn for conn in vars(self).values() if isinstance(conn, sqlite3.Connection)]
+        statements = record.statements
+
+        def trace(sql: str) -> None:
+            statements.append((time.time_ns(), sql))
+
+        for conn in traced:
+            conn.set_trace_callback(trace)
+        cls._lineage_trace = trace
+        try:
+            return func(self, *args, **kwargs)
+        except BaseException:
+            record.failed = True
+            raise
+        finally:
+            record.end_ns = time.time_ns()
+            for conn in traced:
+                conn.set_trace_callback(None)
+            cls._lineage_trace = None
+            recorder.step_finished(record)
+
+    step_with_lineage.lineage_instrumented = True
+    return step_with_lineage
+
+
+class LineageFlowMixin:
+    # job namespace (and dataset namespace) of everything emitted
+    lineage_namespace: str = "metaflow"
+    # name of the flow's job; defaults to the class name
+    lineage_job_name: str | None = None
+    lineage_producer: str = PRODUCER
+    # SQL dialect the flow's statements are parsed with
+    lineage_dialect: str = "sqlite"
+    # adds a sourceCodeLocation facet to every job
+    lineage_repo_url: str | None = None
+    # schema facets for the datasets the flow touches
+    lineage_schemas: SchemaFacetCatalog | None = None
+
+    _lineage_recorder: StepLineageRecorder | None = None
+    _lineage_pid: int | None = None
+    _lineage_trace = None
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        # steps inherited from a base flow get wrapped too, on this class only
+        for name in dir(cls):
+            value = getattr(cls, name, None)
+            if callable(value) and getattr(value, "is_step", False) and not getattr(value, "lineage_instrumented", False):
+                setattr(cls, name, _instrument(value))
+
+    @classmethod
+    def lineage_transport(cls) -> Transport:
+        """Where events go; override to use another transport. Defaults to ``$OPENLINEAGE_URL`` or localhost:9000."""
+        return _default_transport()
+
+    @classmethod
+    def _lineage_recorder_for_process(cls) -> StepLineageRecorder:
+        # Metaflow runs every task in its own process, so each one gets its own recorder and transport
+        # looked up on the class itself: a subclassed flow is a different job with its own runs
+        if vars(cls).get("_lineage_recorder") is None or cls._lineage_pid != os.getpid():
+            cls._lineage_recorder = StepLineageRecorder(
+                cls.lineage_transport(),
+                cls.lineage_namespace,
+                producer=cls.lineage_producer,
+                dialect=cls.lineage_dialect,
+                repo_url=cls.lineage_repo_url,
+                schemas=cls.lineage_schemas,
+            )
+            cls._lineage_pid = os.getpid()
+            cls._lineage_flow_run_id = str(generate_new_uuid())
+        return cls._lineage_recorder
+
+    def trace_sql(self, conn: sqlite3.Connection) -> None:
+        """Also capture statements on ``conn``, a connection opened inside the running step."""
+        trace = type(self)._lineage_trace
+        if trace is not None:
+            conn.set_trace_callback(trace)
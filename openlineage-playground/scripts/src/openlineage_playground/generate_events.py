@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 from datetime import datetime, timedelta, timezone
+from pathlib import Path
 from random import random
 
 from openlineage.client.client import OpenLineageClient, OpenLineageClientOptions
@@ -14,12 +15,13 @@ from openlineage.client.event_v2 import (
 )
 from openlineage.client.facet_v2 import (
     nominal_time_run,
-    schema_dataset,
     source_code_location_job,
     sql_job,
 )
 from openlineage.client.uuid import generate_new_uuid
 
+from openlineage_playground.schema_facets import SchemaFacetCatalog
+
 PRODUCER = "https://github.com/openlineage-user"
 namespace = "python_client"
 dag_name = "user_trends"
@@ -47,6 +49,12 @@ client = OpenLineageClient(
 # 
 # client = OpenLineageClient(transport=FileTransport(file_config))
 
+# Or, to keep going when Marquez is slow or down, spool events to local disk and
+# drain them later with `python -m openlineage_playground.spool .lineage-spool`
+# from openlineage_playground.spool import SpoolConfig, SpoolTransport
+#
+# client = OpenLineageClient(transport=SpoolTransport(SpoolConfig(directory=".lineage-spool")))
+
 
 # generates job facet
 def job(job_name, sql, location):
@@ -154,54 +162,15 @@ def addRunEvents(events, job_name, sql, inputs, outputs, hour, minutes, location
 
 events = []
 
+# one shared schema facet per dataset, instead of rebuilding it on every iteration
+schemas = SchemaFacetCatalog.from_manifest(Path(__file__).parent / "schemas.json")
+
 # create dataset data
 for i in range(0, 5):
     user_counts = dataset("tmp_demo.user_counts")
     user_history = dataset(
         "temp_demo.user_history",
-        schema_dataset.SchemaDatasetFacet(
-            fields=[
-                schema_dataset.SchemaDatasetFacetFields(
-                    name="id", type="BIGINT", description="the user id"
-                ),
-                schema_dataset.SchemaDatasetFacetFields(
-                    name="email_domain", type="VARCHAR", description="the user id"
-                ),
-                schema_dataset.SchemaDatasetFacetFields(
-                    name="status", type="BIGINT", description="the user id"
-                ),
-                schema_dataset.SchemaDatasetFacetFields(
-                    name="created_at",
-                    type="DATETIME",
-                    description="date and time of creation of the user",
-                ),
-                schema_dataset.SchemaDatasetFacetFields(
-                    name="updated_at",
-                    type="DATETIME",
-                    description="the last time this row was updated",
-                ),
-                schema_dataset.SchemaDatasetFacetFields(
-                    name="fetch_time_utc",
-                    type="DATETIME",
-                    description="the time the data was fetched",
-                ),
-                schema_dataset.SchemaDatasetFacetFields(
-                    name="load_filename",
-                    type="VARCHAR",
-                    description="the original file this data was ingested from",
-                ),
-                schema_dataset.SchemaDatasetFacetFields(
-                    name="load_filerow",
-                    type="INT",
-                    description="the row number in the original file",
-                ),
-                schema_dataset.SchemaDatasetFacetFields(
-                    name="load_timestamp",
-                    type="DATETIME",
-                    description="the time the data was ingested",
-                ),
-            ]
-        ),
+        schemas.facet("temp_demo.user_history"),
         "snowflake://",
     )
 
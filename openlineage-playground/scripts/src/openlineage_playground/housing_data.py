@@ -0,0 +1,303 @@
+"""
+Generate synthetic ``house_sales`` and ``location_info`` tables at any scale.
+
+``housing_flow.py`` and ``housing_pipeline.py`` read two tables nothing
+populates. This writes them to SQLite and/or Parquet, with the columns in
+``schemas.json`` and distributions that give the flow something to do:
+
+- houses are spread over zipcodes by a Zipf-like popularity, and each zipcode
+  has a desirability that drives both its school rating (1-10) and its prices;
+- sqft is lognormal and grows with bedrooms (1-6, mostly 2-4); bathrooms come
+  in halves, correlated with bedrooms;
+- price is per-sqft price times sqft, scaled by the zipcode, with a long right
+  tail, so some sales fall outside ``prepare_data``'s 10k-1M filter;
+- a small share of houses has no ``location_info`` row, or NULL sqft/bathrooms,
+  so the join and the NOT NULL filters drop rows too.
+
+Every batch is generated with vectorized NumPy and written in bulk: one
+multi-row ``INSERT`` stream per batch into SQLite (journal off, since the file can be
+regenerated), one row group per batch into Parquet. Output depends only on
+``seed``, ``rows`` and ``batch_size``.
+
+    python -m openlineage_playground.housing_data --rows 10_000_000 --sqlite housing.db --parquet housing/
+
+Parquet needs ``pyarrow``.
+"""
+
+import argparse
+import logging
+import sqlite3
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+from itertools import chain
+from pathlib import Path
+
+import numpy as np
+
+log = logging.getLogger(__name__)
+
+SQLITE_TABLES = {
+    "house_sales": "house_id INTEGER, price REAL, sqft REAL, bedrooms INTEGER, bathrooms REAL",
+    "location_info": "house_id INTEGER, zipcode TEXT, school_rating INTEGER",
+}
+
+# share of houses with bedrooms = 1..6
+BEDROOM_WEIGHTS = np.array([0.06, 0.22, 0.38, 0.24, 0.08, 0.02])
+
+
+@dataclass(frozen=True, slots=True)
+class Batch:
+    # house_sales columns
+    house_id: np.ndarray
+    price: np.ndarray
+    sqft: np.ndarray  # NaN for NULL
+    bedrooms: np.ndarray
+    bathrooms: np.ndarray  # NaN for NULL
+    # location_info columns; fewer rows than house_sales, in shuffled house_id order
+    location_house_id: np.ndarray
+    zipcode: np.ndarray
+    school_rating: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.house_id)
+
+
+class HousingDataGenerator:
+    def __init__(
+        self,
+        seed: int = 0,
+        n_zipcodes: int = 5000,
+        missing_location: float = 0.01,
+        missing_values: float = 0.005,
+    ) -> None:
+        """
+        :param n_zipcodes: how many distinct zipcodes houses are spread over
+        :param missing_location: share of houses without a ``location_info`` row
+        :param missing_values: share of houses with NULL sqft, and separately NULL bathrooms
+        """
+        self.seed = seed
+        self.missing_location = missing_location
+        self.missing_values = missing_values
+
+        rng = np.random.default_rng([seed, 0])
+        self.zipcodes = np.sort(rng.choice(np.arange(1_000, 99_999), n_zipcodes, replace=False))
+        self._zipcode_text = np.char.zfill(self.zipcodes.astype(str), 5).astype(object)
+        # Zipf-like popularity: a few zipcodes have many more sales than most
+        weights = 1.0 / np.arange(1, n_zipcodes + 1) ** 0.8
+        rng.shuffle(weights)
+        self._zipcode_cdf = np.cumsum(weights / weights.sum())
+        desirability = rng.normal(0, 1, n_zipcodes)
+        self._school_rating = np.clip(np.rint(5.5 + 1.8 * desirability + rng.normal(0, 0.8, n_zipcodes)), 1, 10)
+        self._school_rating = self._school_rating.astype(np.int64)
+        self._price_per_sqft = 180 * np.exp(0.35 * desirability)
+
+    def batch(self, index: int, start_id: int, n: int) -> Batch:
+        """Rows ``start_id .. start_id + n - 1``; the same arguments always give the same rows."""
+        rng = np.random.default_rng([self.seed, 1, index])
+        house_id = np.arange(start_id, start_id + n, dtype=np.int64)
+        zip_idx = np.minimum(np.searchsorted(self._zipcode_cdf, rng.random(n)), len(self.zipcodes) - 1)
+
+        bedrooms = np.searchsorted(np.cumsum(BEDROOM_WEIGHTS), rng.random(n) * BEDROOM_WEIGHTS.sum()) + 1
+        sqft = np.rint((350 + 420 * bedrooms) * rng.lognormal(0, 0.28, n))
+        bathrooms = np.clip(np.rint((0.55 * bedrooms + rng.normal(0.5, 0.45, n)) * 2) / 2, 1, bedrooms + 1)
+        # school rating adds on top of what the zipcode's per-sqft price already reflects
+        school_rating = self._school_rating[zip_idx]
+        price = (
+            sqft * self._price_per_sqft[zip_idx] * (1 + 0.03 * (school_rating - 5))
+            + 9_000 * bathrooms
+        ) * rng.lognormal(0, 0.22, n)
+        price = np.round(price, -2)
+
+        sqft[rng.random(n) < self.missing_values] = np.nan
+        bathrooms[rng.random(n) < self.missing_values] = np.nan
+
+        has_location = rng.random(n) >= self.missing_location
+        # shuffled so joining location_info to house_sales can't just walk both in order
+        order = rng.permutation(np.flatnonzero(has_location))
+        return Batch(
+            house_id=house_id,
+            price=price,
+            sqft=sqft,
+            bedrooms=bedrooms.astype(np.int64),
+            bathrooms=bathrooms,
+            location_house_id=house_id[order],
+            zipcode=self._zipcode_text[zip_idx[order]],
+            school_rating=school_rating[order],
+        )
+
+    def batches(self, rows: int, batch_size: int = 1_000_000) -> Iterator[Batch]:
+        for index, start in enumerate(range(0, rows, batch_size)):
+            yield self.batch(index, start, min(batch_size, rows - start))
+
+
+# SQLite's limit on parameters per statement before 3.32, and still the default in some builds
+_MAX_PARAMS = 999
+
+
+def _column(values: np.ndarray) -> list:
+    """Values as a list sqlite3 can bind, with NaN as None (NULL)."""
+    if values.dtype.kind == "f" and np.isnan(values).any():
+        column = values.astype(object)
+        column[np.isnan(values)] = None
+        return column.tolist()
+    return values.tolist()
+
+
+def _insert(conn: sqlite3.Connection, table: str, columns: list[list]) -> None:
+    """
+    Insert rows given as columns, many rows per ``INSERT``.
+
+    Binding is per value either way, but one ``INSERT ... VALUES (...), (...), ...``
+    per few hundred rows saves the per-statement step and reset that ``executemany``
+    pays for every row; bulk loads run about 2.5x faster.
+    """
+    width = len(columns)
+    per_statement = _MAX_PARAMS // width
+    values = list(chain.from_iterable(zip(*columns)))
+    step = per_statement * width
+    full = len(values) // step * step
+    sql = f"INSERT INTO {table} VALUES " + ", ".join(["(" + ", ".join("?" * width) + ")"] * per_statement)
+    conn.executemany(sql, (values[i : i + step] for i in range(0, full, step)))
+    if full < len(values):
+        rest = (len(values) - full) // width
+        sql = f"INSERT INTO {table} VALUES " + ", ".join(["(" + ", ".join("?" * width) + ")"] * rest)
+        conn.execute(sql, values[full:])
+
+
+class SQLiteSink:
+    def __init__(self, path: Path | str) -> None:
+        self.conn = sqlite3.connect(path)
+        # a bulk load into a file that's regenerated rather than recovered: no journal, no fsyncs
+        self.conn.execute("PRAGMA journal_mode = OFF")
+        self.conn.execute("PRAGMA synchronous = OFF")
+        self.conn.execute("PRAGMA cache_size = -262144")
+        for table, columns in SQLITE_TABLES.items():
+            self.conn.execute(f"DROP TABLE IF EXISTS {table}")
+            self.conn.execute(f"CREATE TABLE {table} ({columns})")
+
+    def write(self, batch: Batch) -> None:
+        with self.conn:
+            _insert(
+                self.conn,
+                "house_sales",
+                [
+                    batch.house_id.tolist(),
+                    batch.price.tolist(),
+                    _column(batch.sqft),
+                    batch.bedrooms.tolist(),
+                    _column(batch.bathrooms),
+                ],
+            )
+            _insert(
+                self.conn,
+                "location_info",
+                [batch.location_house_id.tolist(), batch.zipcode.tolist(), batch.school_rating.tolist()],
+            )
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+class ParquetSink:
+    """``house_sales.parquet`` and ``location_info.parquet`` in ``directory``, one row group per batch."""
+
+    def __init__(self, directory: Path | str) -> None:
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError(
+                "pyarrow is needed to write Parquet: install the parquet extra (uv sync --extra parquet)"
+                " or only write --sqlite"
+            ) from None
+        self._pa, self._pq = pa, pq
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._schemas = {
+            "house_sales": pa.schema(
+                [("house_id", pa.int64()), ("price", pa.float64()), ("sqft", pa.float64()),
+                 ("bedrooms", pa.int64()), ("bathrooms", pa.float64())]
+            ),
+            "location_info": pa.schema(
+                [("house_id", pa.int64()), ("zipcode", pa.string()), ("school_rating", pa.int64())]
+            ),
+        }
+        self._writers = {
+            table: pq.ParquetWriter(self.directory / f"{table}.parquet", schema, compression="zstd")
+            for table, schema in self._schemas.items()
+        }
+
+    def write(self, batch: Batch) -> None:
+        pa = self._pa
+        # from_pandas=True turns NaN into null
+        self._writers["house_sales"].write_table(
+            pa.table(
+                [
+                    pa.array(batch.house_id),
+                    pa.array(batch.price),
+                    pa.array(batch.sqft, from_pandas=True),
+                    pa.array(batch.bedrooms),
+                    pa.array(batch.bathrooms, from_pandas=True),
+                ],
+                schema=self._schemas["house_sales"],
+            )
+        )
+        self._writers["location_info"].write_table(
+            pa.table(
+                [pa.array(batch.location_house_id), pa.array(batch.zipcode, pa.string()), pa.array(batch.school_rating)],
+                schema=self._schemas["location_info"],
+            )
+        )
+
+    def close(self) -> None:
+        for writer in self._writers.values():
+            writer.close()
+
+
+def generate(
+    rows: int,
+    sinks: list,
+    batch_size: int = 1_000_000,
+    generator: HousingDataGenerator | None = None,
+) -> None:
+    """Write ``rows`` houses to every sink, logging progress after each batch."""
+    generator = generator or HousingDataGenerator()
+    start = time.perf_counter()
+    written = 0
+    try:
+        for batch in generator.batches(rows, batch_size):
+            for sink in sinks:
+                sink.write(batch)
+            written += len(batch)
+            elapsed = time.perf_counter() - start
+            log.info("%s/%s rows (%.0f rows/s)", f"{written:,}", f"{rows:,}", written / elapsed)
+    finally:
+        for sink in sinks:
+            sink.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate synthetic house_sales/location_info tables")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--sqlite", type=Path, help="SQLite database to (re)create the tables in")
+    parser.add_argument("--parquet", type=Path, help="directory to write house_sales/location_info .parquet files to")
+    parser.add_argument("--batch-size", type=int, default=1_000_000, help="rows generated and written at a time")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    if not args.sqlite and not args.parquet:
+        parser.error("pass --sqlite and/or --parquet")
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    sinks = []
+    if args.sqlite:
+        sinks.append(SQLiteSink(args.sqlite))
+    if args.parquet:
+        sinks.append(ParquetSink(args.parquet))
+    start = time.perf_counter()
+    generate(args.rows, sinks, args.batch_size, HousingDataGenerator(args.seed))
+    print(f"{args.rows:,} houses in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
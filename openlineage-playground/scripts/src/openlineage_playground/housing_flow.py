@@ -8,6 +8,7 @@ that simulate this flow being run.
 
 In other words, if this flow were instrumented with OpenLineage,
 if would log the same events that `log_housing_events.py` does.
+`LineageFlowMixin` is that instrumentation.
 """
 
 from metaflow import FlowSpec, step, Parameter, conda_base
@@ -16,8 +17,21 @@ import sqlite3  # Replace with appropriate DB connector for production
 from sklearn.linear_model import LinearRegression
 from sklearn.metrics import mean_squared_error
 
-@conda_base(libraries={"pandas": "1.5.3", "scikit-learn": "1.2.2"})
-class HousingRegressionFlow(FlowSpec):
+from openlineage_playground.flow_lineage import LineageFlowMixin, lineage_datasets
+
+# flow_lineage emits through openlineage-python and requests, and parses each step's SQL with openlineage-sql
+@conda_base(
+    libraries={
+        "pandas": "1.5.3",
+        "scikit-learn": "1.2.2",
+        "openlineage-python": "1.33.0",
+        "openlineage-sql": "1.33.0",
+        "requests": "2.32.4",
+    }
+)
+class HousingRegressionFlow(LineageFlowMixin, FlowSpec):
+    lineage_namespace = "house_regression"
+    lineage_job_name = "housing_regression_flow"
 
     db_path = Parameter("db_path", help="Path to database", default="housing.db")
 
@@ -53,6 +67,7 @@ class HousingRegressionFlow(FlowSpec):
         self.conn.commit()
         self.next(self.train_model)
 
+    @lineage_datasets(outputs=["trained_model.pkl"])
     @step
     def train_model(self):
         df = pd.read_sql_query("SELECT sqft, bedrooms, bathrooms, school_rating, price FROM features", self.conn)
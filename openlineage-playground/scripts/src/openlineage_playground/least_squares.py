@@ -0,0 +1,71 @@
+"""
+Least squares fitted a chunk at a time, for tables that don't fit in memory.
+
+Kept out of ``housing_pipeline`` so that pickled models name this module, and
+load the same whether the pipeline ran as a script or was imported.
+"""
+
+import numpy as np
+
+
+class NormalEquations:
+    """
+    Ordinary least squares fitted a chunk at a time.
+
+    Each chunk only adds to ZᵀZ and Zᵀy, where Z is X with a column of ones for the
+    intercept, so the fit needs O(features²) memory however many rows there are.
+    Values are shifted by the first chunk's means before accumulating: squaring
+    raw prices and square footages would lose most of float64's precision.
+    """
+
+    def __init__(self, n_features: int) -> None:
+        self.n_features = n_features
+        self.n_rows = 0
+        self._zz = np.zeros((n_features + 1, n_features + 1))
+        self._zy = np.zeros(n_features + 1)
+        self._yy = 0.0
+        self._x_shift: np.ndarray | None = None
+        self._y_shift = 0.0
+        self._solution: np.ndarray | None = None
+
+    def partial_fit(self, X: np.ndarray, y: np.ndarray) -> "NormalEquations":
+        if not len(y):
+            return self
+        if self._x_shift is None:
+            self._x_shift, self._y_shift = X.mean(axis=0), float(y.mean())
+        z = np.empty((len(y), self.n_features + 1))
+        np.subtract(X, self._x_shift, out=z[:, :-1])
+        z[:, -1] = 1.0
+        y = y - self._y_shift
+        self._zz += z.T @ z
+        self._zy += z.T @ y
+        self._yy += float(y @ y)
+        self.n_rows += len(y)
+        self._solution = None
+        return self
+
+    def _solve(self) -> np.ndarray:
+        if self._solution is None:
+            if not self.n_rows:
+                raise ValueError("no rows have been fitted")
+            # lstsq rather than solve: a constant or duplicated column makes ZᵀZ singular
+            self._solution = np.linalg.lstsq(self._zz, self._zy, rcond=None)[0]
+        return self._solution
+
+    @property
+    def coef_(self) -> np.ndarray:
+        return self._solve()[:-1]
+
+    @property
+    def intercept_(self) -> float:
+        beta = self._solve()
+        return float(beta[-1] + self._y_shift - beta[:-1] @ self._x_shift)
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return X @ self.coef_ + self.intercept_
+
+    def mse(self) -> float:
+        """Mean squared error over every row fitted, from the accumulated sums alone."""
+        beta = self._solve()
+        sse = self._yy - 2 * beta @ self._zy + beta @ self._zz @ beta
+        return max(float(sse), 0.0) / self.n_rows
@@ -0,0 +1,186 @@
+"""
+In-memory lineage graph built from parsed SQL statements.
+
+``parse_sql.py`` emits every statement as an isolated ``script.sql.{i}`` job,
+so anything downstream has to work out which statements depend on which by
+itself. ``LineageGraph`` does that once, incrementally, as statements arrive:
+
+    graph = LineageGraph()
+    for lineage in extract_lineage(statements):
+        graph.add_statement(
+            f"script.sql.{lineage.index}",
+            [t.qualified_name for t in lineage.in_tables],
+            [t.qualified_name for t in lineage.out_tables],
+        )
+
+    graph.ancestors("ANALYTICS_DB.CORE.RPT_DAILY_SALES")
+    graph.job_levels()    # statements grouped into waves that can run side by side
+
+Datasets and jobs are interned to consecutive integers and edges are kept in
+one ``array`` per node rather than dicts of lists, so a graph of a few hundred
+thousand edges stays small and traversals are tight loops over ints.
+"""
+
+from array import array
+from collections import deque
+from collections.abc import Iterable, Iterator
+from graphlib import CycleError
+
+
+class LineageGraph:
+    def __init__(self) -> None:
+        # --- datasets ---
+        self._dataset_ids: dict[str, int] = {}
+        self.datasets: list[str] = []
+        # dataset id -> ids of datasets derived from it / it's derived from
+        self._down: list[array] = []
+        self._up: list[array] = []
+        # src << 32 | dst, to skip duplicate edges without scanning the arrays
+        self._edges: set[int] = set()
+        # dataset id -> last job that wrote it (-1 if none yet)
+        self._last_writer = array("l")
+        # dataset id -> jobs that read it since it was last written
+        self._readers: list[array] = []
+
+        # --- jobs (statements) ---
+        self.jobs: list[str] = []
+        self._job_inputs: list[array] = []
+        self._job_outputs: list[array] = []
+        # job id -> earlier jobs that must finish before it may run
+        self._job_deps: list[array] = []
+        # job id -> length of the longest dependency chain ending at it
+        self._job_level = array("l")
+
+    def __len__(self) -> int:
+        return len(self.datasets)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self._edges)
+
+    def dataset_id(self, name: str) -> int:
+        """Id of ``name``, adding the dataset if it's new."""
+        i = self._dataset_ids.get(name)
+        if i is None:
+            i = self._dataset_ids[name] = len(self.datasets)
+            self.datasets.append(name)
+            self._down.append(array("l"))
+            self._up.append(array("l"))
+            self._last_writer.append(-1)
+            self._readers.append(array("l"))
+        return i
+
+    def add_statement(self, job: str, inputs: Iterable[str], outputs: Iterable[str]) -> int:
+        """
+        Record a statement that reads ``inputs`` and writes ``outputs``, and return its job id.
+
+        Statements must be added in execution order: a job depends on the last job that
+        wrote each of its inputs, and (so that running jobs in dependency order gives the
+        same result as running the script) on every job that read or wrote its outputs before.
+        """
+        job_id = len(self.jobs)
+        ins = array("l", dict.fromkeys(self.dataset_id(name) for name in inputs))
+        outs = array("l", dict.fromkeys(self.dataset_id(name) for name in outputs))
+
+        for src in ins:
+            for dst in outs:
+                if src != dst and (key := src << 32 | dst) not in self._edges:
+                    self._edges.add(key)
+                    self._down[src].append(dst)
+                    self._up[dst].append(src)
+
+        deps: set[int] = set()
+        for d in ins:
+            if self._last_writer[d] >= 0:
+                deps.add(self._last_writer[d])
+        for d in outs:
+            if self._last_writer[d] >= 0:
+                deps.add(self._last_writer[d])
+            deps.update(self._readers[d])
+        deps.discard(job_id)
+
+        for d in ins:
+            self._readers[d].append(job_id)
+        for d in outs:
+            self._last_writer[d] = job_id
+            self._readers[d] = array("l")
+
+        self.jobs.append(job)
+        self._job_inputs.append(ins)
+        self._job_outputs.append(outs)
+        self._job_deps.append(array("l", sorted(deps)))
+        self._job_level.append(1 + max((self._job_level[j] for j in deps), default=-1))
+        return job_id
+
+    # --- dataset queries ---
+
+    def upstream(self, name: str) -> list[str]:
+        """Datasets ``name`` is directly derived from."""
+        return [self.datasets[i] for i in self._up[self._dataset_ids[name]]]
+
+    def downstream(self, name: str) -> list[str]:
+        """Datasets directly derived from ``name``."""
+        return [self.datasets[i] for i in self._down[self._dataset_ids[name]]]
+
+    def ancestors(self, name: str) -> list[str]:
+        """Every dataset ``name`` transitively depends on, nearest first."""
+        return [self.datasets[i] for i in self._reachable(self._dataset_ids[name], self._up)]
+
+    def descendants(self, name: str) -> list[str]:
+        """Every dataset transitively derived from ``name``, nearest first."""
+        return [self.datasets[i] for i in self._reachable(self._dataset_ids[name], self._down)]
+
+    def topological_order(self) -> list[str]:
+        """
+        Datasets ordered so that each comes after everything it's derived from.
+
+        Raises ``graphlib.CycleError`` if datasets feed into each other.
+        """
+        n = len(self.datasets)
+        indegree = array("l", (len(up) for up in self._up))
+        ready = deque(i for i in range(n) if indegree[i] == 0)
+        order = []
+        while ready:
+            i = ready.popleft()
+            order.append(i)
+            for j in self._down[i]:
+                indegree[j] -= 1
+                if indegree[j] == 0:
+                    ready.append(j)
+        if len(order) < n:
+            stuck = [self.datasets[i] for i in range(n) if indegree[i] > 0]
+            raise CycleError("datasets are part of a cycle", stuck)
+        return [self.datasets[i] for i in order]
+
+    # --- job queries ---
+
+    def job_dependencies(self, job_id: int) -> list[int]:
+        """Ids of the jobs that must finish before ``job_id`` may start."""
+        return list(self._job_deps[job_id])
+
+    def job_inputs(self, job_id: int) -> list[str]:
+        return [self.datasets[i] for i in self._job_inputs[job_id]]
+
+    def job_outputs(self, job_id: int) -> list[str]:
+        return [self.datasets[i] for i in self._job_outputs[job_id]]
+
+    def job_levels(self) -> list[list[int]]:
+        """
+        Job ids grouped into waves: every job only depends on jobs in earlier waves,
+        so the jobs within a wave can run concurrently.
+        """
+        levels: list[list[int]] = [[] for _ in range(max(self._job_level, default=-1) + 1)]
+        for job_id, level in enumerate(self._job_level):
+            levels[level].append(job_id)
+        return levels
+
+    def _reachable(self, start: int, adjacency: list[array]) -> Iterator[int]:
+        seen = bytearray(len(self.datasets))
+        seen[start] = 1
+        frontier = deque([start])
+        while frontier:
+            for j in adjacency[frontier.popleft()]:
+                if not seen[j]:
+                    seen[j] = 1
+                    frontier.append(j)
+                    yield j
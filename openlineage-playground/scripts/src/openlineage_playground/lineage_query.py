@@ -0,0 +1,402 @@
+"""
+Answer "what depends on this?" and "what feeds this?" from emitted events, without Marquez.
+
+``LineageIndex`` reads run events, from a ``FileTransport`` log (or a spool
+directory) or from a ``LineageStore``, into a graph of datasets and jobs (each
+input dataset -> job -> each output dataset) and precomputes a reachability
+index, so that on graphs of 100k+ datasets
+
+- "is ``house_sales`` upstream of ``features``?" is a binary search, and
+- "everything downstream of ``house_sales``" is counted without walking the
+  graph and returned a page at a time:
+
+    index = LineageIndex.from_file("events.ndjson")         # FileTransport(append=True) output
+    index = LineageIndex.from_store(LineageStore("lineage.db"))
+
+    index.is_upstream(("house_regression", "house_sales"), ("house_regression", "features"))
+    page = index.downstream("house_regression", "house_sales", kind="job", limit=50)
+    page.total, page.items, index.downstream(..., offset=page.next_offset)
+
+    uv run python -m openlineage_playground.lineage_query events.ndjson downstream house_regression house_sales
+
+The index is interval labeling over a DFS post-order of the graph with cycles
+collapsed: every node gets the post-order numbers of everything it reaches as a
+short list of ``[start, end]`` intervals, built bottom-up by merging its
+successors' lists. Nodes are laid out in post-order too, so each interval is a
+contiguous slice of one array, which is what makes counting and paging cheap.
+There's one index per direction. Pipelines that mostly feed their own tables
+need a handful of intervals per node; heavily cross-linked graphs need more
+(``stats()`` reports how many).
+
+The index describes the events it was built from: rebuild it to see new ones.
+Results come in post-order rather than by distance; ``LineageStore.upstream``
+and ``downstream`` walk the graph breadth-first for distances.
+"""
+
+import argparse
+import json
+import logging
+import sys
+from array import array
+from bisect import bisect_right
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+from openlineage_playground.lineage_store import LineageStore
+
+log = logging.getLogger(__name__)
+
+DATASET, JOB = "dataset", "job"
+_KINDS = (DATASET, JOB)
+
+
+@dataclass(frozen=True, slots=True)
+class Page:
+    # (namespace, name) of each dataset or job on this page
+    items: list[tuple[str, str]]
+    # how many there are across all pages
+    total: int
+    offset: int
+    # offset of the next page, None on the last one
+    next_offset: int | None
+
+
+def iter_event_files(path: str | Path) -> Iterator[dict]:
+    """
+    Events from a file of one JSON event per line (``FileTransport(append=True)``, spool segments),
+    a directory of such files, or the ``<path>-<time>.json`` files ``FileTransport`` writes otherwise.
+    """
+    path = Path(path)
+    if path.is_file():
+        files = [path]
+    elif path.is_dir():
+        files = sorted(p for p in path.iterdir() if p.suffix in (".json", ".ndjson", ".jsonl"))
+    else:
+        files = sorted(path.parent.glob(f"{path.name}-*.json"))
+    for file in files:
+        with open(file, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+class _Reachability:
+    """Interval labels of one direction of the condensed graph."""
+
+    def __init__(self, successors: list[set[int]], topological: list[int], node_comp: array, node_kind: bytes) -> None:
+        n = len(successors)
+        # --- post-order numbers from a DFS forest, started from components nothing points at ---
+        has_pred = bytearray(n)
+        for succ in successors:
+            for s in succ:
+                has_pred[s] = 1
+        post = array("l", [-1]) * n
+        low = array("l", [0]) * n
+        counter = 0
+        for root in topological:
+            if has_pred[root] or post[root] >= 0:
+                continue
+            post[root] = -2
+            low[root] = counter
+            stack = [(root, iter(successors[root]))]
+            while stack:
+                c, it = stack[-1]
+                for s in it:
+                    if post[s] == -1:
+                        post[s] = -2
+                        low[s] = counter
+                        stack.append((s, iter(successors[s])))
+                        break
+                else:
+                    stack.pop()
+                    post[c] = counter
+                    counter += 1
+        # components only reachable through a cycle can't exist once cycles are collapsed
+        assert counter == n
+
+        # --- intervals, sinks first, each node's merged with its successors' ---
+        self.post = post
+        self.offsets = array("l", [0]) * n
+        self.lengths = array("l", [0]) * n
+        self.starts = array("l")
+        self.ends = array("l")
+        for c in reversed(topological):
+            spans = [(low[c], post[c])]
+            for s in successors[c]:
+                o = self.offsets[s]
+                spans.extend(zip(self.starts[o : o + self.lengths[s]], self.ends[o : o + self.lengths[s]]))
+            spans.sort()
+            self.offsets[c] = len(self.starts)
+            start, end = spans[0]
+            for s, e in spans[1:]:
+                if s <= end + 1:
+                    end = max(end, e)
+                else:
+                    self.starts.append(start)
+                    self.ends.append(end)
+                    start, end = s, e
+            self.starts.append(start)
+            self.ends.append(end)
+            self.lengths[c] = len(self.starts) - self.offsets[c]
+
+        # --- nodes of each kind laid out by post-order of their component ---
+        self.order: dict[str, array] = {}
+        # prefix[kind][p]: how many nodes of that kind have a component numbered below p
+        self.prefix: dict[str, array] = {}
+        self.position = array("l", [0]) * len(node_comp)
+        for k, kind in enumerate(_KINDS):
+            nodes = sorted((i for i in range(len(node_comp)) if node_kind[i] == k), key=lambda i: post[node_comp[i]])
+            self.order[kind] = array("l", nodes)
+            counts = array("l", [0]) * (n + 1)
+            for i in nodes:
+                counts[post[node_comp[i]] + 1] += 1
+            for p in range(n):
+                counts[p + 1] += counts[p]
+            self.prefix[kind] = counts
+            for rank, i in enumerate(nodes):
+                self.position[i] = rank
+
+    def reaches(self, a: int, b: int) -> bool:
+        """Whether component ``a`` reaches component ``b``."""
+        o = self.offsets[a]
+        p = self.post[b]
+        i = bisect_right(self.starts, p, o, o + self.lengths[a]) - 1
+        return i >= o and self.ends[i] >= p
+
+    def slices(self, c: int, kind: str) -> list[tuple[int, int]]:
+        """Ranges of ``order[kind]`` holding the nodes component ``c`` reaches, itself included."""
+        prefix = self.prefix[kind]
+        o = self.offsets[c]
+        result = []
+        for i in range(o, o + self.lengths[c]):
+            lo, hi = prefix[self.starts[i]], prefix[self.ends[i] + 1]
+            if hi > lo:
+                result.append((lo, hi))
+        return result
+
+
+class LineageIndex:
+    def __init__(self) -> None:
+        self._ids: dict[tuple[str, str, str], int] = {}
+        # (namespace, name) and kind (index into _KINDS) of every node
+        self.names: list[tuple[str, str]] = []
+        self._kind = bytearray()
+        self._out: list[set[int]] = []
+        self._down: _Reachability | None = None
+        self._up: _Reachability | None = None
+
+    # --- building ---
+
+    @classmethod
+    def from_events(cls, events: Iterable[dict | str]) -> "LineageIndex":
+        index = cls()
+        for event in events:
+            index.add_event(json.loads(event) if isinstance(event, str) else event)
+        index.build()
+        return index
+
+    @classmethod
+    def from_file(cls, path: str | Path) -> "LineageIndex":
+        """From ``FileTransport`` output or spool segments, see ``iter_event_files``."""
+        return cls.from_events(iter_event_files(path))
+
+    @classmethod
+    def from_store(cls, store: LineageStore) -> "LineageIndex":
+        index = cls()
+        for job_ns, job_name, direction, ds_ns, ds_name in store.all_job_io():
+            job = index._node(JOB, job_ns, job_name)
+            dataset = index._node(DATASET, ds_ns, ds_name)
+            if direction == "in":
+                index._out[dataset].add(job)
+            else:
+                index._out[job].add(dataset)
+        index.build()
+        return index
+
+    def _node(self, kind: str, namespace: str, name: str) -> int:
+        i = self._ids.get((kind, namespace, name))
+        if i is None:
+            i = self._ids[kind, namespace, name] = len(self.names)
+            self.names.append((namespace, name))
+            self._kind.append(_KINDS.index(kind))
+            self._out.append(set())
+        return i
+
+    def add_event(self, event: dict) -> None:
+        """Add a run event's job and datasets; call ``build()`` once done adding."""
+        job = event.get("job") or {}
+        if not job.get("name"):
+            return
+        j = self._node(JOB, job.get("namespace", ""), job["name"])
+        for d in event.get("inputs") or ():
+            self._out[self._node(DATASET, d.get("namespace", ""), d["name"])].add(j)
+        for d in event.get("outputs") or ():
+            self._out[j].add(self._node(DATASET, d.get("namespace", ""), d["name"]))
+
+    def build(self) -> None:
+        """(Re)compute the reachability index from the events added so far."""
+        comp, order = self._components()
+        n = len(order)
+        successors: list[set[int]] = [set() for _ in range(n)]
+        predecessors: list[set[int]] = [set() for _ in range(n)]
+        for i, out in enumerate(self._out):
+            for j in out:
+                if comp[i] != comp[j]:
+                    successors[comp[i]].add(comp[j])
+                    predecessors[comp[j]].add(comp[i])
+        # order lists components sinks first; reversed, every component comes before what it reaches
+        topological = order[::-1]
+        self._comp = comp
+        self._down = _Reachability(successors, topological, comp, self._kind)
+        self._up = _Reachability(predecessors, order, comp, self._kind)
+
+    def _components(self) -> tuple[array, list[int]]:
+        """Strongly connected components (Tarjan's, iteratively), numbered in the order they're found: sinks first."""
+        n = len(self.names)
+        index = array("l", [-1]) * n
+        lowlink = array("l", [0]) * n
+        on_stack = bytearray(n)
+        comp = array("l", [-1]) * n
+        stack: list[int] = []
+        order: list[int] = []
+        counter = 0
+        for root in range(n):
+            if index[root] >= 0:
+                continue
+            index[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = 1
+            work = [(root, iter(self._out[root]))]
+            while work:
+                v, it = work[-1]
+                for w in it:
+                    if index[w] < 0:
+                        index[w] = lowlink[w] = counter
+                        counter += 1
+                        stack.append(w)
+                        on_stack[w] = 1
+                        work.append((w, iter(self._out[w])))
+                        break
+                    if on_stack[w] and index[w] < lowlink[v]:
+                        lowlink[v] = index[w]
+                else:
+                    work.pop()
+                    if work and lowlink[v] < lowlink[work[-1][0]]:
+                        lowlink[work[-1][0]] = lowlink[v]
+                    if lowlink[v] == index[v]:
+                        c = len(order)
+                        order.append(c)
+                        while True:
+                            w = stack.pop()
+                            on_stack[w] = 0
+                            comp[w] = c
+                            if w == v:
+                                break
+        return comp, order
+
+    # --- querying ---
+
+    def _id(self, kind: str, namespace: str, name: str) -> int:
+        try:
+            return self._ids[kind, namespace, name]
+        except KeyError:
+            raise KeyError(f"no {kind} {namespace}:{name} in the events") from None
+
+    def is_upstream(self, upstream: tuple[str, str], downstream: tuple[str, str], kind: str = DATASET) -> bool:
+        """Whether ``downstream`` is derived, directly or not, from ``upstream``; both are ``(namespace, name)``."""
+        a, b = self._id(kind, *upstream), self._id(kind, *downstream)
+        if a == b:
+            return False
+        return self._down.reaches(self._comp[a], self._comp[b])
+
+    def downstream(
+        self, namespace: str, name: str, kind: str = DATASET, offset: int = 0, limit: int = 100, of: str = DATASET
+    ) -> Page:
+        """
+        Datasets (or jobs, with ``kind="job"``) that depend on dataset ``namespace:name``.
+
+        :param of: ``"job"`` to start from a job rather than a dataset
+        """
+        return self._page(self._down, self._id(of, namespace, name), kind, offset, limit)
+
+    def upstream(
+        self, namespace: str, name: str, kind: str = DATASET, offset: int = 0, limit: int = 100, of: str = DATASET
+    ) -> Page:
+        """Datasets (or jobs) dataset ``namespace:name`` depends on."""
+        return self._page(self._up, self._id(of, namespace, name), kind, offset, limit)
+
+    def _page(self, reach: _Reachability, node: int, kind: str, offset: int, limit: int) -> Page:
+        slices = reach.slices(self._comp[node], kind)
+        # the node itself sits in one of the slices; leave it out
+        skip = reach.position[node] if self._kind[node] == _KINDS.index(kind) else -1
+        total = sum(hi - lo for lo, hi in slices) - (skip >= 0)
+
+        order, names = reach.order[kind], self.names
+        items: list[tuple[str, str]] = []
+        position = 0
+        for lo, hi in slices:
+            if len(items) == limit:
+                break
+            size = hi - lo - (lo <= skip < hi)
+            if position + size <= offset:
+                position += size
+                continue
+            # skip into this slice, then take whole runs of ranks
+            ranks = [r for r in range(lo, hi) if r != skip] if lo <= skip < hi else range(lo, hi)
+            first = max(0, offset - position)
+            items.extend(names[order[r]] for r in ranks[first : first + limit - len(items)])
+            position += size
+        end = offset + len(items)
+        return Page(items, total, offset, end if end < total else None)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "datasets": self._kind.count(_KINDS.index(DATASET)),
+            "jobs": self._kind.count(_KINDS.index(JOB)),
+            "edges": sum(len(out) for out in self._out),
+            "components": len(self._down.post),
+            "down_intervals": len(self._down.starts),
+            "up_intervals": len(self._up.starts),
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Query lineage from FileTransport output, spool segments or a store")
+    parser.add_argument("source", help="event file or directory, or a LineageStore database with --store")
+    parser.add_argument("--store", action="store_true", help="source is a LineageStore database")
+    commands = parser.add_subparsers(dest="command", required=True)
+    for command in ("upstream", "downstream"):
+        walk_cmd = commands.add_parser(command, help=f"datasets or jobs {command} of a dataset")
+        walk_cmd.add_argument("namespace")
+        walk_cmd.add_argument("name")
+        walk_cmd.add_argument("--kind", choices=_KINDS, default=DATASET, help="what to list")
+        walk_cmd.add_argument("--offset", type=int, default=0)
+        walk_cmd.add_argument("--limit", type=int, default=100)
+    depends_cmd = commands.add_parser("depends", help="whether one dataset is derived from another")
+    depends_cmd.add_argument("namespace")
+    depends_cmd.add_argument("downstream")
+    depends_cmd.add_argument("upstream")
+    args = parser.parse_args()
+
+    if args.store:
+        with LineageStore(args.source) as store:
+            index = LineageIndex.from_store(store)
+    else:
+        index = LineageIndex.from_file(args.source)
+
+    if args.command == "depends":
+        derived = index.is_upstream((args.namespace, args.upstream), (args.namespace, args.downstream))
+        print(f"{args.downstream} {'depends' if derived else 'does not depend'} on {args.upstream}")
+        sys.exit(0 if derived else 1)
+    walk = index.upstream if args.command == "upstream" else index.downstream
+    page = walk(args.namespace, args.name, args.kind, args.offset, args.limit)
+    for namespace, name in page.items:
+        print(f"{namespace}:{name}")
+    more = f", next page: --offset {page.next_offset}" if page.next_offset is not None else ""
+    print(f"({len(page.items)} of {page.total}{more})")
+
+
+if __name__ == "__main__":
+    main()
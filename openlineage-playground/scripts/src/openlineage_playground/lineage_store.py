@@ -0,0 +1,453 @@
+"""
+An embedded lineage store, for running the scripts without the Marquez stack.
+
+``LineageStore`` keeps OpenLineage run events in one SQLite file and indexes
+them as they arrive: jobs, datasets, runs (with their state, start/end time and
+parent), which datasets each job reads and writes, and the dataset-to-dataset
+edges that implies. Lineage questions are then indexed lookups and breadth-first
+walks over those edges rather than scans over raw events.
+
+Events get in either in-process, through ``StoreTransport``:
+
+    client = OpenLineageClient(transport=StoreTransport(StoreConfig(path="lineage.db")))
+
+or over HTTP, by serving the same ``POST /api/v1/lineage`` endpoint Marquez has
+so existing scripts work unchanged against ``http://localhost:9000``:
+
+    uv run python -m openlineage_playground.lineage_store serve lineage.db --port 9000
+
+and are queried from Python or the command line:
+
+    store = LineageStore("lineage.db")
+    store.upstream("house_regression", "features")      # every dataset features is derived from
+    store.runs("house_regression", "housing_regression_flow.train_model")
+
+    uv run python -m openlineage_playground.lineage_store downstream lineage.db house_regression house_sales
+
+A job's inputs and outputs are the union over all of its runs.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import attr
+from openlineage.client.serde import Serde
+from openlineage.client.transport.transport import Config, Transport
+
+log = logging.getLogger(__name__)
+
+# run states that a late-arriving START or RUNNING event mustn't overwrite
+_TERMINAL = ("COMPLETE", "FAIL", "ABORT")
+# ids per "IN (...)" query, well under SQLite's limit on bound parameters
+_MAX_PARAMS = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY, namespace TEXT NOT NULL, name TEXT NOT NULL, UNIQUE (namespace, name));
+CREATE TABLE IF NOT EXISTS datasets (
+    id INTEGER PRIMARY KEY, namespace TEXT NOT NULL, name TEXT NOT NULL, UNIQUE (namespace, name));
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY, job_id INTEGER NOT NULL, state TEXT,
+    started_at TEXT, ended_at TEXT, parent_run_id TEXT);
+CREATE INDEX IF NOT EXISTS runs_job ON runs (job_id, started_at);
+CREATE INDEX IF NOT EXISTS runs_parent ON runs (parent_run_id);
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY, run_id TEXT NOT NULL, event_type TEXT, event_time TEXT, payload TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS events_run ON events (run_id);
+-- direction is 'in' or 'out'
+CREATE TABLE IF NOT EXISTS job_io (
+    job_id INTEGER NOT NULL, dataset_id INTEGER NOT NULL, direction TEXT NOT NULL,
+    PRIMARY KEY (job_id, dataset_id, direction)) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS job_io_dataset ON job_io (dataset_id, direction);
+-- src was read and dst written by the same job
+CREATE TABLE IF NOT EXISTS dataset_edges (
+    src INTEGER NOT NULL, dst INTEGER NOT NULL, job_id INTEGER NOT NULL,
+    PRIMARY KEY (src, dst, job_id)) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS dataset_edges_dst ON dataset_edges (dst, src);
+"""
+
+
+def _check_event(event) -> tuple[dict, dict, str | None]:
+    """The event's ``run``, ``job`` and parent run id; raises ``ValueError`` if it can't be stored."""
+    if not isinstance(event, dict):
+        raise ValueError("Not a run event: expected a JSON object")
+    run, job = event.get("run"), event.get("job")
+    if not isinstance(run, dict) or not isinstance(job, dict):
+        raise ValueError("Not a run event: run and job must be objects")
+    run_id = run.get("runId")
+    if not run_id or not isinstance(run_id, str):
+        raise ValueError("Not a run event: run.runId is required")
+    if not _named(job):
+        raise ValueError("The job needs a name, and its namespace must be a string")
+    for field in ("eventType", "eventTime"):
+        if not isinstance(event.get(field), str | None):
+            raise ValueError(f"{field} must be a string")
+    for section in ("inputs", "outputs"):
+        datasets = event.get(section) or []
+        if not isinstance(datasets, list):
+            raise ValueError(f"{section} must be a list")
+        if not all(map(_named, datasets)):
+            raise ValueError(f"Every dataset in {section} needs a name, and its namespace must be a string")
+
+    # the parent facet is optional, so a malformed one is ignored rather than rejected
+    parent_run_id = run
+    for key in ("facets", "parent", "run", "runId"):
+        parent_run_id = parent_run_id.get(key) if isinstance(parent_run_id, dict) else None
+    return run, job, parent_run_id if isinstance(parent_run_id, str) else None
+
+
+def _named(entity) -> bool:
+    """Whether a job or dataset is an object with a name and, if it has one, a string namespace."""
+    # a missing namespace is stored as ""
+    return (
+        isinstance(entity, dict)
+        and isinstance(entity.get("name"), str)
+        and entity["name"] != ""
+        and isinstance(entity.get("namespace", ""), str)
+    )
+
+
+class LineageStore:
+    def __init__(self, path: Path | str = ":memory:", commit_every: int = 1000, commit_interval: float = 1.0) -> None:
+        """
+        :param path: SQLite file, created if needed; ``":memory:"`` keeps everything in memory
+        :param commit_every: writes are committed in batches of this many events...
+        :param commit_interval: ...or once the oldest uncommitted one is this many seconds old.
+            ``flush()`` and ``close()`` commit the rest.
+        """
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.commit_every = commit_every
+        self.commit_interval = commit_interval
+
+        # the HTTP server ingests from one thread per connection
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        # ingest() wraps every event in a savepoint, whose rollback journal then stays in memory
+        self._conn.execute("PRAGMA temp_store=MEMORY")
+        self._conn.executescript(_SCHEMA)
+
+        # (namespace, name) -> id, so ingesting an event doesn't look every job/dataset up in SQLite
+        self._job_ids = {(ns, name): i for i, ns, name in self._conn.execute("SELECT id, namespace, name FROM jobs")}
+        self._dataset_ids = {
+            (ns, name): i for i, ns, name in self._conn.execute("SELECT id, namespace, name FROM datasets")
+        }
+        # (job, inputs, outputs) already recorded, so repeated runs of a job skip the job_io/edge inserts
+        self._seen_io: set[tuple[int, tuple[int, ...], tuple[int, ...]]] = set()
+        # ids added by the event being ingested, forgotten again if it fails
+        self._new_ids: list[tuple[dict, tuple[str, str]]] = []
+        self._uncommitted = 0
+        self._oldest_uncommitted = 0.0
+
+    def __enter__(self) -> "LineageStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # --- writing ---
+
+    def ingest(self, event: dict | str) -> None:
+        """Store one run event, as a dict or the JSON Marquez would be POSTed."""
+        if isinstance(event, str):
+            payload, event = event, json.loads(event)
+        else:
+            payload = json.dumps(event, separators=(",", ":"))
+        # checked before anything is written, so that a bad event isn't stored in part
+        run, job, parent_run_id = _check_event(event)
+        run_id, event_type, event_time = run["runId"], event.get("eventType"), event.get("eventTime")
+        with self._lock:
+            if not self._conn.in_transaction:
+                # otherwise the savepoint would start the transaction, and releasing it would commit
+                self._conn.execute("BEGIN")
+            # an insert that fails anyway (a full disk, say) takes the rest of its event with it
+            self._conn.execute("SAVEPOINT event")
+            self._new_ids = []
+            try:
+                job_id = self._id(self._job_ids, "jobs", job.get("namespace", ""), job["name"])
+                self._conn.execute(
+                    "INSERT INTO events (run_id, event_type, event_time, payload) VALUES (?, ?, ?, ?)",
+                    (run_id, event_type, event_time, payload),
+                )
+                self._conn.execute(
+                    "INSERT INTO runs (run_id, job_id, state, started_at, ended_at, parent_run_id)"
+                    " VALUES (?, ?, ?, ?, ?, ?)"
+                    " ON CONFLICT (run_id) DO UPDATE SET"
+                    "  state = CASE WHEN runs.state IN ('COMPLETE', 'FAIL', 'ABORT') THEN runs.state"
+                    "     ELSE COALESCE(excluded.state, runs.state) END,"
+                    "  started_at = COALESCE(runs.started_at, excluded.started_at),"
+                    "  ended_at = COALESCE(excluded.ended_at, runs.ended_at),"
+                    "  parent_run_id = COALESCE(excluded.parent_run_id, runs.parent_run_id)",
+                    (
+                        run_id,
+                        job_id,
+                        event_type,
+                        event_time if event_type == "START" else None,
+                        event_time if event_type in _TERMINAL else None,
+                        parent_run_id,
+                    ),
+                )
+                inputs = tuple(self._dataset(d) for d in event.get("inputs") or ())
+                outputs = tuple(self._dataset(d) for d in event.get("outputs") or ())
+                if (job_id, inputs, outputs) not in self._seen_io:
+                    self._conn.executemany(
+                        "INSERT OR IGNORE INTO job_io VALUES (?, ?, ?)",
+                        [(job_id, d, "in") for d in inputs] + [(job_id, d, "out") for d in outputs],
+                    )
+                    self._conn.executemany(
+                        "INSERT OR IGNORE INTO dataset_edges VALUES (?, ?, ?)",
+                        [(src, dst, job_id) for src in inputs for dst in outputs],
+                    )
+                    self._seen_io.add((job_id, inputs, outputs))
+            except Exception:
+                self._conn.execute("ROLLBACK TO event")
+                self._conn.execute("RELEASE event")
+                # the rows behind these ids were rolled back
+                for ids, key in self._new_ids:
+                    del ids[key]
+                raise
+            self._conn.execute("RELEASE event")
+            self._maybe_commit()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._conn.commit()
+            self._uncommitted = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
+
+    def _id(self, ids: dict, table: str, namespace: str, name: str) -> int:
+        i = ids.get((namespace, name))
+        if i is None:
+            cursor = self._conn.execute(f"INSERT INTO {table} (namespace, name) VALUES (?, ?)", (namespace, name))
+            i = ids[namespace, name] = cursor.lastrowid
+            self._new_ids.append((ids, (namespace, name)))
+        return i
+
+    def _dataset(self, dataset: dict) -> int:
+        return self._id(self._dataset_ids, "datasets", dataset.get("namespace", ""), dataset["name"])
+
+    def _maybe_commit(self) -> None:
+        if not self._uncommitted:
+            self._oldest_uncommitted = time.monotonic()
+        self._uncommitted += 1
+        if (
+            self._uncommitted >= self.commit_every
+            or time.monotonic() - self._oldest_uncommitted >= self.commit_interval
+        ):
+            self._conn.commit()
+            self._uncommitted = 0
+
+    # --- querying ---
+
+    def _query(self, sql: str, params: tuple = ()) -> list[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            table: self._query(f"SELECT COUNT(*) FROM {table}")[0][0]
+            for table in ("events", "runs", "jobs", "datasets", "dataset_edges")
+        }
+
+    def jobs(self) -> list[tuple[str, str]]:
+        return self._query("SELECT namespace, name FROM jobs ORDER BY namespace, name")
+
+    def datasets(self) -> list[tuple[str, str]]:
+        return self._query("SELECT namespace, name FROM datasets ORDER BY namespace, name")
+
+    def job_io(self, namespace: str, name: str) -> dict[str, list[tuple[str, str]]]:
+        """Datasets the job has read (``"in"``) and written (``"out"``)."""
+        io = {"in": [], "out": []}
+        for direction, ns, ds in self._query(
+            "SELECT io.direction, d.namespace, d.name FROM job_io io"
+            " JOIN jobs j ON j.id = io.job_id JOIN datasets d ON d.id = io.dataset_id"
+            " WHERE j.namespace = ? AND j.name = ? ORDER BY d.namespace, d.name",
+            (namespace, name),
+        ):
+            io[direction].append((ns, ds))
+        return io
+
+    def all_job_io(self) -> list[tuple[str, str, str, str, str]]:
+        """Every job's reads and writes, as ``(job namespace, job name, "in"/"out", dataset namespace, dataset name)``."""
+        return self._query(
+            "SELECT j.namespace, j.name, io.direction, d.namespace, d.name FROM job_io io"
+            " JOIN jobs j ON j.id = io.job_id JOIN datasets d ON d.id = io.dataset_id"
+        )
+
+    def producers(self, namespace: str, name: str) -> list[tuple[str, str]]:
+        """Jobs that write the dataset."""
+        return self._jobs_touching(namespace, name, "out")
+
+    def consumers(self, namespace: str, name: str) -> list[tuple[str, str]]:
+        """Jobs that read the dataset."""
+        return self._jobs_touching(namespace, name, "in")
+
+    def _jobs_touching(self, namespace: str, name: str, direction: str) -> list[tuple[str, str]]:
+        return self._query(
+            "SELECT j.namespace, j.name FROM job_io io"
+            " JOIN datasets d ON d.id = io.dataset_id JOIN jobs j ON j.id = io.job_id"
+            " WHERE d.namespace = ? AND d.name = ? AND io.direction = ? ORDER BY j.namespace, j.name",
+            (namespace, name, direction),
+        )
+
+    def upstream(self, namespace: str, name: str, depth: int | None = None) -> list[tuple[str, str, int]]:
+        """Datasets ``name`` is (transitively) derived from, as ``(namespace, name, distance)``."""
+        return self._walk(namespace, name, depth, "dst", "src")
+
+    def downstream(self, namespace: str, name: str, depth: int | None = None) -> list[tuple[str, str, int]]:
+        """Datasets (transitively) derived from ``name``, as ``(namespace, name, distance)``."""
+        return self._walk(namespace, name, depth, "src", "dst")
+
+    def _walk(self, namespace: str, name: str, depth: int | None, start: str, follow: str) -> list[tuple[str, str, int]]:
+        # breadth-first, one indexed query per level: each dataset is visited once, at its shortest distance.
+        # (A recursive CTE would have to carry the distance along and revisit datasets once per path length.)
+        root = self._dataset_ids.get((namespace, name))
+        if root is None:
+            return []
+        distances = {root: 0}
+        frontier = [root]
+        distance = 0
+        while frontier and (depth is None or distance < depth):
+            distance += 1
+            found = []
+            for i in range(0, len(frontier), _MAX_PARAMS):
+                chunk = frontier[i : i + _MAX_PARAMS]
+                found += self._query(
+                    f"SELECT DISTINCT {follow} FROM dataset_edges"
+                    f" WHERE {start} IN ({', '.join('?' * len(chunk))})",
+                    tuple(chunk),
+                )
+            frontier = []
+            for (i,) in found:
+                if i not in distances:
+                    distances[i] = distance
+                    frontier.append(i)
+        del distances[root]
+
+        ids = list(distances)
+        found = []
+        for i in range(0, len(ids), _MAX_PARAMS):
+            chunk = ids[i : i + _MAX_PARAMS]
+            found += self._query(
+                f"SELECT id, namespace, name FROM datasets WHERE id IN ({', '.join('?' * len(chunk))})", tuple(chunk)
+            )
+        return sorted(((ns, ds, distances[i]) for i, ns, ds in found), key=lambda d: (d[2], d[0], d[1]))
+
+    def runs(self, namespace: str, name: str, limit: int = 100) -> list[dict]:
+        """The job's most recent runs first."""
+        rows = self._query(
+            "SELECT r.run_id, r.state, r.started_at, r.ended_at, r.parent_run_id FROM runs r"
+            " JOIN jobs j ON j.id = r.job_id WHERE j.namespace = ? AND j.name = ?"
+            " ORDER BY r.started_at DESC LIMIT ?",
+            (namespace, name, limit),
+        )
+        return [
+            dict(zip(("runId", "state", "startedAt", "endedAt", "parentRunId"), row, strict=True)) for row in rows
+        ]
+
+    def child_runs(self, run_id: str) -> list[str]:
+        return [r for (r,) in self._query("SELECT run_id FROM runs WHERE parent_run_id = ?", (run_id,))]
+
+    def events(self, run_id: str) -> list[dict]:
+        """Every event received for the run, in arrival order."""
+        return [
+            json.loads(payload)
+            for (payload,) in self._query("SELECT payload FROM events WHERE run_id = ? ORDER BY id", (run_id,))
+        ]
+
+
+@attr.s
+class StoreConfig(Config):
+    path: str = attr.ib(default="lineage.db")
+    commit_every: int = attr.ib(default=1000)
+
+    @classmethod
+    def from_dict(cls, params: dict) -> "StoreConfig":
+        return cls(**{k: v for k, v in params.items() if k in attr.fields_dict(cls)})
+
+
+class StoreTransport(Transport):
+    kind = "lineage_store"
+    config_class = StoreConfig
+
+    def __init__(self, config: StoreConfig) -> None:
+        self.config = config
+        self.store = LineageStore(config.path, commit_every=config.commit_every)
+
+    def emit(self, event) -> None:
+        self.store.ingest(Serde.to_dict(event))
+
+    def emit_json(self, payload: str) -> None:
+        """Store an event that's already been serialized to JSON."""
+        self.store.ingest(payload)
+
+    def close(self, timeout: float = -1) -> bool:
+        self.store.close()
+        return True
+
+
+def serve(store: LineageStore, host: str = "127.0.0.1", port: int = 9000):
+    """An HTTP server accepting Marquez lineage POSTs into ``store``; use it as a context manager."""
+    from openlineage_playground.mock_marquez import MockMarquezServer
+
+    def ingest(path: str, event: dict) -> None:
+        # whatever goes wrong, the event isn't stored and the connection is kept: dropping it would
+        # make the client resend the whole batch, duplicating the events that were stored
+        try:
+            store.ingest(event)
+        except ValueError as e:
+            log.warning("Ignoring event: %s", e)
+        except Exception:
+            log.exception("Couldn't store event")
+
+    return MockMarquezServer(host, port, on_event=ingest)
+
+
+def main() -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Embedded OpenLineage store")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve_cmd = commands.add_parser("serve", help="accept POST /api/v1/lineage like Marquez does")
+    serve_cmd.add_argument("db")
+    serve_cmd.add_argument("--host", default="127.0.0.1")
+    serve_cmd.add_argument("--port", type=int, default=9000)
+    stats_cmd = commands.add_parser("stats", help="how much is stored")
+    stats_cmd.add_argument("db")
+    for command in ("upstream", "downstream"):
+        walk_cmd = commands.add_parser(command, help=f"datasets {command} of a dataset")
+        walk_cmd.add_argument("db")
+        walk_cmd.add_argument("namespace")
+        walk_cmd.add_argument("name")
+        walk_cmd.add_argument("--depth", type=int, default=None)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    with LineageStore(args.db) as store:
+        if args.command == "serve":
+            with serve(store, args.host, args.port) as server:
+                print(f"accepting lineage events on {server.url}/api/v1/lineage, ctrl-c to stop")
+                try:
+                    threading.Event().wait()
+                except KeyboardInterrupt:
+                    pass
+        elif args.command == "stats":
+            print(store.stats())
+        else:
+            walk = store.upstream if args.command == "upstream" else store.downstream
+            for namespace, name, distance in walk(args.namespace, args.name, args.depth):
+                print(f"{distance:>3}  {namespace}:{name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,9 +4,6 @@ from datetime import datetime, timedelta, timezone
 from random import random
 from openlineage.client.client import OpenLineageClient, OpenLineageClientOptions
 from openlineage.client.event_v2 import (
-    Dataset,
-    InputDataset,
-    OutputDataset,
     Run,
     RunEvent,
     RunState,
@@ -14,14 +11,12 @@ from openlineage.client.event_v2 import (
 )
 from openlineage.client.facet_v2 import (
     nominal_time_run,
-    parent_run,
     sql_job,
     source_code_location_job,
-    schema_dataset,
 )
 from openlineage.client.uuid import generate_new_uuid
-from openlineage.client.serde import Serde
 import json
+from pathlib import Path
 
 # # === CONFIG ===
 PRODUCER = "https://github.com/openlineage-user"
@@ -38,9 +33,18 @@ REPO_URL = "https://github.com/your-org/pipelines/housing_regression_flow.py"
 
 
 from openlineage.client import OpenLineageClient
-from openlineage.client.transport.http import ApiKeyTokenProvider, HttpConfig, HttpCompression, HttpTransport
+from openlineage.client.transport.http import ApiKeyTokenProvider, HttpCompression
 
-http_config = HttpConfig(
+from openlineage_playground.emitter import BatchedHttpConfig, BatchedHttpTransport
+from openlineage_playground.event_factory import EventFactory
+from openlineage_playground.model_cache import ModelCache
+from openlineage_playground.schema_facets import SchemaFacetCatalog
+
+THIS_DIR = Path(__file__).parent
+
+# events are queued and sent in the background over one pooled connection;
+# client.transport.close() at the end of the script flushes whatever is left
+http_config = BatchedHttpConfig(
   url="http://localhost:9000",
   endpoint="api/v1/lineage",
   timeout=5,
@@ -49,66 +53,39 @@ http_config = HttpConfig(
   compression=HttpCompression.GZIP,
 )
 
-client = OpenLineageClient(transport=HttpTransport(http_config))
+client = OpenLineageClient(transport=BatchedHttpTransport(http_config))
 
 now = datetime.now(timezone.utc)
 parent_run_id = str(generate_new_uuid())
 
 # === Datasets ===
-house_sales = Dataset(NAMESPACE, "house_sales")
-location_info = Dataset(NAMESPACE, "location_info")
-
-cleaned_sales = Dataset(
-    NAMESPACE, "cleaned_sales",
-    facets={
-        "schema": schema_dataset.SchemaDatasetFacet(fields=[
-            schema_dataset.SchemaDatasetFacetFields("house_id", "INT"),
-            schema_dataset.SchemaDatasetFacetFields("price", "FLOAT"),
-            schema_dataset.SchemaDatasetFacetFields("sqft", "FLOAT"),
-            schema_dataset.SchemaDatasetFacetFields("bedrooms", "INT"),
-            schema_dataset.SchemaDatasetFacetFields("bathrooms", "FLOAT"),
-            # Add any other fields present in house_sales
-        ])
-    }
-)
+PREPARE_DATA_SQL = """
+    CREATE OR REPLACE TABLE cleaned_sales AS
+    SELECT * FROM house_sales WHERE price BETWEEN 10000 AND 1000000;
 
-enriched_sales = Dataset(
-    NAMESPACE, "enriched_sales",
-    facets={
-        "schema": schema_dataset.SchemaDatasetFacet(fields=[
-            schema_dataset.SchemaDatasetFacetFields("house_id", "INT"),
-            schema_dataset.SchemaDatasetFacetFields("price", "FLOAT"),
-            schema_dataset.SchemaDatasetFacetFields("sqft", "FLOAT"),
-            schema_dataset.SchemaDatasetFacetFields("bedrooms", "INT"),
-            schema_dataset.SchemaDatasetFacetFields("bathrooms", "FLOAT"),
-            schema_dataset.SchemaDatasetFacetFields("zipcode", "STRING"),
-            schema_dataset.SchemaDatasetFacetFields("school_rating", "INT"),
-            # Add any other fields present in enriched_sales
-        ])
-    }
-)
+    CREATE OR REPLACE TABLE enriched_sales AS
+    SELECT s.*, l.zipcode, l.school_rating
+    FROM cleaned_sales s
+    JOIN location_info l ON s.house_id = l.house_id;
 
-features_table = Dataset(
-    NAMESPACE, "features",
-    facets={
-        "schema": schema_dataset.SchemaDatasetFacet(fields=[
-            schema_dataset.SchemaDatasetFacetFields("sqft", "FLOAT"),
-            schema_dataset.SchemaDatasetFacetFields("bedrooms", "INT"),
-            schema_dataset.SchemaDatasetFacetFields("bathrooms", "FLOAT"),
-            schema_dataset.SchemaDatasetFacetFields("school_rating", "INT"),
-            schema_dataset.SchemaDatasetFacetFields("price", "FLOAT"),
-        ])
-    }
-)
+    CREATE OR REPLACE TABLE features AS
+    SELECT sqft, bedrooms, bathrooms, school_rating, price
+    FROM enriched_sales
+    WHERE sqft IS NOT NULL
+      AND bedrooms IS NOT NULL
+      AND bathrooms IS NOT NULL
+      AND school_rating IS NOT NULL;
+    """
 
-trained_model = Dataset(
-    NAMESPACE, "trained_model.pkl",
-    facets={"schema": schema_dataset.SchemaDatasetFacet(fields=[
-        schema_dataset.SchemaDatasetFacetFields("model_type", "STRING"),
-        schema_dataset.SchemaDatasetFacetFields("framework", "STRING"),
-        schema_dataset.SchemaDatasetFacetFields("version", "STRING")
-    ])}
-)
+# source tables and the model come from the manifest; the tables prepare_data creates
+# are derived from its SQL. Each dataset gets one shared schema facet for the whole run.
+schemas = SchemaFacetCatalog.from_manifest(THIS_DIR / "schemas.json")
+schemas.add_from_sql(PREPARE_DATA_SQL)
+
+# the model housing_pipeline.py last trained into the default cache, if it has been run: its cache
+# key versions trained_model.pkl, and the fingerprint of the features it was trained on versions
+# features. Only the entry's metadata is read; the model itself isn't unpickled.
+model_entry = ModelCache().latest(load_model=False)
 
 # === Parent Flow Job ===
 parent_job = Job(
@@ -133,98 +110,57 @@ client.emit(RunEvent(
 ))
 
 # === Steps ===
-def emit_step(step_name, inputs=None, outputs=None, sql=None, duration=5):
-    job = Job(
-        namespace=NAMESPACE,
-        name=f"{FLOW_NAME}.{step_name}",
-        facets={
-            "sql": sql_job.SQLJobFacet(query=sql) if sql else None,
-            "sourceCodeLocation": source_code_location_job.SourceCodeLocationJobFacet(type="git", url=REPO_URL)
-        }
-    )
+# Job, dataset and parent facets are serialized once; each event only splices in runId/eventTime/eventType
+factory = EventFactory(PRODUCER, NAMESPACE)
+flow_parent = factory.parent(parent_run_id, FLOW_NAME)
+
+# set to True to print every event that gets emitted
+VERBOSE = False
+
+
+def dataset(name, facets=None):
+    return factory.dataset(name, {**schemas.facets(name), **(facets or {})})
 
-    run_id = str(generate_new_uuid())
-    run_obj = Run(
-        runId=run_id,
-        facets={
-            "nominalTime": nominal_time_run.NominalTimeRunFacet(now.isoformat()),
-            "parent": parent_run.ParentRunFacet(
-                run={"runId": parent_run_id},
-                job={"namespace": NAMESPACE, "name": FLOW_NAME}
-            )
-        }
-    )
 
+def emit_run(job, inputs, outputs, parent, duration):
+    run_id = str(generate_new_uuid())
     start_time = datetime.now(timezone.utc)
     end_time = start_time + timedelta(seconds=duration)
 
-    start_event = RunEvent(
-        eventType=RunState.START,
-        eventTime=start_time.isoformat(),
-        run=run_obj,
-        job=job,
-        producer=PRODUCER,
-        inputs=inputs or [],
-        outputs=outputs or []
-    )
+    for event_type, event_time in [(RunState.START, start_time), (RunState.COMPLETE, end_time)]:
+        payload = factory.run_event(
+            event_type,
+            job,
+            run_id,
+            event_time.isoformat(),
+            inputs=inputs,
+            outputs=outputs,
+            parent=parent,
+            nominal_time=now.isoformat(),
+        )
+        if VERBOSE:
+            print(json.dumps(json.loads(payload), indent=2))
+        client.transport.emit_json(payload)
 
-    complete_event = RunEvent(
-        eventType=RunState.COMPLETE,
-        eventTime=end_time.isoformat(),
-        run=run_obj,
-        job=job,
-        producer=PRODUCER,
-        inputs=inputs or [],
-        outputs=outputs or []
+def emit_step(step_name, inputs=None, outputs=None, sql=None, duration=5):
+    job = factory.job(
+        f"{FLOW_NAME}.{step_name}",
+        facets={
+            "sql": sql_job.SQLJobFacet(query=sql) if sql else None,
+            "sourceCodeLocation": source_code_location_job.SourceCodeLocationJobFacet(type="git", url=REPO_URL)
+        }
     )
-
-    for ev in [start_event, complete_event]:
-        print(json.dumps(Serde.to_dict(ev), indent=2))
-        client.emit(ev)
+    emit_run(job, inputs or [], outputs or [], flow_parent, duration)
 
 def emit_sql_job(table_name, input_datasets, output_dataset, sql, parent_job_name, parent_run_id, duration=2):
-    job = Job(
-        namespace=NAMESPACE,
-        name=f"execute_sql.{table_name}",
+    job = factory.job(
+        f"execute_sql.{table_name}",
         facets={
             "sql": sql_job.SQLJobFacet(query=sql),
             "sourceCodeLocation": source_code_location_job.SourceCodeLocationJobFacet(type="git", url=REPO_URL)
         }
     )
-    run_id = str(generate_new_uuid())
-    run_obj = Run(
-        runId=run_id,
-        facets={
-            "nominalTime": nominal_time_run.NominalTimeRunFacet(now.isoformat()),
-            "parent": parent_run.ParentRunFacet(
-                run={"runId": parent_run_id},
-                job={"namespace": NAMESPACE, "name": parent_job_name}
-            )
-        }
-    )
-    start_time = datetime.now(timezone.utc)
-    end_time = start_time + timedelta(seconds=duration)
-    start_event = RunEvent(
-        eventType=RunState.START,
-        eventTime=start_time.isoformat(),
-        run=run_obj,
-        job=job,
-        producer=PRODUCER,
-        inputs=input_datasets,
-        outputs=[output_dataset]
-    )
-    complete_event = RunEvent(
-        eventType=RunState.COMPLETE,
-        eventTime=end_time.isoformat(),
-        run=run_obj,
-        job=job,
-        producer=PRODUCER,
-        inputs=input_datasets,
-        outputs=[output_dataset]
-    )
-    for ev in [start_event, complete_event]:
-        print(json.dumps(Serde.to_dict(ev), indent=2))
-        client.emit(ev)
+    emit_run(job, input_datasets, [output_dataset], factory.parent(parent_run_id, parent_job_name), duration)
 
 # === Emit each step ===
 
@@ -235,36 +171,20 @@ emit_step("start")
 prepare_data_run_id = str(generate_new_uuid())
 prepare_data_job_name = f"{FLOW_NAME}.prepare_data"
 emit_step("prepare_data",
-    inputs=[InputDataset(NAMESPACE, "house_sales"), InputDataset(NAMESPACE, "location_info")],
+    inputs=[dataset("house_sales"), dataset("location_info")],
     outputs=[
-        OutputDataset(NAMESPACE, "cleaned_sales", facets=cleaned_sales.facets),
-        OutputDataset(NAMESPACE, "enriched_sales", facets=enriched_sales.facets),
-        OutputDataset(NAMESPACE, "features", facets=features_table.facets)
+        dataset("cleaned_sales"),
+        dataset("enriched_sales"),
+        dataset("features")
     ],
-    sql="""
-    CREATE OR REPLACE TABLE cleaned_sales AS
-    SELECT * FROM house_sales WHERE price BETWEEN 10000 AND 1000000;
-
-    CREATE OR REPLACE TABLE enriched_sales AS
-    SELECT s.*, l.zipcode, l.school_rating
-    FROM cleaned_sales s
-    JOIN location_info l ON s.house_id = l.house_id;
-
-    CREATE OR REPLACE TABLE features AS
-    SELECT sqft, bedrooms, bathrooms, school_rating, price
-    FROM enriched_sales
-    WHERE sqft IS NOT NULL
-      AND bedrooms IS NOT NULL
-      AND bathrooms IS NOT NULL
-      AND school_rating IS NOT NULL;
-    """
+    sql=PREPARE_DATA_SQL,
 )
 
 # Sub-jobs for each CREATE statement in prepare_data
 emit_sql_job(
     table_name="cleaned_sales",
-    input_datasets=[InputDataset(NAMESPACE, "house_sales")],
-    output_dataset=OutputDataset(NAMESPACE, "cleaned_sales", facets=cleaned_sales.facets),
+    input_datasets=[dataset("house_sales")],
+    output_dataset=dataset("cleaned_sales"),
     sql="""
     CREATE OR REPLACE TABLE cleaned_sales AS
     SELECT * FROM house_sales WHERE price BETWEEN 10000 AND 1000000;
@@ -276,10 +196,10 @@ emit_sql_job(
 emit_sql_job(
     table_name="enriched_sales",
     input_datasets=[
-        InputDataset(NAMESPACE, "cleaned_sales", facets=cleaned_sales.facets),
-        InputDataset(NAMESPACE, "location_info")
+        dataset("cleaned_sales"),
+        dataset("location_info")
     ],
-    output_dataset=OutputDataset(NAMESPACE, "enriched_sales", facets=enriched_sales.facets),
+    output_dataset=dataset("enriched_sales"),
     sql="""
     CREATE OR REPLACE TABLE enriched_sales AS
     SELECT s.*, l.zipcode, l.school_rating
@@ -293,9 +213,9 @@ emit_sql_job(
 emit_sql_job(
     table_name="features",
     input_datasets=[
-        InputDataset(NAMESPACE, "enriched_sales", facets=enriched_sales.facets)
+        dataset("enriched_sales")
     ],
-    output_dataset=OutputDataset(NAMESPACE, "features", facets=features_table.facets),
+    output_dataset=dataset("features"),
     sql="""
     CREATE OR REPLACE TABLE features AS
     SELECT sqft, bedrooms, bathrooms, school_rating, price
@@ -311,8 +231,8 @@ emit_sql_job(
 
 # train_model step
 emit_step("train_model",
-    inputs=[InputDataset(NAMESPACE, "features", facets=features_table.facets)],
-    outputs=[OutputDataset(NAMESPACE, "trained_model.pkl", facets=trained_model.facets)]
+    inputs=[dataset("features", model_entry.fingerprint.facets if model_entry else None)],
+    outputs=[dataset("trained_model.pkl", model_entry.facets if model_entry else None)]
 )
 
 # end step
@@ -326,3 +246,6 @@ client.emit(RunEvent(
     job=parent_job,
     producer=PRODUCER
 ))
+
+# wait for the background worker to send everything that's still queued
+client.transport.close()
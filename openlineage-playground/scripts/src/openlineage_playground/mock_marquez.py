@@ -0,0 +1,124 @@
+"""
+A tiny stand-in for the Marquez lineage API.
+
+Accepts the same ``POST /api/v1/lineage`` payloads Marquez does (plus JSON arrays
+of events, for batch endpoints), transparently decompresses gzip bodies (and
+zstd ones, if ``zstandard`` is installed) and counts what it receives. Useful for
+benchmarking emitters without the Docker compose stack under
+``openlineage-playground/marquez``.
+
+    with MockMarquezServer(latency=0.002) as server:
+        client = OpenLineageClient(transport=HttpTransport(HttpConfig(url=server.url)))
+        ...
+        print(server.event_count)
+"""
+
+import gzip
+import json
+import threading
+import time
+from collections.abc import Callable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _LineageHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 so clients can keep connections alive between requests
+    protocol_version = "HTTP/1.1"
+    server: "_Server"
+
+    def do_POST(self) -> None:
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        encoding = self.headers.get("Content-Encoding")
+        if encoding == "gzip":
+            body = gzip.decompress(body)
+        elif encoding == "zstd":
+            import zstandard
+
+            body = zstandard.ZstdDecompressor().decompressobj().decompress(body)
+
+        mock = self.server.mock
+        if mock.latency:
+            time.sleep(mock.latency)
+
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            self._respond(400)
+            return
+
+        events = payload if isinstance(payload, list) else [payload]
+        mock._record(self.path, events, len(body))
+        self._respond(201)
+
+    def _respond(self, status: int) -> None:
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args) -> None:
+        # keep benchmark output clean
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    mock: "MockMarquezServer"
+
+
+class MockMarquezServer:
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        on_event: Callable[[str, dict], None] | None = None,
+    ) -> None:
+        """
+        :param port: 0 picks a free port; read it back from ``url``
+        :param latency: seconds to sleep per request, to emulate a remote backend
+        :param on_event: called with ``(path, event_dict)`` for every event received
+        """
+        self.latency = latency
+        self.on_event = on_event
+        self.request_count = 0
+        self.event_count = 0
+        self.bytes_received = 0
+        self._lock = threading.Lock()
+        self._httpd = _Server((host, port), _LineageHandler)
+        self._httpd.mock = self
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockMarquezServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="mock-marquez", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.request_count = self.event_count = self.bytes_received = 0
+
+    def __enter__(self) -> "MockMarquezServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _record(self, path: str, events: list[dict], n_bytes: int) -> None:
+        with self._lock:
+            self.request_count += 1
+            self.event_count += len(events)
+            self.bytes_received += n_bytes
+        if self.on_event:
+            for event in events:
+                self.on_event(path, event)
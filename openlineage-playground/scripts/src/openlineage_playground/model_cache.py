@@ -0,0 +1,243 @@
+"""
+Skip retraining a model when its feature table and hyperparameters haven't changed.
+
+A model is cached under a key derived from a fingerprint of the table it was
+trained on (row count plus a streaming hash of the rows' contents, in table
+order) and its hyperparameters. Fingerprinting reads the table once without
+fitting anything; on a hit the stored model and its metrics are returned
+instead of training again:
+
+    hasher = TableHasher("features")
+    for chunk in chunks:   # 2-D numpy arrays, e.g. from housing_pipeline
+        hasher.update(chunk)
+
+    cache = ModelCache()   # ~/.cache/openlineage_playground/models
+    entry = cache.get_or_train(hasher.fingerprint(), params, train)   # train() -> (model, {"mse": ...})
+    entry.model, entry.metrics["mse"]
+    factory.dataset("trained_model.pkl", facets=entry.facets)   # a "version" facet with the cache key
+
+The hash covers the bytes of the arrays, so it doesn't depend on how the table
+was chunked, but reordering rows changes it.
+
+Hashing means reading the whole table, which for a cheap model costs about as
+much as training on it. ``probe_table`` summarizes a SQLite table in one scan
+inside SQLite instead (about 4x cheaper), and every entry remembers the probe
+of its training data. A probe nobody has seen means the data changed, so the
+caller can train and hash in a single pass; a known probe is confirmed with the
+full hash before training is skipped, so a probe collision never returns the
+wrong model:
+
+    probe = probe_table(conn, "features", columns)
+    if cache.candidate(probe, params):
+        fingerprint = ...   # hash pass
+        entry = cache.get(cache.key(fingerprint, params))
+
+Each entry is pickled, model included, with its metadata (key, fingerprint,
+parameters, metrics) also written alongside as JSON: ``latest(load_model=False)``
+reads only that, e.g. to version the model in lineage events without
+unpickling it.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import sqlite3
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from openlineage.client.facet_v2 import dataset_version_dataset
+
+if TYPE_CHECKING:
+    import numpy as np
+
+log = logging.getLogger(__name__)
+
+# shared by housing_pipeline and log_housing_events, so not relative to where either is run from
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "openlineage_playground" / "models"
+
+
+@dataclass(frozen=True, slots=True)
+class TableFingerprint:
+    table: str
+    rows: int
+    digest: str
+
+    @property
+    def version(self) -> str:
+        return f"{self.rows}-{self.digest}"
+
+    @property
+    def facets(self) -> dict:
+        """Dataset facets identifying this version of the table."""
+        return {"version": dataset_version_dataset.DatasetVersionDatasetFacet(datasetVersion=self.version)}
+
+
+class TableHasher:
+    """Fingerprints a table fed to it a chunk at a time."""
+
+    def __init__(self, table: str) -> None:
+        self.table = table
+        self.rows = 0
+        self._hash = hashlib.blake2b(digest_size=16)
+
+    def update(self, chunk: "np.ndarray") -> None:
+        # imported here so that reading the cache's metadata, as log_housing_events does, doesn't need numpy
+        import numpy as np
+
+        self._hash.update(np.ascontiguousarray(chunk).data)
+        self.rows += len(chunk)
+
+    def fingerprint(self) -> TableFingerprint:
+        return TableFingerprint(self.table, self.rows, self._hash.hexdigest())
+
+
+def probe_table(conn: sqlite3.Connection, table: str, columns: list[str] | tuple[str, ...]) -> str:
+    """
+    A cheap summary of a table's contents: its row count and each column's total weighted by rowid.
+
+    Computed in a single scan inside SQLite, without creating a Python object per value. Equal
+    probes don't prove equal contents (hence the hash), but any added, removed, edited or
+    reordered row almost always changes it.
+    """
+    aggregates = ", ".join(f"total({c} * rowid)" for c in columns)
+    row = conn.execute(f"SELECT count(*), {aggregates} FROM {table}").fetchone()
+    return hashlib.blake2b(repr((table, row)).encode(), digest_size=16).hexdigest()
+
+
+@dataclass(frozen=True, slots=True)
+class CacheEntry:
+    key: str
+    model: Any
+    metrics: dict
+    fingerprint: TableFingerprint
+    params: dict
+    created_at: str
+    # probe_table() of the training data, if the caller probed it
+    probe: str | None = None
+    # whether this came out of the cache rather than from training just now
+    hit: bool = False
+
+    @property
+    def facets(self) -> dict:
+        """Dataset facets for the model artifact: its version is the cache key."""
+        return {"version": dataset_version_dataset.DatasetVersionDatasetFacet(datasetVersion=self.key)}
+
+
+class ModelCache:
+    def __init__(self, directory: str | Path = DEFAULT_CACHE_DIR) -> None:
+        self.directory = Path(directory)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(fingerprint: TableFingerprint, params: dict) -> str:
+        """Hash of the training data's fingerprint and the hyperparameters; values in ``params`` must be JSON-able."""
+        payload = json.dumps(
+            {"table": fingerprint.table, "version": fingerprint.version, "params": params}, sort_keys=True
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+    def path(self, key: str) -> Path:
+        return self.directory / f"{key}.pkl"
+
+    def _metadata_path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def _probe_path(self, probe: str, params: dict) -> Path:
+        digest = hashlib.sha256(json.dumps({"probe": probe, "params": params}, sort_keys=True).encode())
+        return self.directory / f"{digest.hexdigest()[:32]}.probe"
+
+    def candidate(self, probe: str, params: dict) -> str | None:
+        """Key of an entry trained with ``params`` on data that had this probe; verify with the full fingerprint."""
+        try:
+            return self._probe_path(probe, params).read_text()
+        except FileNotFoundError:
+            return None
+
+    def get(self, key: str) -> CacheEntry | None:
+        try:
+            with open(self.path(key), "rb") as f:
+                entry = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # a cache that can't be read is a miss, not a failure
+            log.warning("Ignoring unreadable cache entry %s", self.path(key), exc_info=True)
+            return None
+        return replace(entry, hit=True)
+
+    def metadata(self, key: str) -> CacheEntry | None:
+        """The entry for ``key`` without its model (``model`` is None), read from its JSON rather than unpickled."""
+        try:
+            meta = json.loads(self._metadata_path(key).read_text())
+            fingerprint = TableFingerprint(**meta["fingerprint"])
+            return CacheEntry(
+                key, None, meta["metrics"], fingerprint, meta["params"], meta["created_at"], meta["probe"], hit=True
+            )
+        except FileNotFoundError:
+            return None
+        except Exception:
+            log.warning("Ignoring unreadable cache metadata %s", self._metadata_path(key), exc_info=True)
+            return None
+
+    def put(
+        self,
+        key: str,
+        model: Any,
+        metrics: dict,
+        fingerprint: TableFingerprint,
+        params: dict,
+        probe: str | None = None,
+    ) -> CacheEntry:
+        entry = CacheEntry(key, model, metrics, fingerprint, params, datetime.now(timezone.utc).isoformat(), probe)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # write-then-rename, so a crash never leaves a half-written entry behind
+        tmp = self.path(key).with_suffix(".tmp")
+        tmp.write_bytes(pickle.dumps(entry))
+        os.replace(tmp, self.path(key))
+        meta = {
+            "key": key,
+            "metrics": metrics,
+            "fingerprint": {"table": fingerprint.table, "rows": fingerprint.rows, "digest": fingerprint.digest},
+            "params": params,
+            "created_at": entry.created_at,
+            "probe": probe,
+        }
+        tmp.write_text(json.dumps(meta, default=float))
+        os.replace(tmp, self._metadata_path(key))
+        if probe is not None:
+            self._probe_path(probe, params).write_text(key)
+        return entry
+
+    def get_or_train(
+        self,
+        fingerprint: TableFingerprint,
+        params: dict,
+        train: Callable[[], tuple[Any, dict]],
+    ) -> CacheEntry:
+        """The cached model for this data and these hyperparameters, training and caching it on a miss."""
+        key = self.key(fingerprint, params)
+        entry = self.get(key)
+        if entry is not None:
+            self.hits += 1
+            log.info("Model cache hit for %s version %s", fingerprint.table, fingerprint.version)
+            return entry
+        self.misses += 1
+        model, metrics = train()
+        return self.put(key, model, metrics, fingerprint, params)
+
+    def latest(self, load_model: bool = True) -> CacheEntry | None:
+        """The most recently trained entry, if any; without ``load_model``, only its metadata, see ``metadata``."""
+        if not self.directory.is_dir():
+            return None
+        pattern, load = ("*.pkl", self.get) if load_model else ("*.json", self.metadata)
+        paths = sorted(self.directory.glob(pattern), key=lambda p: p.stat().st_mtime, reverse=True)
+        for path in paths:
+            if (entry := load(path.stem)) is not None:
+                return entry
+        return None
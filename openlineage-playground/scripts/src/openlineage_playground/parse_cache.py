@@ -0,0 +1,165 @@
+"""
+Persistent cache of ``openlineage_sql.parse`` results.
+
+Pipelines rerun the same ``CREATE OR REPLACE`` statements over and over, so
+``ParseCache`` keeps the parsed lineage (in/out tables, column lineage) in a
+SQLite file keyed by a hash of the normalized statement, the dialect, the
+default schema and the parser version. Reruns of unchanged scripts skip parsing
+entirely.
+
+    with ParseCache(max_bytes=256 * 1024**2) as cache:
+        for lineage in extract_lineage(statements, cache=cache):
+            ...
+        print(cache.stats())
+
+The file is bounded to ``max_bytes`` of stored results; once it grows past that,
+the least recently used entries are evicted.
+"""
+
+import hashlib
+import json
+import sqlite3
+import time
+from dataclasses import asdict
+from importlib.metadata import version
+from pathlib import Path
+
+from openlineage_playground.sql_lineage import ColumnLineage, ColumnRef, StatementLineage, TableRef
+from openlineage_playground.sql_splitter import collapse_whitespace
+
+DEFAULT_CACHE_PATH = Path.home() / ".cache" / "openlineage_playground" / "parse_cache.sqlite"
+
+# a parser upgrade may change its output, so results from other versions are never reused
+_PARSER_VERSION = version("openlineage-sql")
+
+
+def normalize_sql(sql: str) -> str:
+    """
+    Collapse whitespace and drop the trailing semicolon.
+
+    Whitespace inside quotes and comments is kept as it is: ``"order id"`` and
+    ``"order  id"`` are different columns, so they mustn't share a cache entry.
+    """
+    return collapse_whitespace(sql).rstrip(";").rstrip()
+
+
+def cache_key(sql: str, dialect: str, default_schema: str | None) -> str:
+    raw = "\0".join((_PARSER_VERSION, dialect, default_schema or "", normalize_sql(sql)))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _table(d: dict | None) -> TableRef | None:
+    return TableRef(**d) if d else None
+
+
+class ParseCache:
+    def __init__(self, path: Path | str = DEFAULT_CACHE_PATH, max_bytes: int = 256 * 1024**2, commit_every: int = 500):
+        """
+        :param max_bytes: upper bound on the size of the stored results
+        :param commit_every: writes are committed in batches of this many; ``close()`` commits the rest
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.commit_every = commit_every
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS parse_cache ("
+            " key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS parse_cache_last_used ON parse_cache (last_used)")
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM parse_cache").fetchone()[0]
+        self._uncommitted = 0
+
+    def get(self, index: int, sql: str, dialect: str, default_schema: str | None) -> StatementLineage | None:
+        key = cache_key(sql, dialect, default_schema)
+        row = self._conn.execute("SELECT value FROM parse_cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._conn.execute("UPDATE parse_cache SET last_used = ? WHERE key = ?", (time.time(), key))
+        self._maybe_commit()
+        value = json.loads(row[0])
+        return StatementLineage(
+            index=index,
+            sql=sql,
+            in_tables=tuple(_table(t) for t in value["in_tables"]),
+            out_tables=tuple(_table(t) for t in value["out_tables"]),
+            column_lineage=tuple(
+                ColumnLineage(
+                    descendant=cl["descendant"],
+                    sources=tuple(ColumnRef(table=_table(src["table"]), name=src["name"]) for src in cl["sources"]),
+                )
+                for cl in value["column_lineage"]
+            ),
+            errors=tuple(value["errors"]),
+            # nothing was parsed
+            elapsed=0.0,
+        )
+
+    def put(self, lineage: StatementLineage, dialect: str, default_schema: str | None) -> None:
+        key = cache_key(lineage.sql, dialect, default_schema)
+        value = json.dumps(
+            {
+                "in_tables": [asdict(t) for t in lineage.in_tables],
+                "out_tables": [asdict(t) for t in lineage.out_tables],
+                "column_lineage": [asdict(cl) for cl in lineage.column_lineage],
+                "errors": list(lineage.errors),
+            },
+            separators=(",", ":"),
+        ).encode("utf-8")
+
+        old = self._conn.execute("SELECT size FROM parse_cache WHERE key = ?", (key,)).fetchone()
+        self._conn.execute(
+            "INSERT OR REPLACE INTO parse_cache (key, value, size, last_used) VALUES (?, ?, ?, ?)",
+            (key, value, len(value), time.time()),
+        )
+        self._total_bytes += len(value) - (old[0] if old else 0)
+        if self._total_bytes > self.max_bytes:
+            self._evict()
+        self._maybe_commit()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "bytes": self._total_bytes,
+        }
+
+    def close(self) -> None:
+        self._conn.commit()
+        self._conn.close()
+
+    def __enter__(self) -> "ParseCache":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _evict(self) -> None:
+        # evict down to 90% of the budget so we don't evict again on the very next put
+        target = self.max_bytes * 0.9
+        rows = self._conn.execute("SELECT key, size FROM parse_cache ORDER BY last_used")
+        evicted = []
+        for key, size in rows:
+            if self._total_bytes <= target:
+                break
+            evicted.append((key,))
+            self._total_bytes -= size
+        self._conn.executemany("DELETE FROM parse_cache WHERE key = ?", evicted)
+        self.evictions += len(evicted)
+
+    def _maybe_commit(self) -> None:
+        self._uncommitted += 1
+        if self._uncommitted >= self.commit_every:
+            self._conn.commit()
+            self._uncommitted = 0
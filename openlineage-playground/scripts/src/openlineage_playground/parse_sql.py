@@ -28,6 +28,8 @@ PRODUCER = "https://github.com/openlineage-user"
 NAMESPACE = "parse_sql"
 FLOW_NAME = "housing_regression_flow"
 REPO_URL = "https://github.com/your-org/pipelines/housing_regression_flow.py"
+DIALECT = "snowflake"
+DEFAULT_SCHEMA = "PATTERN_DB.DATA_SCIENCE_STAGE"
 # API_URL = "http://localhost:9000"
 # API_KEY = None
 
@@ -38,9 +40,13 @@ REPO_URL = "https://github.com/your-org/pipelines/housing_regression_flow.py"
 
 
 from openlineage.client import OpenLineageClient
-from openlineage.client.transport.http import ApiKeyTokenProvider, HttpConfig, HttpCompression, HttpTransport
+from openlineage.client.transport.http import ApiKeyTokenProvider, HttpCompression
 
-http_config = HttpConfig(
+from openlineage_playground.emitter import BatchedHttpConfig, BatchedHttpTransport
+
+# events are queued and sent in the background over one pooled connection;
+# client.transport.close() at the end of the script flushes whatever is left
+http_config = BatchedHttpConfig(
   url="http://localhost:9000",
   endpoint="api/v1/lineage",
   timeout=5,
@@ -49,136 +55,165 @@ http_config = HttpConfig(
   compression=HttpCompression.GZIP,
 )
 
-client = OpenLineageClient(transport=HttpTransport(http_config))
-
 
-
-from openlineage_sql import parse
+from openlineage_playground.column_lineage import ColumnLineageBuilder
+from openlineage_playground.lineage_graph import LineageGraph
+from openlineage_playground.parse_cache import DEFAULT_CACHE_PATH, ParseCache
+from openlineage_playground.sql_lineage import extract_lineage
+from openlineage_playground.sql_splitter import iter_statements
 
 # from rich import print
 
+import argparse
+import heapq
+import time
+from itertools import islice
 from pathlib import Path
 
-import sqlglot
-
 THIS_DIR = Path(__file__).parent
 
 BIG_SQL_FPATH = THIS_DIR / "big.sql"
-BIG_SQL_SCRIPT = BIG_SQL_FPATH.read_text()
 
-statements = [stmt.sql() for stmt in sqlglot.parse(BIG_SQL_SCRIPT, read="snowflake")]
 
-parent_run_id = str(generate_new_uuid())
-parent_job = Job(namespace=NAMESPACE, name="big_sql_query")
-parent_run_obj = Run(runId=parent_run_id)
+def main():
+    parser = argparse.ArgumentParser(description="Emit one lineage sub-job per statement of a SQL script")
+    parser.add_argument("--sql-file", type=Path, default=BIG_SQL_FPATH)
+    parser.add_argument("--limit", type=int, default=8, help="only emit the first N statements")
+    parser.add_argument("--workers", type=int, default=None, help="parser processes (default: one per core, 1 = no pool)")
+    parser.add_argument("--cache", type=Path, default=DEFAULT_CACHE_PATH, help="where to keep parsed statements between runs")
+    parser.add_argument("--no-cache", action="store_true", help="always reparse every statement")
+    args = parser.parse_args()
 
-# Emit parent START event
-parent_start_event = RunEvent(
-    eventType=RunState.START,
-    eventTime=datetime.now(timezone.utc).isoformat(),
-    run=parent_run_obj,
-    job=parent_job,
-    producer=PRODUCER,
-)
-print(json.dumps(Serde.to_dict(parent_start_event), indent=2))
-client.emit(parent_start_event)
-
-# Helper for parent facet (define inline, not as import)
-def make_parent_facet(parent_run_id, parent_namespace, parent_name):
-    return {
-        "parent": {
-            "run": {"runId": parent_run_id},
-            "job": {"namespace": parent_namespace, "name": parent_name}
-        }
-    }
-
-for i, stmt in enumerate(statements[:8]):
-    sql_meta = parse(sql=[stmt], dialect="snowflake", default_schema="PATTERN_DB.DATA_SCIENCE_STAGE")
-
-    # Extract input and output tables from sql_meta
-    input_datasets = [
-        InputDataset(
-            namespace=NAMESPACE,
-            name=tbl.name,
-        )
-        for tbl in getattr(sql_meta, "in_tables", [])
-    ]
-    output_datasets = [
-        OutputDataset(
-            namespace=NAMESPACE,
-            name=tbl.name
-        )
-        for tbl in getattr(sql_meta, "out_tables", [])
-    ]
-
-    # Extract column lineage if available
-    column_lineage = []
-    for cl in getattr(sql_meta, "column_lineage", []):
-        descendant = getattr(cl, "descendant", None)
-        descendant_name = descendant.name if descendant else None
-        sources = [src.name for src in getattr(cl, "lineage", [])]
-        column_lineage.append({"descendant": descendant_name, "sources": sources})
-
-    # Set run facets as plain dicts, as in log_housing_events.py
-    run_facets = {}
-    if column_lineage:
-        run_facets["columnLineage"] = {"fields": column_lineage}
-    run_facets["parent"] = {
-        "run": {"runId": parent_run_id},
-        "job": {"namespace": NAMESPACE, "name": "big_sql_query"}
-    }
-
-    run_id = str(generate_new_uuid())
-    run_obj = Run(
-        runId=run_id,
-        facets={
-            "nominalTime": nominal_time_run.NominalTimeRunFacet(datetime.now(timezone.utc).isoformat()),
-            "parent": parent_run_facet.ParentRunFacet(
-                run={"runId": parent_run_id},
-                job={"namespace": NAMESPACE, "name": "big_sql_query"}
-            )
-        }
-    )
+    # created here rather than at import time: the parser pool may re-import this module in its workers
+    client = OpenLineageClient(transport=BatchedHttpTransport(http_config))
 
-    job = Job(
-        namespace=NAMESPACE,
-        name=f"script.sql.{i}",
-        facets={},
-    )
-    # Emit START event for sub-job
-    start_event = RunEvent(
+    # statements are read from the file lazily, as the parser pool asks for them
+    statements = iter_statements(args.sql_file)
+
+    parent_run_id = str(generate_new_uuid())
+    parent_job = Job(namespace=NAMESPACE, name="big_sql_query")
+    parent_run_obj = Run(runId=parent_run_id)
+
+    # Emit parent START event
+    parent_start_event = RunEvent(
         eventType=RunState.START,
         eventTime=datetime.now(timezone.utc).isoformat(),
-        run=run_obj,
-        job=job,
+        run=parent_run_obj,
+        job=parent_job,
         producer=PRODUCER,
-        inputs=input_datasets,
-        outputs=output_datasets,
     )
-    # print(json.dumps(Serde.to_dict(start_event), indent=2))
-    # client.emit(start_event)  # Comment out or remove this line to avoid 422 errors
+    print(json.dumps(Serde.to_dict(parent_start_event), indent=2))
+    client.emit(parent_start_event)
+
+    cache = None if args.no_cache else ParseCache(args.cache)
+
+    parse_start = time.perf_counter()
+    # only the slowest few statements are kept, so memory doesn't grow with the script
+    n_statements, total_parse_time, slowest = 0, 0.0, []
+    # table-to-table dependencies across the whole script, built up as statements are parsed
+    graph = LineageGraph()
+    # columns seen so far per table, so unqualified source columns in later statements can be resolved
+    column_lineage = ColumnLineageBuilder(NAMESPACE, dataset_name=lambda tbl: tbl.name)
+    for sql_meta in extract_lineage(
+        islice(statements, args.limit),
+        dialect=DIALECT,
+        default_schema=DEFAULT_SCHEMA,
+        workers=args.workers,
+        cache=cache,
+    ):
+        i = sql_meta.index
+        n_statements += 1
+        total_parse_time += sql_meta.elapsed
+        if len(slowest) < 5:
+            heapq.heappush(slowest, (sql_meta.elapsed, i))
+        else:
+            heapq.heappushpop(slowest, (sql_meta.elapsed, i))
+        graph.add_statement(
+            f"script.sql.{i}",
+            [tbl.qualified_name for tbl in sql_meta.in_tables],
+            [tbl.qualified_name for tbl in sql_meta.out_tables],
+        )
+
+        # Extract input and output tables from sql_meta
+        input_datasets = [
+            InputDataset(
+                namespace=NAMESPACE,
+                name=tbl.name,
+            )
+            for tbl in sql_meta.in_tables
+        ]
+        # column lineage goes on the output dataset, where Marquez shows it
+        column_lineage_facet = column_lineage.facet(sql_meta)
+        output_datasets = [
+            OutputDataset(
+                namespace=NAMESPACE,
+                name=tbl.name,
+                facets={"columnLineage": column_lineage_facet} if column_lineage_facet else {},
+            )
+            for tbl in sql_meta.out_tables
+        ]
+
+        run_id = str(generate_new_uuid())
+        run_obj = Run(
+            runId=run_id,
+            facets={
+                "nominalTime": nominal_time_run.NominalTimeRunFacet(datetime.now(timezone.utc).isoformat()),
+                "parent": parent_run_facet.ParentRunFacet(
+                    run={"runId": parent_run_id},
+                    job={"namespace": NAMESPACE, "name": "big_sql_query"}
+                )
+            }
+        )
+
+        job = Job(
+            namespace=NAMESPACE,
+            name=f"script.sql.{i}",
+            facets={},
+        )
+        # Emit COMPLETE event for sub-job
+        complete_event = RunEvent(
+            eventType=RunState.COMPLETE,
+            eventTime=datetime.now(timezone.utc).isoformat(),
+            run=run_obj,
+            job=job,
+            producer=PRODUCER,
+            inputs=input_datasets,
+            outputs=output_datasets,
+        )
+        # print(json.dumps(Serde.to_dict(complete_event), indent=2))
+        client.emit(complete_event)
+
+    # per-statement parse timings: total CPU spent parsing vs. wall time, and the worst offenders
+    wall = time.perf_counter() - parse_start
+    print(f"parsed {n_statements} statements in {wall:.2f}s wall, {total_parse_time:.2f}s parse time")
+    for elapsed, i in sorted(slowest, reverse=True):
+        print(f"  script.sql.{i}: {elapsed * 1000:.1f} ms")
+    print(
+        f"lineage graph: {len(graph)} datasets, {graph.edge_count} dependencies, "
+        f"{len(graph.job_levels())} waves of statements"
+    )
+    print(
+        f"column lineage: {len(column_lineage.catalog)} tables in the schema catalog, "
+        f"{column_lineage.unresolved} source columns left unresolved"
+    )
+    if cache:
+        print(f"parse cache: {cache.stats()}")
+        cache.close()
 
-    # Emit COMPLETE event for sub-job
-    complete_event = RunEvent(
+    # Emit parent COMPLETE event
+    parent_complete_event = RunEvent(
         eventType=RunState.COMPLETE,
         eventTime=datetime.now(timezone.utc).isoformat(),
-        run=run_obj,
-        job=job,
+        run=parent_run_obj,
+        job=parent_job,
         producer=PRODUCER,
-        inputs=input_datasets,
-        outputs=output_datasets,
     )
-    # print(json.dumps(Serde.to_dict(complete_event), indent=2))
-    client.emit(complete_event)
-
-# Emit parent COMPLETE event
-parent_complete_event = RunEvent(
-    eventType=RunState.COMPLETE,
-    eventTime=datetime.now(timezone.utc).isoformat(),
-    run=parent_run_obj,
-    job=parent_job,
-    producer=PRODUCER,
-)
-# print(json.dumps(Serde.to_dict(parent_complete_event), indent=2))
-client.emit(parent_complete_event)
+    # print(json.dumps(Serde.to_dict(parent_complete_event), indent=2))
+    client.emit(parent_complete_event)
+
+    # wait for the background worker to send everything that's still queued
+    client.transport.close()
+
 
+if __name__ == "__main__":
+    main()
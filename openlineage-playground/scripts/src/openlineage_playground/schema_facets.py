@@ -0,0 +1,203 @@
+"""
+Dataset schemas, loaded once and shared as ``SchemaDatasetFacet``s.
+
+The scripts used to spell out ``SchemaDatasetFacetFields`` lists by hand for
+every dataset, and ``generate_events.py`` rebuilt the same ``user_history``
+schema on every loop iteration. ``SchemaFacetCatalog`` loads schemas from a
+manifest, or derives them from ``CREATE TABLE ... AS SELECT`` statements over
+tables it already knows, and hands out one facet object per dataset:
+
+    schemas = SchemaFacetCatalog.from_manifest(THIS_DIR / "schemas.json")
+    schemas.add_from_sql(PREPARE_DATA_SQL)      # cleaned_sales, enriched_sales, features
+    factory.dataset("features", schemas.facets("features"))
+
+The facets and ``{"schema": facet}`` dicts handed out are shared, so treat them
+as read-only. Sharing also makes the ``facets`` comparisons ``EventFactory``
+does on every ``dataset()`` call identity checks. Each schema's JSON is
+serialized once, too (``schemas.get(name).json``).
+
+A manifest maps dataset names to their columns, either as ``{"column": "TYPE"}``
+or as a list of ``{"name", "type", "description"}`` objects. JSON works out of
+the box; ``.yaml``/``.yml`` manifests need PyYAML installed.
+"""
+
+import json
+import logging
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from pathlib import Path
+
+from openlineage.client.facet_v2 import schema_dataset
+from openlineage.client.serde import Serde
+
+from openlineage_playground.column_lineage import SchemaCatalog
+from openlineage_playground.sql_splitter import split_statements
+
+log = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class DatasetSchema:
+    name: str
+    facet: schema_dataset.SchemaDatasetFacet
+    # {"schema": facet}, ready to pass as a dataset's facets
+    facets: dict
+    # Serde.to_json(facet)
+    json: str
+    # lowercased column name -> field
+    by_column: dict
+
+    @property
+    def columns(self) -> list[str]:
+        return [f.name for f in self.facet.fields]
+
+    def field(self, column: str) -> schema_dataset.SchemaDatasetFacetFields | None:
+        return self.by_column.get(column.lower())
+
+
+def _field(spec) -> schema_dataset.SchemaDatasetFacetFields:
+    if isinstance(spec, schema_dataset.SchemaDatasetFacetFields):
+        return spec
+    if isinstance(spec, Mapping):
+        return schema_dataset.SchemaDatasetFacetFields(
+            name=spec["name"], type=spec.get("type"), description=spec.get("description")
+        )
+    name, type_ = spec
+    return schema_dataset.SchemaDatasetFacetFields(name=name, type=type_)
+
+
+class SchemaFacetCatalog:
+    def __init__(self) -> None:
+        self._schemas: dict[str, DatasetSchema] = {}
+        # lowercased name -> name, since SQL dialects normalize identifier case
+        self._names: dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._schemas)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._schemas
+
+    @classmethod
+    def from_manifest(cls, path: str | Path) -> "SchemaFacetCatalog":
+        catalog = cls()
+        catalog.load_manifest(path)
+        return catalog
+
+    def load_manifest(self, path: str | Path) -> None:
+        path = Path(path)
+        if path.suffix in (".yaml", ".yml"):
+            try:
+                import yaml
+            except ImportError:
+                raise RuntimeError(f"PyYAML is needed to read {path}; install it or use a JSON manifest") from None
+            manifest = yaml.safe_load(path.read_text())
+        else:
+            manifest = json.loads(path.read_text())
+        for name, columns in manifest.items():
+            self.add(name, columns.items() if isinstance(columns, Mapping) else columns)
+
+    def add(self, name: str, fields: Iterable) -> DatasetSchema:
+        """
+        Register (or replace) the schema of ``name``.
+
+        :param fields: ``SchemaDatasetFacetFields``, ``{"name", "type", "description"}`` dicts
+            or ``(name, type)`` pairs
+        """
+        facet = schema_dataset.SchemaDatasetFacet(fields=[_field(f) for f in fields])
+        by_column = {f.name.lower(): f for f in reversed(facet.fields)}
+        schema = self._schemas[name] = DatasetSchema(name, facet, {"schema": facet}, Serde.to_json(facet), by_column)
+        self._names[name.lower()] = name
+        return schema
+
+    def get(self, name: str) -> DatasetSchema | None:
+        return self._schemas.get(name)
+
+    def facet(self, name: str) -> schema_dataset.SchemaDatasetFacet | None:
+        schema = self._schemas.get(name)
+        return schema.facet if schema else None
+
+    def facets(self, name: str) -> dict:
+        """``{"schema": facet}`` for ``name``, or ``{}`` if its schema isn't known."""
+        schema = self._schemas.get(name)
+        return schema.facets if schema else {}
+
+    def column_catalog(self) -> SchemaCatalog:
+        """The known columns, to seed a ``ColumnLineageBuilder`` with."""
+        catalog = SchemaCatalog()
+        for name, schema in self._schemas.items():
+            catalog.add_table(name, schema.columns)
+        return catalog
+
+    def add_from_sql(self, sql: str, dialect: str = "snowflake") -> list[DatasetSchema]:
+        """
+        Derive the schema of every table created by a ``CREATE TABLE ... AS SELECT`` in ``sql``.
+
+        Statements are handled in order, so a table created early in the script can feed a
+        later one. ``*`` is expanded from the known schemas; columns passed through unchanged
+        keep their source's type and description, computed ones get the type sqlglot infers.
+        Statements over tables with unknown schemas are skipped.
+        """
+        import sqlglot
+        from sqlglot import exp
+        from sqlglot.errors import SqlglotError
+        from sqlglot.optimizer.annotate_types import annotate_types
+        from sqlglot.optimizer.qualify import qualify
+        from sqlglot.schema import MappingSchema
+
+        def columns(schema: DatasetSchema) -> dict[str, str]:
+            return {f.name: f.type or "UNKNOWN" for f in schema.facet.fields}
+
+        known = MappingSchema({n: columns(s) for n, s in self._schemas.items()}, dialect=dialect)
+        added = []
+        for statement in split_statements(sql):
+            try:
+                create = sqlglot.parse_one(statement, dialect=dialect)
+            except SqlglotError:
+                continue
+            if not isinstance(create, exp.Create) or not isinstance(create.expression, exp.Query):
+                continue
+            name = create.this.find(exp.Table).name
+            query = create.expression
+            # the spelling columns were written with, before the dialect normalizes them
+            spelling = {s.alias_or_name.lower(): s.alias_or_name for s in query.selects}
+
+            try:
+                query = annotate_types(
+                    qualify(query.copy(), schema=known, dialect=dialect, quote_identifiers=False),
+                    schema=known,
+                    dialect=dialect,
+                )
+            except SqlglotError as e:
+                log.debug("Can't derive the schema of %s: %s", name, e)
+                continue
+            if any(select.is_star for select in query.selects):
+                # SELECT * over a table we know nothing about
+                log.debug("Can't derive the schema of %s: unknown columns behind *", name)
+                continue
+
+            aliases = {t.alias_or_name.lower(): t.name for t in query.find_all(exp.Table)}
+            fields = []
+            for select in query.selects:
+                column = select.unalias()
+                source = None
+                if isinstance(column, exp.Column):
+                    source = self._source_field(aliases.get(column.table.lower()), column.name)
+                if source is not None and source.name.lower() == select.alias_or_name.lower():
+                    fields.append(source)
+                else:
+                    fields.append(
+                        schema_dataset.SchemaDatasetFacetFields(
+                            name=spelling.get(select.alias_or_name.lower(), select.alias_or_name.lower()),
+                            type=select.type.sql(dialect) if select.type and not select.is_type("unknown") else None,
+                        )
+                    )
+            schema = self.add(name, fields)
+            known.add_table(name, columns(schema))
+            added.append(schema)
+        return added
+
+    def _source_field(self, table: str | None, column: str) -> schema_dataset.SchemaDatasetFacetFields | None:
+        # table names come back normalized by the dialect; the catalog keeps them as written
+        schema = self._schemas.get(self._names.get(table.lower(), "")) if table else None
+        return schema.field(column) if schema else None
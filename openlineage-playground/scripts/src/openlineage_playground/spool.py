@@ -0,0 +1,238 @@
+"""
+Durable local spool for lineage events, for when Marquez is slow or down.
+
+``SpoolTransport`` appends each event as one JSON line to a segmented log on
+local disk and returns immediately; writes are fsynced in batches (every
+``fsync_every`` events or ``fsync_interval`` seconds, whichever comes first).
+Pipelines never wait on, or fail because of, the lineage backend:
+
+    client = OpenLineageClient(transport=SpoolTransport(SpoolConfig(directory=".lineage-spool")))
+
+``SpoolReplayer`` drains the spool to Marquez separately, e.g. from a cron job
+or another process, with bounded concurrency. It records how far it got in a
+checkpoint file and picks up from there next time:
+
+    SpoolReplayer(".lineage-spool", HttpConfig(url="http://localhost:9000")).drain()
+
+Layout of the spool directory::
+
+    segment-000000000001.ndjson   # one event per line
+    segment-000000000002.ndjson   # the writer rolls over past segment_bytes
+    checkpoint.json               # {"segment": 2, "offset": 12345}: everything before was delivered
+"""
+
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+import attr
+from openlineage.client.serde import Serde
+from openlineage.client.transport.http import HttpConfig
+from openlineage.client.transport.transport import Config, Transport
+
+from openlineage_playground.replay import ReplaySender, ReplayStats
+
+log = logging.getLogger(__name__)
+
+SEGMENT_GLOB = "segment-*.ndjson"
+CHECKPOINT_FILE = "checkpoint.json"
+
+
+def segment_path(directory: Path, seq: int) -> Path:
+    return directory / f"segment-{seq:012d}.ndjson"
+
+
+def list_segments(directory: Path) -> list[tuple[int, Path]]:
+    return sorted((int(p.stem.split("-")[1]), p) for p in directory.glob(SEGMENT_GLOB))
+
+
+@attr.s
+class SpoolConfig(Config):
+    directory: str = attr.ib()
+    # roll over to a new segment file once the current one is this big
+    segment_bytes: int = attr.ib(default=64 * 1024**2)
+    # fsync after this many events...
+    fsync_every: int = attr.ib(default=100)
+    # ...or once the oldest unsynced event is this many seconds old
+    fsync_interval: float = attr.ib(default=0.2)
+
+    @classmethod
+    def from_dict(cls, params: dict) -> "SpoolConfig":
+        if "directory" not in params:
+            raise RuntimeError("`directory` key not passed to SpoolConfig")
+        return cls(**{k: v for k, v in params.items() if k in attr.fields_dict(cls)})
+
+
+class SpoolTransport(Transport):
+    kind = "spool"
+    config_class = SpoolConfig
+
+    def __init__(self, config: SpoolConfig) -> None:
+        self.config = config
+        self.directory = Path(config.directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        # always start a fresh segment; a previous writer may have crashed mid-line in the last one
+        segments = list_segments(self.directory)
+        self._seq = segments[-1][0] + 1 if segments else 1
+        self._file = open(segment_path(self.directory, self._seq), "ab")
+        self._unsynced = 0
+        self._oldest_unsynced = 0.0
+
+        self._closed = threading.Event()
+        self._syncer = threading.Thread(target=self._sync_periodically, name="openlineage-spool-fsync", daemon=True)
+        self._syncer.start()
+        atexit.register(self.close)
+
+    def emit(self, event) -> None:
+        self.emit_json(Serde.to_json(event))
+
+    def emit_json(self, payload: str) -> None:
+        """Append an event that's already been serialized to JSON."""
+        line = payload.encode("utf-8") + b"\n"
+        with self._lock:
+            if self._closed.is_set():
+                raise RuntimeError("SpoolTransport is closed")
+            if self._file.tell() + len(line) > self.config.segment_bytes and self._file.tell() > 0:
+                self._roll_over()
+            self._file.write(line)
+            if not self._unsynced:
+                self._oldest_unsynced = time.monotonic()
+            self._unsynced += 1
+            if self._unsynced >= self.config.fsync_every:
+                self._sync()
+
+    def flush(self) -> None:
+        """fsync everything written so far."""
+        with self._lock:
+            self._sync()
+
+    def close(self, timeout: float = -1) -> bool:
+        with self._lock:
+            if not self._closed.is_set():
+                self._closed.set()
+                self._sync()
+                self._file.close()
+                atexit.unregister(self.close)
+        return True
+
+    def _sync(self) -> None:
+        # callers hold self._lock
+        if self._unsynced:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+
+    def _roll_over(self) -> None:
+        self._sync()
+        self._file.close()
+        self._seq += 1
+        self._file = open(segment_path(self.directory, self._seq), "ab")
+
+    def _sync_periodically(self) -> None:
+        while not self._closed.wait(self.config.fsync_interval):
+            with self._lock:
+                if self._unsynced and time.monotonic() - self._oldest_unsynced >= self.config.fsync_interval:
+                    self._sync()
+
+
+class SpoolReplayer:
+    def __init__(
+        self,
+        directory: str | Path,
+        http_config: HttpConfig,
+        concurrency: int = 4,
+        delete_drained: bool = True,
+    ) -> None:
+        """
+        :param concurrency: requests in flight at once; events of one run are still sent in order
+        :param delete_drained: remove segments once every event in them has been delivered
+        """
+        self.directory = Path(directory)
+        self.delete_drained = delete_drained
+        self.sender = ReplaySender(http_config, concurrency=concurrency)
+
+    @property
+    def checkpoint_path(self) -> Path:
+        return self.directory / CHECKPOINT_FILE
+
+    def read_checkpoint(self) -> tuple[int, int]:
+        try:
+            checkpoint = json.loads(self.checkpoint_path.read_text())
+        except FileNotFoundError:
+            return 0, 0
+        return checkpoint["segment"], checkpoint["offset"]
+
+    def write_checkpoint(self, position: tuple[int, int]) -> None:
+        # write-then-rename, so a crash never leaves a half-written checkpoint behind
+        tmp = self.checkpoint_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"segment": position[0], "offset": position[1]}))
+        os.replace(tmp, self.checkpoint_path)
+
+    def drain(self) -> ReplayStats:
+        """Send everything spooled since the checkpoint, then move the checkpoint past it."""
+        stats = self.sender.run(self._records(), commit=self.write_checkpoint)
+        if self.delete_drained:
+            self._delete_drained_segments()
+        return stats
+
+    def _records(self):
+        start_seq, start_offset = self.read_checkpoint()
+        segments = list_segments(self.directory)
+        for i, (seq, path) in enumerate(segments):
+            if seq < start_seq:
+                continue
+            is_last = i == len(segments) - 1
+            with open(path, "rb") as f:
+                offset = start_offset if seq == start_seq else 0
+                f.seek(offset)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        # a writer is still appending to the last segment (or crashed mid-line); stop before it
+                        if not is_last:
+                            log.warning("Skipping truncated event at %s:%d", path.name, offset)
+                        break
+                    offset += len(line)
+                    if line.strip():
+                        yield (seq, offset), line.decode("utf-8")
+
+    def _delete_drained_segments(self) -> None:
+        checkpoint_seq, _ = self.read_checkpoint()
+        # the newest segment may still be written to, so it's never deleted
+        for seq, path in list_segments(self.directory)[:-1]:
+            if seq < checkpoint_seq:
+                path.unlink()
+
+
+def main() -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Drain a lineage spool directory to Marquez")
+    parser.add_argument("directory")
+    parser.add_argument("--url", default="http://localhost:9000")
+    parser.add_argument("--endpoint", default="api/v1/lineage")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--keep", action="store_true", help="don't delete drained segments")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    replayer = SpoolReplayer(
+        args.directory,
+        HttpConfig(url=args.url, endpoint=args.endpoint),
+        concurrency=args.concurrency,
+        delete_drained=not args.keep,
+    )
+    stats = replayer.drain()
+    print(
+        f"sent {stats.sent}, rejected {stats.rejected}, failed {stats.failed} "
+        f"in {stats.elapsed:.2f}s ({stats.events_per_sec:,.0f} events/s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
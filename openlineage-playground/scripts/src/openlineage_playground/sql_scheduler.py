@@ -0,0 +1,258 @@
+"""
+Run the statements of a SQL script concurrently wherever their lineage allows.
+
+``executescript`` runs a script one statement at a time, even when statements
+don't touch each other's tables. ``SQLScheduler`` parses every statement's
+input and output tables, builds the dependency DAG with ``LineageGraph`` (a
+statement waits for the last writer of each table it reads, and for every
+earlier reader and writer of the tables it writes), and runs statements on a
+pool of connections as soon as everything they depend on has finished. Each
+statement that writes a table is emitted as an ``execute_sql.<table>`` sub-job
+with the time it actually started and finished:
+
+    scheduler = SQLScheduler(
+        lambda: sqlite3.connect("housing.db", timeout=600), workers=4, transport=transport, namespace="house_regression"
+    )
+    runs = scheduler.run(PREPARE_DATA_SQL)
+    scheduler.plan(PREPARE_DATA_SQL)   # the DAG without running anything
+
+Statements without tables are handled conservatively: ``CREATE INDEX`` counts as
+writing its table (so the statements reading it wait for the index), and
+anything else lineage can't see into (``PRAGMA``, ``ANALYZE``, statements that
+fail to parse) runs on its own, after everything before it and before
+everything after it.
+
+Each worker thread has its own connection and commits after every statement,
+so transaction control in the script (``BEGIN``, ``COMMIT``, ...) is dropped:
+a script that relied on it for atomicity isn't atomic when scheduled. When a
+statement fails, nothing new is started, the running statements finish, and the
+error is raised.
+
+How much this gains depends on the database. A warehouse runs independent
+statements side by side; SQLite allows one writer at a time, so writing
+statements still take turns and only their reads overlap (set a lock
+``timeout`` on the connections so they wait for each other).
+"""
+
+import logging
+import queue
+import re
+import threading
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from openlineage.client.event_v2 import RunState
+from openlineage.client.facet_v2 import sql_job
+from openlineage.client.transport.transport import Transport
+from openlineage.client.uuid import generate_new_uuid
+
+from openlineage_playground.event_factory import EventFactory
+from openlineage_playground.lineage_graph import LineageGraph
+from openlineage_playground.schema_facets import SchemaFacetCatalog
+from openlineage_playground.sql_lineage import StatementLineage, parse_statement
+from openlineage_playground.sql_splitter import split_statements
+
+log = logging.getLogger(__name__)
+
+PRODUCER = "https://github.com/openlineage-user"
+
+_TRANSACTION_CONTROL = {"BEGIN", "COMMIT", "END", "ROLLBACK", "SAVEPOINT", "RELEASE", "START"}
+_CREATE_INDEX = re.compile(
+    r"CREATE\s+(?:UNIQUE\s+)?INDEX\s+(?:IF\s+NOT\s+EXISTS\s+)?\S+\s+ON\s+([\w.\"`\[\]]+)", re.IGNORECASE
+)
+# a dataset every statement reads and table-less statements write, which turns those into barriers
+_BARRIER = "<barrier>"
+
+
+@dataclass(frozen=True, slots=True)
+class ScheduledStatement:
+    # position among the statements that are run (transaction control isn't counted)
+    index: int
+    sql: str
+    lineage: StatementLineage
+    # tables the schedule treats the statement as reading/writing; may differ from its lineage
+    reads: tuple[str, ...]
+    writes: tuple[str, ...]
+    # indexes of the statements that must finish before it starts
+    depends_on: tuple[int, ...]
+    # the wave it could run in with unlimited workers
+    level: int
+
+
+@dataclass(frozen=True, slots=True)
+class StatementRun:
+    statement: ScheduledStatement
+    start_ns: int
+    end_ns: int
+    # repr of the exception the statement raised, if it failed
+    error: str | None = None
+
+    @property
+    def elapsed(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e9
+
+
+def _isoformat(ns: int) -> str:
+    return datetime.fromtimestamp(ns / 1e9, timezone.utc).isoformat()
+
+
+def _keyword(sql: str) -> str:
+    return sql.lstrip().split(None, 1)[0].upper() if sql.strip() else ""
+
+
+class SQLScheduler:
+    def __init__(
+        self,
+        connect: Callable[[], object],
+        workers: int = 4,
+        dialect: str = "sqlite",
+        transport: Transport | None = None,
+        namespace: str = "default",
+        producer: str = PRODUCER,
+        parent_run_id: str | None = None,
+        parent_job: str | None = None,
+        schemas: SchemaFacetCatalog | None = None,
+    ) -> None:
+        """
+        :param connect: opens a DB-API connection; called once per worker thread
+        :param workers: statements run at the same time, at most
+        :param dialect: what the statements are parsed as
+        :param transport: where the statements' sub-job events go; ``None`` emits nothing
+        :param parent_run_id: run (of job ``parent_job``) the sub-jobs belong to, e.g. the step running the script
+        :param schemas: schema facets for the datasets, by name
+        """
+        self.connect = connect
+        self.workers = workers
+        self.dialect = dialect
+        self.transport = transport
+        self.schemas = schemas
+        self.factory = EventFactory(producer, namespace)
+        self.parent = self.factory.parent(parent_run_id, parent_job) if parent_run_id and parent_job else None
+        self._parsed: dict[str, StatementLineage] = {}
+
+    def plan(self, script: str | Iterable[str]) -> list[ScheduledStatement]:
+        """The statements to run and what each depends on; ``script`` is SQL text or a list of statements."""
+        statements = split_statements(script) if isinstance(script, str) else list(script)
+        graph = LineageGraph()
+        planned = []
+        for sql in statements:
+            if _keyword(sql) in _TRANSACTION_CONTROL:
+                log.debug("Dropping transaction control statement %r", sql)
+                continue
+            index = len(planned)
+            lineage = self._parsed.get(sql)
+            if lineage is None:
+                lineage = self._parsed[sql] = parse_statement(index, sql, self.dialect, None)
+            reads = [t.qualified_name for t in lineage.in_tables]
+            writes = [t.qualified_name for t in lineage.out_tables]
+            if not writes and (m := _CREATE_INDEX.match(sql)):
+                writes = [m.group(1).strip('"`[]')]
+            if not reads and not writes or lineage.errors:
+                writes = [*writes, _BARRIER]
+            job_id = graph.add_statement(str(index), [*reads, _BARRIER], writes)
+            planned.append((index, sql, lineage, reads, writes, job_id))
+
+        levels = {job_id: level for level, jobs in enumerate(graph.job_levels()) for job_id in jobs}
+        return [
+            ScheduledStatement(
+                index,
+                sql,
+                lineage,
+                tuple(reads),
+                tuple(w for w in writes if w != _BARRIER),
+                tuple(graph.job_dependencies(job_id)),
+                levels[job_id],
+            )
+            for index, sql, lineage, reads, writes, job_id in planned
+        ]
+
+    def run(self, script: str | Iterable[str]) -> list[StatementRun]:
+        """Run the script's statements in dependency order, as many at a time as there are workers."""
+        statements = self.plan(script)
+        dependents: list[list[int]] = [[] for _ in statements]
+        waiting = [len(s.depends_on) for s in statements]
+        for s in statements:
+            for d in s.depends_on:
+                dependents[d].append(s.index)
+
+        todo: queue.Queue[ScheduledStatement | None] = queue.Queue()
+        done: queue.Queue[tuple[StatementRun, BaseException | None]] = queue.Queue()
+        workers = [
+            threading.Thread(target=self._work, args=(todo, done), name=f"sql-scheduler-{i}", daemon=True)
+            for i in range(min(self.workers, len(statements)))
+        ]
+        for worker in workers:
+            worker.start()
+
+        runs: list[StatementRun] = []
+        error: BaseException | None = None
+        in_flight = 0
+        try:
+            for s in statements:
+                if not s.depends_on:
+                    todo.put(s)
+                    in_flight += 1
+            while in_flight:
+                run, exc = done.get()
+                in_flight -= 1
+                runs.append(run)
+                self._emit(run)
+                if exc is not None:
+                    log.error("Statement %d failed: %s", run.statement.index, run.error)
+                    error = error or exc
+                if error is not None:
+                    # let what's running finish, start nothing new
+                    continue
+                for i in dependents[run.statement.index]:
+                    waiting[i] -= 1
+                    if not waiting[i]:
+                        todo.put(statements[i])
+                        in_flight += 1
+        finally:
+            for _ in workers:
+                todo.put(None)
+            for worker in workers:
+                worker.join()
+        if error is not None:
+            raise error
+        return runs
+
+    def _work(self, todo: queue.Queue, done: queue.Queue) -> None:
+        # sqlite3 connections belong to the thread that opened them, so each worker opens and closes its own
+        conn = None
+        try:
+            while (statement := todo.get()) is not None:
+                start_ns = time.time_ns()
+                try:
+                    if conn is None:
+                        conn = self.connect()
+                    conn.execute(statement.sql)
+                    conn.commit()
+                except Exception as e:
+                    done.put((StatementRun(statement, start_ns, time.time_ns(), repr(e)), e))
+                else:
+                    done.put((StatementRun(statement, start_ns, time.time_ns()), None))
+        finally:
+            if conn is not None:
+                conn.close()
+
+    def _dataset(self, name: str):
+        return self.factory.dataset(name, self.schemas.facets(name) if self.schemas else None)
+
+    def _emit(self, run: StatementRun) -> None:
+        s = run.statement
+        if self.transport is None or not s.lineage.out_tables or _keyword(s.sql) == "DROP":
+            # reads, DROPs (the CREATE that follows carries the lineage) and statements lineage can't see into
+            return
+        ins = [self._dataset(t.qualified_name) for t in s.lineage.in_tables]
+        outs = [self._dataset(t.qualified_name) for t in s.lineage.out_tables]
+        name = f"execute_sql.{outs[0].name}" if len(outs) == 1 else f"execute_sql.{s.index}"
+        job = self.factory.job(name, facets={"sql": sql_job.SQLJobFacet(query=s.sql.strip())})
+        run_id = str(generate_new_uuid())
+        final = RunState.FAIL if run.error else RunState.COMPLETE
+        for state, ns in ((RunState.START, run.start_ns), (final, run.end_ns)):
+            self.transport.emit_json(
+                self.factory.run_event(state, job, run_id, _isoformat(ns), ins, outs, parent=self.parent)
+            )
@@ -0,0 +1,173 @@
+"""
+Split a SQL script into statements without reading the whole file into memory.
+
+``sqlglot.parse(path.read_text())`` holds the entire script plus an AST for
+every statement before the first one can be used, which doesn't work for
+multi-hundred-MB migration dumps. ``iter_statements`` reads the file in chunks
+and yields each statement as soon as its terminating ``;`` is seen, so peak
+memory is one chunk plus the statement being read, however big the file is.
+
+    for sql in iter_statements("big.sql"):
+        ...
+
+Semicolons only end a statement outside of
+
+* ``'single quoted'`` strings (with ``''`` and backslash escapes),
+* ``"quoted identifiers"``,
+* ``$$ dollar quoted $$`` blocks (Snowflake procedures/UDF bodies),
+* ``-- line`` and ``/* block */`` comments.
+
+Statements are yielded stripped and without their trailing ``;``. Stretches
+that contain nothing but whitespace and comments are skipped.
+
+``collapse_whitespace`` uses the same quoting rules to normalize a statement
+without touching what's inside quotes and comments.
+"""
+
+import io
+import os
+import re
+from collections.abc import Iterator
+from typing import TextIO
+
+# scanner states
+_CODE, _SINGLE_QUOTE, _DOUBLE_QUOTE, _DOLLAR_QUOTE, _LINE_COMMENT, _BLOCK_COMMENT = range(6)
+
+# characters that may change the state when we're in plain SQL
+_SPECIAL = re.compile(r"""[;'"$/\-]""")
+_SINGLE_QUOTE_SPECIAL = re.compile(r"['\\]")
+
+# the quoted and commented stretches _split knows about, or a run of whitespace outside of them;
+# a line comment keeps its newline, which is what ends it
+_VERBATIM_OR_SPACE = re.compile(
+    r"""'(?:[^'\\]|\\.|'')*'|"(?:[^"]|"")*"|\$\$.*?\$\$|--[^\n]*\n?|/\*.*?\*/|(\s+)""",
+    re.DOTALL,
+)
+
+
+def iter_statements(source: str | os.PathLike | TextIO, chunk_size: int = 1 << 20) -> Iterator[str]:
+    """
+    Lazily yield the statements of a SQL script.
+
+    :param source: path to the script, or an open text file
+    :param chunk_size: characters read from the file at a time
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, encoding="utf-8") as f:
+            yield from _split(f, chunk_size)
+    else:
+        yield from _split(source, chunk_size)
+
+
+def split_statements(sql: str) -> list[str]:
+    """Split a script that's already in memory."""
+    return list(_split(io.StringIO(sql), len(sql) or 1))
+
+
+def collapse_whitespace(sql: str) -> str:
+    """Replace each run of whitespace outside of quotes and comments with a single space, and strip."""
+    return _VERBATIM_OR_SPACE.sub(lambda m: " " if m.group(1) else m.group(0), sql).strip()
+
+
+def _split(f: TextIO, chunk_size: int) -> Iterator[str]:
+    buf = ""
+    # where the current statement starts / where we're scanning, both offsets into buf
+    start = pos = 0
+    state = _CODE
+    # whether the current statement has anything besides whitespace and comments
+    content = False
+    eof = False
+
+    while not eof:
+        chunk = f.read(chunk_size)
+        eof = not chunk
+        # drop everything before the current statement; it's been yielded already
+        buf = buf[start:] + chunk
+        pos -= start
+        start = 0
+        end = len(buf)
+
+        while pos < end:
+            if state == _CODE:
+                m = _SPECIAL.search(buf, pos)
+                stop = m.start() if m else end
+                if not content and stop > pos and not buf[pos:stop].isspace():
+                    content = True
+                if m is None:
+                    pos = end
+                    break
+
+                c = buf[stop]
+                nxt = buf[stop + 1] if stop + 1 < end else ""
+                if not nxt and c in "$-/" and not eof:
+                    # might be the first half of $$, -- or /*; wait for the next chunk
+                    pos = stop
+                    break
+
+                pos = stop + 1
+                if c == ";":
+                    if content:
+                        yield buf[start:stop].strip()
+                    start = pos
+                    content = False
+                elif c == "'":
+                    state, content = _SINGLE_QUOTE, True
+                elif c == '"':
+                    state, content = _DOUBLE_QUOTE, True
+                elif c == "$" and nxt == "$":
+                    state, content, pos = _DOLLAR_QUOTE, True, stop + 2
+                elif c == "-" and nxt == "-":
+                    state, pos = _LINE_COMMENT, stop + 2
+                elif c == "/" and nxt == "*":
+                    state, pos = _BLOCK_COMMENT, stop + 2
+                else:
+                    # a lone $, - or / is just part of the statement
+                    content = True
+
+            elif state == _SINGLE_QUOTE:
+                m = _SINGLE_QUOTE_SPECIAL.search(buf, pos)
+                if m is None:
+                    pos = end
+                    break
+                stop = m.start()
+                if stop + 1 >= end and not eof:
+                    # can't tell an escape ('' or \x) from the end of the string yet
+                    pos = stop
+                    break
+                if buf[stop] == "\\" or buf[stop + 1 : stop + 2] == "'":
+                    pos = stop + 2
+                else:
+                    state, pos = _CODE, stop + 1
+
+            elif state == _DOUBLE_QUOTE:
+                stop = buf.find('"', pos)
+                if stop == -1:
+                    pos = end
+                    break
+                if stop + 1 >= end and not eof:
+                    pos = stop
+                    break
+                if buf[stop + 1 : stop + 2] == '"':
+                    pos = stop + 2
+                else:
+                    state, pos = _CODE, stop + 1
+
+            elif state == _LINE_COMMENT:
+                stop = buf.find("\n", pos)
+                if stop == -1:
+                    pos = end
+                    break
+                state, pos = _CODE, stop + 1
+
+            else:
+                # block comments and $$ blocks both end at a two character marker
+                marker = "*/" if state == _BLOCK_COMMENT else "$$"
+                stop = buf.find(marker, pos)
+                if stop == -1:
+                    # the marker may be split across chunks, so rescan the last character
+                    pos = max(end - 1, pos)
+                    break
+                state, pos = _CODE, stop + 2
+
+    if content:
+        yield buf[start:].strip()
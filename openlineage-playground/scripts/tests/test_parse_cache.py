@@ -0,0 +1,18 @@
+from openlineage_playground.parse_cache import cache_key, normalize_sql
+
+
+def test_whitespace_outside_quotes_is_collapsed():
+    assert normalize_sql("SELECT  a,\n\tb\nFROM t ;\n") == "SELECT a, b FROM t"
+    assert cache_key("SELECT a FROM t", "snowflake", None) == cache_key("SELECT\n  a\nFROM t;", "snowflake", None)
+
+
+def test_quoted_identifiers_keep_their_whitespace():
+    one = 'SELECT "order id" FROM "my table"'
+    two = 'SELECT "order  id" FROM "my\ttable"'
+    assert normalize_sql(two) == two
+    assert cache_key(one, "snowflake", None) != cache_key(two, "snowflake", None)
+
+
+def test_literals_and_comments_are_kept():
+    sql = "SELECT 'a  b', 'it''s  here' -- keep  this\n  FROM t /* and\n  this */  WHERE x = $$ y  z $$"
+    assert normalize_sql(sql) == "SELECT 'a  b', 'it''s  here' -- keep  this\n FROM t /* and\n  this */ WHERE x = $$ y  z $$"
@@ -48,34 +48,14 @@ function launch_sagemaker_studio {
 }
 
 function publish_lambda_fn {
-    
-    # upload the file to the S3 bucket
+    # Build the function and layer zips, or reuse them from build/cache if their
+    # inputs haven't changed, then upload the function and publish the layer only
+    # if they differ from what's already there (see build_artifacts.py)
     cd "${THIS_DIR}/lambda_functions/lambda_github_workflow_trigger"
-    zip lambda-github-workflow-trigger.zip lambda_function.py
-    aws s3 cp lambda-github-workflow-trigger.zip s3://${LAMBDA_FN_S3_BUCKET}/
-    
-    #Set up a Python virtual environment and get the dependencies installed
-    mkdir -p lambda_layer
-    cd lambda_layer
-    python3 -m venv .venv
-    source .venv/bin/activate
-
-    rm -rf "site-packages"
-    pip install pygithub -t "site-packages"
-    deactivate
-
-    # Generate the .zip file
-    mv "site-packages/" python
-    zip -r layer.zip python
-
-    #Publish the layer to AWS
-    aws lambda publish-layer-version --layer-name python39-github-arm64 \
-        --description "Python3.9 pygithub" \
-        --license-info "MIT" \
-        --zip-file fileb://layer.zip \
-        --compatible-runtimes python3.9 \
-        --compatible-architectures "arm64"
-
+    uv run --no-project --python 3.9 --with pip --with boto3 python build_artifacts.py \
+        --publish \
+        --bucket "${LAMBDA_FN_S3_BUCKET}" \
+        --layer-name python39-github-arm64
 }
 
 time "${@}"
\ No newline at end of file